@@ -108,21 +108,18 @@ class DebateConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def add_human_message(self, content):
-        """Add human message to episode dialogue in database."""
-        from .models import Episode
-
-        try:
-            episode = Episode.objects.get(id=self.episode_id)
-            dialogue = list(episode.dialogue or [])
-            dialogue.append({
-                'participant': 'human',
-                'content': content,
-                'timestamp': timezone.now().isoformat()
-            })
-            episode.dialogue = dialogue
-            episode.save(update_fields=['dialogue', 'updated_at'])
-        except Episode.DoesNotExist:
-            pass
+        """Add human message to episode dialogue in database and notify SSE viewers."""
+        from .models import DialogueEntry, Episode
+        from .services.debate_events import publish_debate_event
+
+        if not Episode.objects.filter(id=self.episode_id).exists():
+            return
+        row = DialogueEntry.append(self.episode_id, {
+            'participant': 'human',
+            'content': content,
+            'timestamp': timezone.now().isoformat()
+        })
+        publish_debate_event(self.episode_id, 'dialogue', row.as_dict(), index=row.seq)
 
     async def trigger_ai_followup(self):
         """Trigger async task to generate AI response."""
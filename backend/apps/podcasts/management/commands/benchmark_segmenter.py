@@ -0,0 +1,80 @@
+"""
+Microbenchmark for ScriptSegmenter on large scripts.
+
+    python manage.py benchmark_segmenter --chars 100000 --max-chars 45 --repeat 5
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.podcasts.services.segmenter import ScriptSegmenter
+
+
+class Command(BaseCommand):
+    help = "测量脚本解析与分段耗时（默认 10 万字脚本）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chars", type=int, default=100_000, help="脚本总字数")
+        parser.add_argument("--line-chars", type=int, default=400, help="每个对话段的字数（越长分段越多）")
+        parser.add_argument("--max-chars", type=int, default=45, help="每个 TTS 片段的最大字数")
+        parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最快一次")
+        parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+
+    def handle(self, *args, **options):
+        if options["chars"] < 1 or options["line_chars"] < 1 or options["repeat"] < 1:
+            raise CommandError("--chars、--line-chars 和 --repeat 至少为 1")
+
+        script = self._build_script(options["chars"], options["line_chars"])
+        segmenter = ScriptSegmenter(options["max_chars"])
+
+        parse_times, split_times = [], []
+        turns = chunks = 0
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            parsed = segmenter.parse(script)
+            parsed_at = time.perf_counter()
+            chunks = sum(len(segmenter.split(turn.text)) for turn in parsed)
+            finished = time.perf_counter()
+
+            turns = len(parsed)
+            parse_times.append(parsed_at - started)
+            split_times.append(finished - parsed_at)
+
+        parse_ms = min(parse_times) * 1000
+        split_ms = min(split_times) * 1000
+        result = {
+            "chars": len(script),
+            "turns": turns,
+            "chunks": chunks,
+            "parse_ms": round(parse_ms, 3),
+            "split_ms": round(split_ms, 3),
+            "total_ms": round(parse_ms + split_ms, 3),
+            "chars_per_second": round(len(script) / max((parse_ms + split_ms) / 1000, 1e-9)),
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(
+            f"{result['chars']} 字 / {turns} 段 / {chunks} 片段: "
+            f"解析 {parse_ms:.2f}ms, 分段 {split_ms:.2f}ms, 共 {result['total_ms']:.2f}ms "
+            f"({result['chars_per_second']:,} 字/秒)"
+        )
+
+    @staticmethod
+    def _build_script(chars: int, line_chars: int) -> str:
+        speakers = ["大牛", "一帆"]
+        sentence = "今天我们来聊聊性能优化，这是一个很有意思的话题。"
+        body = (sentence * (line_chars // len(sentence) + 1))[:line_chars]
+        lines = []
+        total = 0
+        index = 0
+        while total < chars:
+            line = f"【{speakers[index % 2]}】{body}"
+            lines.append(line)
+            total += len(line) + 1
+            index += 1
+        return "\n".join(lines)[:chars]
@@ -0,0 +1,159 @@
+"""
+Benchmark PodcastGenerator.generate end to end.
+
+By default MiniMax is replaced by the local FakeMiniMaxServer so runs are
+repeatable and free; pass --url to benchmark against a real endpoint.
+
+    python manage.py benchmark_tts --segments 60 --concurrency 1,4,8 --latency 0.3 --audio-speed 10
+"""
+
+import asyncio
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from apps.podcasts.services.generator import PodcastGenerator
+from apps.podcasts.services.minimax_fake_server import FakeMiniMaxServer
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+class _ServerThread:
+    """Run a FakeMiniMaxServer on its own event loop so generate() can use asyncio.run()."""
+
+    def __init__(self, server: FakeMiniMaxServer):
+        self.server = server
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="fake-minimax", daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self.server.start())
+        self._ready.set()
+        self._loop.run_forever()
+
+    def __enter__(self) -> FakeMiniMaxServer:
+        self._thread.start()
+        self._ready.wait(timeout=10)
+        return self.server
+
+    def __exit__(self, exc_type, exc, tb):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+
+
+class Command(BaseCommand):
+    help = "测量 TTS 生成吞吐：片段/秒、端到端耗时和峰值 RSS（默认使用本地 MiniMax 模拟服务）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--segments", type=int, default=40, help="脚本中的对话行数")
+        parser.add_argument("--chars", type=int, default=30, help="每行字数")
+        parser.add_argument("--concurrency", default="4", help="逗号分隔的 synthesis_concurrency 取值，如 1,4,8")
+        parser.add_argument("--repeat", type=int, default=1, help="每个并发取值重复次数")
+        parser.add_argument("--latency", type=float, default=0.2, help="模拟服务首包延迟（秒）")
+        parser.add_argument("--audio-speed", type=float, default=10.0, help="模拟服务音频推送速度（实时倍数，0 为不限速）")
+        parser.add_argument("--url", default="", help="使用真实 MiniMax 地址而不是模拟服务")
+        parser.add_argument("--segment-cache", action="store_true", help="启用片段缓存（默认关闭以测量合成本身）")
+        parser.add_argument("--vocal-logo", action="store_true", help="包含片头片尾 vocal logo")
+        parser.add_argument("--speaker-batching", action="store_true", help="同一说话人的连续片段在一个任务中批量合成")
+        parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+
+    def handle(self, *args, **options):
+        try:
+            concurrency_values = [int(value) for value in options["concurrency"].split(",") if value.strip()]
+        except ValueError as exc:
+            raise CommandError(f"--concurrency 格式错误: {exc}") from exc
+        if not concurrency_values or min(concurrency_values) < 1:
+            raise CommandError("--concurrency 至少为 1")
+
+        script = self._build_script(options["segments"], options["chars"])
+
+        if options["url"]:
+            results = self._run_all(options["url"], script, concurrency_values, options, server=None)
+        else:
+            server = FakeMiniMaxServer(
+                first_audio_latency=options["latency"],
+                audio_speed=options["audio_speed"],
+            )
+            with _ServerThread(server):
+                results = self._run_all(server.url, script, concurrency_values, options, server=server)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
+            return
+
+        header = f"{'并发':>4} {'轮次':>4} {'片段':>5} {'耗时(s)':>8} {'片段/秒':>8} {'音频(s)':>8} {'实时倍数':>8} {'峰值RSS(MB)':>11}"
+        self.stdout.write(header)
+        for row in results:
+            self.stdout.write(
+                f"{row['concurrency']:>4} {row['run']:>4} {row['segments']:>5} {row['elapsed_seconds']:>8.2f} "
+                f"{row['segments_per_second']:>8.2f} {row['audio_seconds']:>8.1f} "
+                f"{row['realtime_factor']:>8.1f} {row['peak_rss_mb']:>11.1f}"
+            )
+
+    @staticmethod
+    def _build_script(segments: int, chars: int) -> str:
+        speakers = ["大牛", "一帆"]
+        filler = "这是用于基准测试的合成语音内容"
+        lines = []
+        for index in range(segments):
+            body = (filler * (chars // len(filler) + 1))[: max(1, chars - 1)]
+            lines.append(f"【{speakers[index % 2]}】{body}。")
+        return "\n".join(lines)
+
+    def _run_all(self, url, script, concurrency_values, options, *, server):
+        base_settings = dict(getattr(settings, "MINIMAX_TTS", {}) or {})
+        results = []
+        for concurrency in concurrency_values:
+            for run in range(1, options["repeat"] + 1):
+                minimax_settings = {
+                    **base_settings,
+                    "api_key": base_settings.get("api_key") or "benchmark",
+                    "ws_url": url,
+                    "synthesis_concurrency": concurrency,
+                    "checkpoint_dir": "",
+                    "enable_vocal_logo": options["vocal_logo"],
+                    "speaker_batching": options["speaker_batching"],
+                }
+                if not options["segment_cache"]:
+                    minimax_settings["segment_cache_max_mb"] = 0
+                if server is not None:
+                    # The fake server has no quota worth protecting
+                    minimax_settings["rate_limit_per_second"] = 0
+
+                stats_before = dict(server.stats) if server is not None else {}
+                with override_settings(MINIMAX_TTS=minimax_settings), TemporaryDirectory() as tmpdir:
+                    generator = PodcastGenerator()
+                    started = time.perf_counter()
+                    result = generator.generate(script, os.path.join(tmpdir, "benchmark.mp3"))
+                    elapsed = time.perf_counter() - started
+
+                row = {
+                    "concurrency": concurrency,
+                    "run": run,
+                    "segments": len(result.segments),
+                    "elapsed_seconds": round(elapsed, 3),
+                    "segments_per_second": round(len(result.segments) / elapsed, 3),
+                    "audio_seconds": round(result.duration_seconds, 3),
+                    "realtime_factor": round(result.duration_seconds / elapsed, 2),
+                    "file_size": result.file_size,
+                    "peak_rss_mb": round(_peak_rss_mb(), 1),
+                }
+                if server is not None:
+                    row["server"] = {key: server.stats[key] - stats_before.get(key, 0) for key in server.stats}
+                results.append(row)
+        return results
@@ -0,0 +1,174 @@
+"""
+媒体文件视图 - 单集音频的 Range 请求与权限校验
+
+播放器拖动进度条时只请求需要的字节段（206 Partial Content），不会重新下载整个文件。
+配置 MEDIA_ACCEL_REDIRECT_PREFIX 后，权限校验通过的请求交给 nginx（X-Accel-Redirect）发送文件，
+nginx 自己处理 Range；否则由 Django 通过 FileResponse（wsgi.file_wrapper / sendfile）发送。
+"""
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.views.decorators.http import require_http_methods
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_BLOCK_SIZE = 256 * 1024
+
+
+def _request_user(request):
+    """Authorization: Bearer 头或 ?token=（<audio> 标签无法自定义请求头）"""
+    token_string = request.GET.get('token')
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        token_string = auth_header[len('Bearer '):]
+    if not token_string or token_string == 'null':
+        return None
+    try:
+        return User.objects.get(id=AccessToken(token_string)['user_id'])
+    except (TokenError, InvalidToken, User.DoesNotExist):
+        return None
+
+
+def _can_listen(episode, user):
+    if episode.show_id:
+        return episode.can_view(user)
+    # Debate/Conference 单集可能尚未关联节目，仅发起人可听
+    creator_id = (episode.generation_meta or {}).get('creator_id')
+    return not creator_id or (user is not None and int(creator_id) == user.id)
+
+
+def file_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    解析单段 Range 头
+
+    返回:
+        None: 没有（或不支持的多段）Range，返回完整文件
+        (start, end): 闭区间字节范围
+        False: 范围无法满足（416）
+    """
+    match = RANGE_PATTERN.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N：最后 N 个字节
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _if_range_matches(header, etag, stat):
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith('"') or header.startswith('W/'):
+        return header == etag
+    try:
+        return int(parsedate_to_datetime(header).timestamp()) >= int(stat.st_mtime)
+    except (TypeError, ValueError):
+        return False
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = handle.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+@require_http_methods(["GET", "HEAD"])
+def episode_audio(request, episode_id):
+    """单集音频（支持 Range / If-Range / ETag）"""
+    from .models import Episode
+
+    try:
+        episode = Episode.objects.select_related('show__creator').get(id=episode_id)
+    except Episode.DoesNotExist:
+        raise Http404('单集不存在')
+    if not episode.audio_file:
+        raise Http404('音频不存在')
+    if not _can_listen(episode, _request_user(request)):
+        return HttpResponse('您没有权限收听该单集', status=403, content_type='text/plain; charset=utf-8')
+
+    path = episode.audio_file.path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404('音频文件不存在')
+
+    etag = file_etag(stat)
+    content_type = mimetypes.guess_type(path)[0] or 'audio/mpeg'
+    cache_headers = {
+        'ETag': etag,
+        'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private, max-age=3600',
+    }
+
+    accel_prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '')
+    if accel_prefix:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(episode.audio_file.name)
+        return response
+
+    if etag in [value.strip() for value in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+        for header, value in cache_headers.items():
+            response[header] = value
+        return response
+
+    byte_range = None
+    if _if_range_matches(request.headers.get('If-Range'), etag, stat):
+        byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        if end == stat.st_size - 1:
+            # 开放区间（播放器拖动时的常见请求）：从偏移量起整个尾部交给 FileResponse 零拷贝发送
+            handle = open(path, 'rb')
+            handle.seek(start)
+            response = FileResponse(handle, content_type=content_type)
+        else:
+            response = StreamingHttpResponse(_iter_range(path, start, length), content_type=content_type)
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Content-Length'] = str(length)
+
+    for header, value in cache_headers.items():
+        response[header] = value
+    return response
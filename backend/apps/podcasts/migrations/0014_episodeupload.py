@@ -0,0 +1,40 @@
+# Generated by Django 5.1 on 2026-10-16 23:25
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('podcasts', '0013_merge_20260207_1838'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EpisodeUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255, verbose_name='原始文件名')),
+                ('file_path', models.CharField(help_text='相对 MEDIA_ROOT，即单集 audio_file 的最终位置', max_length=500, verbose_name='存储路径')),
+                ('total_size', models.BigIntegerField(help_text='字节', verbose_name='文件大小')),
+                ('received_size', models.BigIntegerField(default=0, help_text='字节，下一个分片的偏移量', verbose_name='已接收')),
+                ('sha256', models.CharField(blank=True, help_text='完整文件的校验和（可选）', max_length=64, verbose_name='SHA-256')),
+                ('episode_data', models.JSONField(blank=True, default=dict, verbose_name='单集信息')),
+                ('status', models.CharField(choices=[('uploading', '上传中'), ('completed', '已完成')], default='uploading', max_length=20, verbose_name='状态')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('creator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='episode_uploads', to=settings.AUTH_USER_MODEL, verbose_name='上传者')),
+                ('episode', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploads', to='podcasts.episode', verbose_name='单集')),
+            ],
+            options={
+                'verbose_name': '分片上传',
+                'verbose_name_plural': '分片上传',
+                'db_table': 'episode_uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.1 on 2026-10-16 23:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+COLUMN_FIELDS = ("participant", "content", "timestamp")
+
+
+def copy_dialogue_to_entries(apps, schema_editor):
+    Episode = apps.get_model("podcasts", "Episode")
+    DialogueEntry = apps.get_model("podcasts", "DialogueEntry")
+
+    episodes = Episode.objects.exclude(dialogue__isnull=True).only("id", "dialogue")
+    for episode in episodes.iterator():
+        if not isinstance(episode.dialogue, list):
+            continue
+        rows = [
+            DialogueEntry(
+                episode_id=episode.id,
+                seq=seq,
+                participant=entry.get("participant") or "",
+                content=entry.get("content") or "",
+                timestamp=entry.get("timestamp") or "",
+                extra={key: value for key, value in entry.items() if key not in COLUMN_FIELDS},
+            )
+            for seq, entry in enumerate(episode.dialogue)
+            if isinstance(entry, dict)
+        ]
+        DialogueEntry.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('podcasts', '0014_episodeupload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='episode',
+            name='dialogue',
+            field=models.JSONField(blank=True, help_text='对话记录导出（由 DialogueEntry 物化），格式: [{"participant": "llm1", "content": "...", "timestamp": "..."}, ...]', null=True, verbose_name='对话记录'),
+        ),
+        migrations.CreateModel(
+            name='DialogueEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField(help_text='从 0 开始，与 Episode.dialogue 中的下标一致', verbose_name='序号')),
+                ('participant', models.CharField(max_length=50, verbose_name='发言者')),
+                ('content', models.TextField(blank=True, verbose_name='内容')),
+                ('timestamp', models.CharField(blank=True, help_text='ISO 8601，保留写入时的原始格式', max_length=64, verbose_name='时间戳')),
+                ('extra', models.JSONField(blank=True, default=dict, verbose_name='其他字段')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('episode', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dialogue_entries', to='podcasts.episode', verbose_name='单集')),
+            ],
+            options={
+                'verbose_name': '对话发言',
+                'verbose_name_plural': '对话发言',
+                'db_table': 'dialogue_entries',
+                'ordering': ['episode', 'seq'],
+                'constraints': [models.UniqueConstraint(fields=('episode', 'seq'), name='dialogue_entry_episode_seq')],
+            },
+        ),
+        migrations.RunPython(copy_dialogue_to_entries, migrations.RunPython.noop),
+    ]
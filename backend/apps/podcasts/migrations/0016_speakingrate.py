@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-16 23:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('podcasts', '0015_dialogueentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpeakingRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='模型、音色和语速的哈希', max_length=64, unique=True, verbose_name='音色标识')),
+                ('rate', models.FloatField(help_text='字/秒的指数移动平均', verbose_name='语速')),
+                ('samples', models.PositiveIntegerField(default=0, verbose_name='样本数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': 'TTS语速',
+                'verbose_name_plural': 'TTS语速',
+                'db_table': 'tts_speaking_rates',
+            },
+        ),
+    ]
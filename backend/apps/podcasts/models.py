@@ -1,9 +1,10 @@
 """
 播客模型
 """
+import uuid
 from datetime import time as dt_time
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
 from django.utils.text import slugify
 from slugify import slugify as awesome_slugify
@@ -301,7 +302,7 @@ class Episode(models.Model):
         '对话记录',
         null=True,
         blank=True,
-        help_text='流式对话记录，格式: [{"participant": "llm1", "content": "...", "timestamp": "..."}, ...]'
+        help_text='对话记录导出（由 DialogueEntry 物化），格式: [{"participant": "llm1", "content": "...", "timestamp": "..."}, ...]'
     )
 
     # 参与者配置（仅debate/conference模式使用）
@@ -419,6 +420,158 @@ class Episode(models.Model):
         return self.status == 'published'
 
 
+class DialogueEntry(models.Model):
+    """辩论/会议的单条发言 - 只追加，读取方按 seq 增量获取"""
+
+    # 单独成列的字段，其余字段（role、clientId 等）原样保存在 extra 中
+    COLUMN_FIELDS = ('participant', 'content', 'timestamp')
+    APPEND_RETRIES = 5
+
+    episode = models.ForeignKey(
+        Episode,
+        on_delete=models.CASCADE,
+        related_name='dialogue_entries',
+        verbose_name='单集'
+    )
+    seq = models.PositiveIntegerField('序号', help_text='从 0 开始，与 Episode.dialogue 中的下标一致')
+    participant = models.CharField('发言者', max_length=50)
+    content = models.TextField('内容', blank=True)
+    timestamp = models.CharField('时间戳', max_length=64, blank=True, help_text='ISO 8601，保留写入时的原始格式')
+    extra = models.JSONField('其他字段', default=dict, blank=True)
+    created_at = models.DateTimeField('创建时间', auto_now_add=True)
+
+    class Meta:
+        db_table = 'dialogue_entries'
+        ordering = ['episode', 'seq']
+        constraints = [
+            models.UniqueConstraint(fields=['episode', 'seq'], name='dialogue_entry_episode_seq'),
+        ]
+        verbose_name = '对话发言'
+        verbose_name_plural = verbose_name
+
+    def __str__(self):
+        return f"{self.episode_id}#{self.seq} {self.participant}"
+
+    @classmethod
+    def from_dict(cls, episode_id, seq, entry):
+        extra = {key: value for key, value in entry.items() if key not in cls.COLUMN_FIELDS}
+        return cls(
+            episode_id=episode_id,
+            seq=seq,
+            participant=entry.get('participant') or '',
+            content=entry.get('content') or '',
+            timestamp=entry.get('timestamp') or '',
+            extra=extra,
+        )
+
+    def as_dict(self):
+        """还原为 Episode.dialogue 中的条目格式"""
+        entry = {'participant': self.participant, **self.extra, 'content': self.content}
+        if self.timestamp:
+            entry['timestamp'] = self.timestamp
+        return entry
+
+    @classmethod
+    def next_seq(cls, episode_id):
+        """下一条发言的序号"""
+        last_seq = (
+            cls.objects.filter(episode_id=episode_id)
+            .order_by('-seq')
+            .values_list('seq', flat=True)
+            .first()
+        )
+        return 0 if last_seq is None else last_seq + 1
+
+    @classmethod
+    def append(cls, episode_id, entry):
+        """追加一条发言（只插入一行，不重写已有对话），并发冲突时取下一个序号重试"""
+        for _ in range(cls.APPEND_RETRIES):
+            row = cls.from_dict(episode_id, cls.next_seq(episode_id), entry)
+            try:
+                with transaction.atomic():
+                    row.save(force_insert=True)
+                return row
+            except IntegrityError:
+                continue
+        raise IntegrityError(f"单集 {episode_id} 追加发言失败：序号冲突")
+
+    @classmethod
+    def after(cls, episode_id, seq=-1, before=None):
+        """seq 之后（不含）的发言，按序号排列；before 为上界（不含）"""
+        queryset = cls.objects.filter(episode_id=episode_id, seq__gt=seq)
+        if before is not None:
+            queryset = queryset.filter(seq__lt=before)
+        return queryset.order_by('seq')
+
+    @classmethod
+    def entries_after(cls, episode_id, seq=-1, before=None):
+        return [row.as_dict() for row in cls.after(episode_id, seq, before)]
+
+    @classmethod
+    async def aentries_after(cls, episode_id, seq=-1, before=None):
+        return [row.as_dict() async for row in cls.after(episode_id, seq, before)]
+
+
+class EpisodeUpload(models.Model):
+    """分片上传会话 - 大音频按分片写入最终位置，可断点续传"""
+
+    STATUS_CHOICES = [
+        ('uploading', '上传中'),
+        ('completed', '已完成'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='episode_uploads',
+        verbose_name='上传者'
+    )
+    filename = models.CharField('原始文件名', max_length=255)
+    file_path = models.CharField('存储路径', max_length=500, help_text='相对 MEDIA_ROOT，即单集 audio_file 的最终位置')
+    total_size = models.BigIntegerField('文件大小', help_text='字节')
+    received_size = models.BigIntegerField('已接收', default=0, help_text='字节，下一个分片的偏移量')
+    sha256 = models.CharField('SHA-256', max_length=64, blank=True, help_text='完整文件的校验和（可选）')
+    episode_data = models.JSONField('单集信息', default=dict, blank=True)
+    episode = models.ForeignKey(
+        Episode,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='uploads',
+        verbose_name='单集'
+    )
+    status = models.CharField('状态', max_length=20, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField('创建时间', auto_now_add=True)
+    updated_at = models.DateTimeField('更新时间', auto_now=True)
+
+    class Meta:
+        db_table = 'episode_uploads'
+        ordering = ['-created_at']
+        verbose_name = '分片上传'
+        verbose_name_plural = verbose_name
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_size}/{self.total_size})"
+
+
+class SpeakingRate(models.Model):
+    """TTS 语速（字/秒）- 按音色/模型/语速学习，所有 worker 共享"""
+
+    key = models.CharField('音色标识', max_length=64, unique=True, help_text='模型、音色和语速的哈希')
+    rate = models.FloatField('语速', help_text='字/秒的指数移动平均')
+    samples = models.PositiveIntegerField('样本数', default=0)
+    updated_at = models.DateTimeField('更新时间', auto_now=True)
+
+    class Meta:
+        db_table = 'tts_speaking_rates'
+        verbose_name = 'TTS语速'
+        verbose_name_plural = verbose_name
+
+    def __str__(self):
+        return f"{self.key}: {self.rate:.2f} ({self.samples})"
+
+
 class ScriptSession(models.Model):
     """AI脚本创作会话 - 用户与AI对话生成播客脚本"""
 
@@ -1,11 +1,16 @@
 """
 播客序列化器
 """
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from django.utils import timezone
 from rest_framework import serializers
 from apps.users.serializers import UserSerializer
 from .models import (
-    Category, Tag, Show, Episode, ScriptSession, UploadedReference,
+    Category, Tag, Show, Episode, DialogueEntry, EpisodeUpload, ScriptSession, UploadedReference,
     RSSSource, RSSList, RSSSchedule, RSSRun,
 )
 from .services.rss_ingest import SCRIPT_TEMPLATE_CHOICES
@@ -13,6 +18,13 @@ from .services.rss_ingest import SCRIPT_TEMPLATE_CHOICES
 DEFAULT_SHOW_COVER_URL = '/static/default_show_logo.png'
 
 
+def _audio_stream_url(episode):
+    """支持 Range 请求并校验权限的音频地址（私有单集需附加 ?token=）"""
+    if episode.audio_file:
+        return reverse('podcasts:episode_audio', args=[episode.id])
+    return None
+
+
 def _absolute_static_url(request, relative_url: str) -> str:
     if request:
         return request.build_absolute_uri(relative_url)
@@ -192,13 +204,14 @@ class EpisodeListSerializer(serializers.ModelSerializer):
 
     show = ShowListSerializer(read_only=True)
     audio_url = serializers.SerializerMethodField()
+    audio_stream_url = serializers.SerializerMethodField()
     cover_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Episode
         fields = [
             'id', 'title', 'slug', 'description', 'cover', 'cover_url',
-            'show', 'audio_file', 'audio_url', 'duration', 'file_size',
+            'show', 'audio_file', 'audio_url', 'audio_stream_url', 'duration', 'file_size',
             'episode_number', 'season_number',
             'artist', 'genre', 'album_name', 'release_date',
             'visibility',
@@ -212,6 +225,9 @@ class EpisodeListSerializer(serializers.ModelSerializer):
             return obj.audio_file.url
         return None
 
+    def get_audio_stream_url(self, obj):
+        return _audio_stream_url(obj)
+
     def get_cover_url(self, obj):
         if obj.cover:
             return obj.cover.url
@@ -226,16 +242,18 @@ class EpisodeDetailSerializer(serializers.ModelSerializer):
 
     show = ShowDetailSerializer(read_only=True)
     audio_url = serializers.SerializerMethodField()
+    audio_stream_url = serializers.SerializerMethodField()
     cover_url = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     play_position = serializers.SerializerMethodField()
+    dialogue = serializers.SerializerMethodField()
     shared_with_users = UserSerializer(source='shared_with', many=True, read_only=True)
 
     class Meta:
         model = Episode
         fields = [
             'id', 'title', 'slug', 'description', 'cover', 'cover_url',
-            'show', 'audio_file', 'audio_url', 'duration', 'file_size',
+            'show', 'audio_file', 'audio_url', 'audio_stream_url', 'duration', 'file_size',
             'episode_number', 'season_number',
             'artist', 'genre', 'album_name', 'release_date',
             'visibility', 'shared_with_users',
@@ -252,6 +270,9 @@ class EpisodeDetailSerializer(serializers.ModelSerializer):
             return obj.audio_file.url
         return None
 
+    def get_audio_stream_url(self, obj):
+        return _audio_stream_url(obj)
+
     def get_cover_url(self, obj):
         if obj.cover:
             return obj.cover.url
@@ -278,6 +299,14 @@ class EpisodeDetailSerializer(serializers.ModelSerializer):
                 pass
         return 0
 
+    def get_dialogue(self, obj):
+        # 发言表是最新数据（包含物化之后追加的插话），旧数据只有 dialogue 字段
+        if obj.mode in ('debate', 'conference'):
+            entries = DialogueEntry.entries_after(obj.id)
+            if entries:
+                return entries
+        return obj.dialogue
+
 
 class EpisodeCreateSerializer(serializers.ModelSerializer):
     """创建单集/单曲序列化器"""
@@ -312,9 +341,9 @@ class EpisodeCreateSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         """验证数据"""
-        # 创建时必须提供音频
+        # 创建时必须提供音频（分片上传时音频已在 context['uploaded_audio'] 指向的位置）
         if not self.instance:
-            if 'audio_file' not in attrs:
+            if 'audio_file' not in attrs and not self.context.get('uploaded_audio'):
                 raise serializers.ValidationError({'audio_file': '创建单集时必须上传音频文件'})
         return attrs
 
@@ -329,6 +358,8 @@ class EpisodeCreateSerializer(serializers.ModelSerializer):
             show, _ = get_or_create_default_show(self.context['request'].user)
         validated_data['show'] = show
         validated_data['status'] = 'processing'
+        if 'audio_file' not in validated_data:
+            validated_data['audio_file'] = self.context['uploaded_audio']
 
         episode = Episode.objects.create(**validated_data)
 
@@ -338,9 +369,9 @@ class EpisodeCreateSerializer(serializers.ModelSerializer):
             users = User.objects.filter(id__in=shared_with_ids)
             episode.shared_with.set(users)
 
-        # 触发音频处理任务
+        # 触发音频处理任务（事务提交后，避免任务读不到单集）
         from .tasks import process_episode_audio
-        process_episode_audio.delay(episode.id)
+        transaction.on_commit(lambda: process_episode_audio.delay(episode.id))
 
         return episode
 
@@ -367,6 +398,67 @@ class EpisodeCreateSerializer(serializers.ModelSerializer):
         return instance
 
 
+class EpisodeUploadSerializer(serializers.ModelSerializer):
+    """分片上传会话"""
+
+    episode_id = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = EpisodeUpload
+        fields = [
+            'id', 'filename', 'total_size', 'received_size', 'sha256',
+            'status', 'episode_id', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class EpisodeUploadCreateSerializer(serializers.Serializer):
+    """开始分片上传：文件信息，其余字段与上传单集相同"""
+
+    EPISODE_FIELDS = [
+        'show_id', 'title', 'description', 'episode_number', 'season_number',
+        'artist', 'genre', 'album_name', 'release_date', 'visibility', 'shared_with_ids'
+    ]
+
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True)
+
+    def validate_filename(self, value):
+        extension = os.path.splitext(value)[1].lower()
+        if extension not in settings.AUDIO_ALLOWED_EXTENSIONS:
+            raise serializers.ValidationError(
+                f"不支持的文件格式，仅支持 {', '.join(settings.AUDIO_ALLOWED_EXTENSIONS)}"
+            )
+        return value
+
+    def validate_size(self, value):
+        if value > settings.AUDIO_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(
+                f"文件太大（最大 {settings.AUDIO_MAX_UPLOAD_SIZE // (1024 * 1024)}MB）"
+            )
+        return value
+
+    def validate(self, attrs):
+        """单集信息在开始上传时就校验，避免传完才发现填写有误"""
+        episode_data = {
+            field: self.initial_data[field]
+            for field in self.EPISODE_FIELDS
+            if field in self.initial_data
+        }
+        if hasattr(self.initial_data, 'getlist') and 'shared_with_ids' in episode_data:
+            episode_data['shared_with_ids'] = self.initial_data.getlist('shared_with_ids')
+
+        episode_serializer = EpisodeCreateSerializer(
+            data=episode_data,
+            context={**self.context, 'uploaded_audio': attrs['filename']},
+        )
+        episode_serializer.is_valid(raise_exception=True)
+        attrs['episode_data'] = episode_data
+        attrs['sha256'] = attrs.get('sha256', '').lower()
+        return attrs
+
+
 class PodcastGenerationSerializer(serializers.Serializer):
     """播客生成请求序列化器"""
 
@@ -0,0 +1,141 @@
+"""
+Episode assembly over a single preallocated NumPy buffer.
+
+All segment offsets are computed before anything is copied, so the episode
+is laid out with one allocation: silences are the zero-filled gaps of that
+buffer, short crossfades are mixed in place with vectorized ramps, and
+peak normalization is one in-place gain pass.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+INT16_MAX = 32767
+GAIN_CHUNK_SAMPLES = 1 << 20  # in-place gain is applied in ~1M sample chunks to bound temporaries
+
+
+class PCMAssembler:
+    """
+    Lay out 16-bit PCM segments, gaps and crossfades in one buffer.
+
+    Usage:
+        assembler = PCMAssembler(sample_rate=32000, channels=1, crossfade_ms=20)
+        assembler.add(first)
+        assembler.add(second, gap_ms=450)      # 450ms of silence before it
+        assembler.add(third)                   # crossfaded into ``second``
+        pcm = assembler.render(normalize_headroom_db=0.1)
+        spans = assembler.layout()             # (start_frame, end_frame) per segment
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, *, crossfade_ms: int = 0):
+        if crossfade_ms < 0:
+            raise ValueError("crossfade_ms must not be negative")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.crossfade_frames = int(sample_rate * crossfade_ms / 1000)
+        # (samples, gap_frames, crossfade_allowed); samples are views, never copies
+        self._items: List[Tuple[np.ndarray, int, bool]] = []
+
+    def add(self, pcm, *, gap_ms: int = 0, crossfade: bool = True) -> int:
+        """
+        Queue a segment and return its index.
+
+        ``pcm`` may be bytes, a bytearray or an int16 array. ``gap_ms`` of
+        silence is placed before it; without a gap it is crossfaded into the
+        previous segment unless ``crossfade`` is False.
+        """
+        samples = pcm if isinstance(pcm, np.ndarray) else np.frombuffer(pcm, dtype=np.int16)
+        if samples.dtype != np.int16:
+            raise ValueError("PCMAssembler only accepts 16-bit PCM")
+        gap_frames = int(self.sample_rate * max(0, gap_ms) / 1000)
+        self._items.append((samples.reshape(-1), gap_frames, crossfade))
+        return len(self._items) - 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _overlaps(self) -> List[int]:
+        """Frames each segment overlaps the previous one by."""
+        overlaps = []
+        previous_frames = 0
+        for index, (samples, gap_frames, crossfade) in enumerate(self._items):
+            frames = len(samples) // self.channels
+            if index and not gap_frames and crossfade and self.crossfade_frames:
+                overlaps.append(min(self.crossfade_frames, previous_frames, frames))
+            else:
+                overlaps.append(0)
+            previous_frames = frames
+        return overlaps
+
+    def layout(self) -> List[Tuple[int, int]]:
+        """``(start_frame, end_frame)`` of every segment in the rendered buffer."""
+        spans = []
+        cursor = 0
+        for (samples, gap_frames, _crossfade), overlap in zip(self._items, self._overlaps()):
+            start = cursor + gap_frames - overlap
+            end = start + len(samples) // self.channels
+            spans.append((start, end))
+            cursor = end
+        return spans
+
+    @property
+    def total_frames(self) -> int:
+        spans = self.layout()
+        return spans[-1][1] if spans else 0
+
+    def render(self, *, normalize_headroom_db: Optional[float] = None) -> np.ndarray:
+        """
+        Return the assembled episode as one int16 array.
+
+        With ``normalize_headroom_db`` the result is scaled so that its peak
+        sits that many dB below full scale (same as pydub's ``normalize``).
+        """
+        spans = self.layout()
+        channels = self.channels
+        out = np.zeros((spans[-1][1] if spans else 0) * channels, dtype=np.int16)
+
+        for (samples, _gap, _crossfade), (start, end), overlap in zip(self._items, spans, self._overlaps()):
+            head = overlap * channels
+            np.copyto(out[(start + overlap) * channels:end * channels], samples[head:])
+            if overlap:
+                self._mix_crossfade(out[start * channels:(start + overlap) * channels], samples[:head], overlap)
+
+        if normalize_headroom_db is not None:
+            apply_peak_normalization(out, normalize_headroom_db)
+        return out
+
+    def _mix_crossfade(self, region: np.ndarray, incoming: np.ndarray, frames: int) -> None:
+        """Linear crossfade, in place, from the previous segment's tail in ``region`` to ``incoming``."""
+        fade_in = np.linspace(0.0, 1.0, frames, dtype=np.float32)
+        if self.channels > 1:
+            fade_in = np.repeat(fade_in, self.channels)
+        mixed = region * (1.0 - fade_in) + incoming * fade_in
+        np.clip(mixed, -INT16_MAX - 1, INT16_MAX, out=mixed)
+        np.copyto(region, mixed, casting="unsafe")
+
+
+def apply_peak_normalization(samples: np.ndarray, headroom_db: float = 0.1) -> float:
+    """
+    Scale int16 ``samples`` in place so the peak is ``headroom_db`` below full scale.
+
+    Returns the applied gain (1.0 for silence).
+    """
+    if not samples.size:
+        return 1.0
+    peak = max(abs(int(samples.max())), abs(int(samples.min())))
+    if not peak:
+        return 1.0
+
+    gain = (INT16_MAX * 10 ** (-headroom_db / 20)) / peak
+    if abs(gain - 1.0) < 1e-4:
+        return 1.0
+
+    for offset in range(0, samples.size, GAIN_CHUNK_SAMPLES):
+        chunk = samples[offset:offset + GAIN_CHUNK_SAMPLES]
+        scaled = chunk * np.float32(gain)
+        np.clip(scaled, -INT16_MAX - 1, INT16_MAX, out=scaled)
+        np.copyto(chunk, scaled, casting="unsafe")
+    return gain
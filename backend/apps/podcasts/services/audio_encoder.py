@@ -0,0 +1,282 @@
+"""
+Incremental PCM-to-MP3 encoding through an ffmpeg stdin pipe.
+
+Used by the podcast generator to write segments, silences and vocal logos
+straight into the encoder as they become available, so an episode is never
+held in memory as one giant pydub ``AudioSegment``. ``LiveHLSWriter``
+mirrors the same stream into an HLS playlist for listening while an episode
+is still being generated.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import tempfile
+from typing import List, Optional
+
+from pydub import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+
+class AudioEncoderError(RuntimeError):
+    """Raised when ffmpeg fails to encode the PCM stream."""
+
+
+class StreamingMP3Encoder:
+    """
+    Encode 16-bit little-endian PCM to MP3 as it is written.
+
+    The MP3 is written to a temporary file next to ``output_path`` and only
+    renamed into place by ``close()``, so a failed generation never leaves a
+    truncated episode behind.
+
+    Usage:
+        with StreamingMP3Encoder(path, sample_rate=32000, channels=1) as encoder:
+            encoder.write(pcm_bytes)
+            encoder.write_silence(500)
+    """
+
+    SAMPLE_WIDTH = 2  # 16-bit
+
+    def __init__(
+        self,
+        output_path: str,
+        *,
+        sample_rate: int,
+        channels: int = 1,
+        bitrate: Optional[str] = None,
+    ):
+        self.output_path = output_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bitrate = bitrate
+        self.frames_written = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._tmp_path: Optional[str] = None
+
+    @property
+    def frame_size(self) -> int:
+        return self.SAMPLE_WIDTH * self.channels
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frames_written / float(self.sample_rate)
+
+    def __enter__(self) -> "StreamingMP3Encoder":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _command(self) -> List[str]:
+        command = [
+            AudioSegment.converter,
+            "-hide_banner",
+            "-nostats",
+            "-loglevel", "error",
+            "-f", "s16le",
+            "-ar", str(self.sample_rate),
+            "-ac", str(self.channels),
+            "-i", "pipe:0",
+        ]
+        if self.bitrate:
+            command += ["-b:a", self.bitrate]
+        command += ["-f", "mp3", "-y", self._tmp_path]
+        return command
+
+    def open(self) -> None:
+        output_dir = os.path.dirname(self.output_path) or "."
+        os.makedirs(output_dir, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".mp3.part")
+        os.close(fd)
+
+        try:
+            self._process = subprocess.Popen(
+                self._command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as exc:
+            self._remove_tmp()
+            raise AudioEncoderError(f"无法启动 ffmpeg 编码器: {exc}") from exc
+
+    def write(self, pcm) -> None:
+        """
+        Append raw PCM frames to the stream.
+
+        Accepts any contiguous buffer (bytes, bytearray, memoryview or an
+        int16 numpy array), which is handed to the pipe without copying.
+        """
+        if self._process is None or self._process.stdin is None:
+            raise AudioEncoderError("编码器尚未启动")
+        nbytes = memoryview(pcm).nbytes
+        if not nbytes:
+            return
+
+        try:
+            self._process.stdin.write(pcm)
+        except BrokenPipeError as exc:
+            raise AudioEncoderError(f"ffmpeg 编码中断: {self._stderr()}") from exc
+        self.frames_written += nbytes // self.frame_size
+
+    def write_silence(self, duration_ms: int) -> None:
+        frames = int(self.sample_rate * duration_ms / 1000)
+        self.write(bytes(frames * self.frame_size))
+
+    def close(self) -> None:
+        """Flush the encoder and move the finished MP3 to ``output_path``."""
+        if self._process is None:
+            return
+
+        process, self._process = self._process, None
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = process.wait()
+        stderr = process.stderr.read().decode("utf-8", "replace").strip() if process.stderr else ""
+        if process.stderr:
+            process.stderr.close()
+
+        if returncode != 0:
+            self._remove_tmp()
+            raise AudioEncoderError(f"ffmpeg 编码失败 (exit {returncode}): {stderr}")
+
+        self._publish()
+        logger.debug("编码完成: %s (%.1fs)", self.output_path, self.duration_seconds)
+
+    def _publish(self) -> None:
+        os.replace(self._tmp_path, self.output_path)
+        self._tmp_path = None
+
+    def abort(self) -> None:
+        """Stop ffmpeg and discard the partial output."""
+        process, self._process = self._process, None
+        if process is not None:
+            process.kill()
+            process.wait()
+            for stream in (process.stdin, process.stderr):
+                if stream:
+                    try:
+                        stream.close()
+                    except OSError:
+                        pass
+        self._remove_tmp()
+
+    def _stderr(self) -> str:
+        if self._process is None or self._process.stderr is None:
+            return ""
+        self._process.wait()
+        return self._process.stderr.read().decode("utf-8", "replace").strip()
+
+    def _remove_tmp(self) -> None:
+        if self._tmp_path and os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+        self._tmp_path = None
+
+
+class LiveHLSWriter(StreamingMP3Encoder):
+    """
+    Mirror a PCM stream into a growing HLS playlist while it is being written.
+
+    ffmpeg's HLS muxer cuts the stream into ``segment_seconds`` AAC segments
+    and rewrites ``index.m3u8`` (an EVENT playlist) after each one, so
+    players can start listening before the episode is finished. ``close()``
+    appends ``#EXT-X-ENDLIST``.
+
+    Usage:
+        with LiveHLSWriter(live_dir, sample_rate=32000, segment_seconds=6) as live:
+            live.write(pcm_bytes)
+        playable_seconds(live.output_path)
+    """
+
+    PLAYLIST_NAME = "index.m3u8"
+
+    def __init__(
+        self,
+        output_dir: str,
+        *,
+        sample_rate: int,
+        channels: int = 1,
+        segment_seconds: float = 6.0,
+        bitrate: Optional[str] = "128k",
+    ):
+        super().__init__(
+            os.path.join(output_dir, self.PLAYLIST_NAME),
+            sample_rate=sample_rate,
+            channels=channels,
+            bitrate=bitrate,
+        )
+        self.output_dir = output_dir
+        self.segment_seconds = segment_seconds
+
+    def _command(self) -> List[str]:
+        command = [
+            AudioSegment.converter,
+            "-hide_banner",
+            "-nostats",
+            "-loglevel", "error",
+            "-f", "s16le",
+            "-ar", str(self.sample_rate),
+            "-ac", str(self.channels),
+            "-i", "pipe:0",
+            "-c:a", "aac",
+        ]
+        if self.bitrate:
+            command += ["-b:a", self.bitrate]
+        command += [
+            "-f", "hls",
+            "-hls_time", f"{self.segment_seconds:g}",
+            "-hls_list_size", "0",
+            "-hls_playlist_type", "event",
+            # Segments appear under their final name only once complete
+            "-hls_flags", "temp_file",
+            "-hls_segment_filename", os.path.join(self.output_dir, "seg-%05d.ts"),
+            "-y", self.output_path,
+        ]
+        return command
+
+    def open(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        try:
+            self._process = subprocess.Popen(
+                self._command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as exc:
+            raise AudioEncoderError(f"无法启动 ffmpeg HLS 编码器: {exc}") from exc
+
+    def write(self, pcm) -> None:
+        super().write(pcm)
+        try:
+            # Don't let the tail of a segment sit in the pipe buffer while listeners wait for it
+            self._process.stdin.flush()
+        except BrokenPipeError as exc:
+            raise AudioEncoderError(f"ffmpeg HLS 编码中断: {self._stderr()}") from exc
+
+    def _publish(self) -> None:
+        # ffmpeg writes the playlist and segments in place
+        pass
+
+
+def playable_seconds(playlist_path: str) -> float:
+    """Total duration of the segments listed in an HLS playlist (0 if it does not exist yet)."""
+    try:
+        with open(playlist_path, encoding="utf-8") as playlist:
+            return sum(
+                float(line[len("#EXTINF:"):].split(",", 1)[0])
+                for line in playlist
+                if line.startswith("#EXTINF:")
+            )
+    except (OSError, ValueError):
+        return 0.0
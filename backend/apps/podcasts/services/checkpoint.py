@@ -0,0 +1,119 @@
+"""
+Per-episode checkpoints of synthesized segment audio.
+
+While an episode is generated every finished segment's PCM is written to a
+work directory, named by its position in the script and a hash of its text
+and voice settings. If the worker dies or MiniMax fails part-way through,
+the retried task finds those files and only synthesizes what is missing.
+The per-voice segment lengths the script was first split with are kept in
+``manifest.json`` next to them, so a retry splits it the same way.
+The directory is removed once the episode has been published.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from .minimax_client import MiniMaxVoiceConfig
+from .tts_cache import TTSSegmentCache
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_FILE_RE = re.compile(r"^seg-(\d{5})\.[0-9a-f]{16}\.pcm$")
+MANIFEST_NAME = "manifest.json"
+
+
+class GenerationCheckpoint:
+    """
+    Work directory holding ``seg-<index>.<key>.pcm`` files for one episode.
+
+    The key ties each file to the segment's text and voice settings, so a
+    retry after editing the script only reuses segments that are unchanged.
+    """
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.restored = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_episode(cls, episode_id, minimax_settings: Dict[str, object]) -> Optional["GenerationCheckpoint"]:
+        root = str(minimax_settings.get("checkpoint_dir") or "").strip()
+        if not root:
+            return None
+        return cls(os.path.join(root, f"episode-{episode_id}"))
+
+    def load(self, index: int, config: MiniMaxVoiceConfig, text: str) -> Optional[bytes]:
+        """Return the PCM recorded for segment ``index`` if its text and voice still match."""
+        try:
+            with open(self._path(index, config, text), "rb") as fh:
+                data = fh.read()
+        except OSError:
+            return None
+
+        with self._lock:
+            self.restored += 1
+        return data
+
+    def save(self, index: int, config: MiniMaxVoiceConfig, text: str, pcm) -> None:
+        """Record segment ``index``; failures are logged and otherwise ignored."""
+        path = self._path(index, config, text)
+        try:
+            os.makedirs(self.work_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.work_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(pcm)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError as exc:
+            logger.warning("写入生成检查点失败，已跳过: %s (%s)", path, exc)
+
+    def segment_limits(self) -> Dict[str, int]:
+        """Per-voice ``max_chars`` recorded by an earlier attempt (empty if none)."""
+        try:
+            with open(os.path.join(self.work_dir, MANIFEST_NAME), encoding="utf-8") as fh:
+                limits = json.load(fh).get("max_chars", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+        return {str(key): int(value) for key, value in limits.items()}
+
+    def save_segment_limits(self, limits: Dict[str, int]) -> None:
+        path = os.path.join(self.work_dir, MANIFEST_NAME)
+        try:
+            os.makedirs(self.work_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.work_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump({"max_chars": limits}, fh)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError as exc:
+            logger.warning("写入生成检查点清单失败，已跳过: %s (%s)", path, exc)
+
+    def completed_indexes(self) -> set:
+        try:
+            names = os.listdir(self.work_dir)
+        except OSError:
+            return set()
+        return {int(match.group(1)) for match in map(SEGMENT_FILE_RE.match, names) if match}
+
+    def clear(self) -> None:
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _path(self, index: int, config: MiniMaxVoiceConfig, text: str) -> str:
+        key = TTSSegmentCache.make_key(config, text)
+        return os.path.join(self.work_dir, f"seg-{index:05d}.{key[:16]}.pcm")
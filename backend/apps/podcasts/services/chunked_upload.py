@@ -0,0 +1,94 @@
+"""
+Chunked, resumable episode uploads.
+
+A client opens an upload with the file size (and optionally its SHA-256),
+then PUTs the file in chunks at increasing offsets. Every chunk is written
+straight into the episode's final location under ``MEDIA_ROOT`` so
+completion is a rename-free hand-off to ``process_episode_audio``. An
+interrupted client asks for ``received_size`` and continues from there.
+Uploads that receive no chunk for ``AUDIO_UPLOAD_EXPIRE_HOURS`` are removed,
+partial file included, by ``cleanup_stale_uploads_task``.
+
+Each request moves at most ``AUDIO_UPLOAD_CHUNK_MAX_SIZE`` bytes, read in
+small blocks, so no request holds a worker or much memory for long.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import BinaryIO, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+class ChunkError(Exception):
+    """A chunk was rejected; ``received_size`` is unchanged."""
+
+
+def allocate_upload_path(filename: str, upload_id) -> str:
+    """Path relative to MEDIA_ROOT, laid out like ``Episode.audio_file``'s upload_to."""
+    extension = os.path.splitext(filename)[1].lower()
+    return os.path.join(timezone.now().strftime('episodes/%Y/%m'), f"{upload_id}{extension}")
+
+
+def absolute_path(file_path: str) -> str:
+    return os.path.join(settings.MEDIA_ROOT, file_path)
+
+
+def create_upload_file(file_path: str) -> None:
+    path = absolute_path(file_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+
+
+def write_chunk(
+    file_path: str,
+    offset: int,
+    stream: BinaryIO,
+    length: int,
+    *,
+    expected_sha256: Optional[str] = None,
+) -> int:
+    """
+    Write ``length`` bytes from ``stream`` at ``offset``.
+
+    A short read or checksum mismatch truncates the file back to ``offset``
+    so the chunk can simply be sent again. Returns the new end offset.
+    """
+    digest = hashlib.sha256()
+    written = 0
+    with open(absolute_path(file_path), 'r+b') as handle:
+        handle.seek(offset)
+        try:
+            while written < length:
+                block = stream.read(min(READ_BLOCK_SIZE, length - written))
+                if not block:
+                    raise ChunkError('分片数据不完整，请重新上传该分片')
+                handle.write(block)
+                digest.update(block)
+                written += len(block)
+            if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+                raise ChunkError('分片校验失败，请重新上传该分片')
+        except BaseException:
+            handle.truncate(offset)
+            raise
+    return offset + written
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(absolute_path(file_path), 'rb') as handle:
+        for block in iter(lambda: handle.read(READ_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def remove_upload_file(file_path: str) -> None:
+    try:
+        os.remove(absolute_path(file_path))
+    except FileNotFoundError:
+        pass
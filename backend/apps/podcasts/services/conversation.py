@@ -1,12 +1,104 @@
 """
 多参与者对话管理器 - 用于Debate和Conference模式
 """
-from typing import Dict, List, Optional, Callable, Iterator
+import time
+from typing import AsyncIterator, Awaitable, Dict, Generator, List, Optional, Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
-from openai import OpenAI
+from functools import partial
+from openai import AsyncOpenAI, OpenAI
 from django.conf import settings
 
+# 流式生成时合并 token 的时间窗口（秒），避免每个 token 推送一次
+STREAM_FLUSH_INTERVAL = 0.05
+
+
+def stream_chat_completion(
+    client,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    flush_interval: float = STREAM_FLUSH_INTERVAL,
+    **params
+) -> str:
+    """
+    调用 chat.completions 并返回完整回复
+
+    传入 on_chunk 时使用流式接口，把 flush_interval 内收到的 token 合并后回调 on_chunk(text)，
+    第一个 token 立即回调；不传时与普通调用相同。
+    """
+    if on_chunk is None:
+        response = client.chat.completions.create(**params)
+        return response.choices[0].message.content.strip()
+
+    parts: List[str] = []
+    pending: List[str] = []
+    last_flush = 0.0
+    for event in client.chat.completions.create(stream=True, **params):
+        if not event.choices:
+            continue
+        text = event.choices[0].delta.content or ''
+        if not text:
+            continue
+        parts.append(text)
+        pending.append(text)
+        now = time.monotonic()
+        if now - last_flush >= flush_interval:
+            on_chunk(''.join(pending))
+            pending.clear()
+            last_flush = now
+    if pending:
+        on_chunk(''.join(pending))
+    return ''.join(parts).strip()
+
+
+async def astream_chat_completion(
+    client: AsyncOpenAI,
+    on_chunk: Optional[Callable[[str], Awaitable[None]]] = None,
+    flush_interval: float = STREAM_FLUSH_INTERVAL,
+    **params
+) -> str:
+    """stream_chat_completion 的异步版本，on_chunk 为协程函数"""
+    if on_chunk is None:
+        response = await client.chat.completions.create(**params)
+        return response.choices[0].message.content.strip()
+
+    parts: List[str] = []
+    pending: List[str] = []
+    last_flush = 0.0
+    async for event in await client.chat.completions.create(stream=True, **params):
+        if not event.choices:
+            continue
+        text = event.choices[0].delta.content or ''
+        if not text:
+            continue
+        parts.append(text)
+        pending.append(text)
+        now = time.monotonic()
+        if now - last_flush >= flush_interval:
+            await on_chunk(''.join(pending))
+            pending.clear()
+            last_flush = now
+    if pending:
+        await on_chunk(''.join(pending))
+    return ''.join(parts).strip()
+
+
+def _send(plan: Generator, content: str):
+    """把生成的内容交给发言安排，返回下一轮请求（没有则为 None）"""
+    try:
+        return plan.send(content)
+    except StopIteration:
+        return None
+
+
+@dataclass
+class _Turn:
+    """一次发言请求"""
+    participant_id: str
+    messages: List[Dict[str, str]]
+    temperature: float
+    max_tokens: int
+    history_prompt: Optional[str] = None  # 需要记入参与者历史的提问（参与者回复时）
+
 
 @dataclass
 class ParticipantConfig:
@@ -67,6 +159,7 @@ class ConversationManager:
             base_url=getattr(settings, 'OPENAI_API_BASE', 'https://api.moonshot.cn/v1')
         )
         self.model = getattr(settings, 'OPENAI_MODEL', 'moonshot-v1-8k')
+        self._async_client: Optional[AsyncOpenAI] = None
 
     def _get_next_speaker(self, topic: str, round_num: int) -> Optional[str]:
         """
@@ -132,94 +225,96 @@ class ConversationManager:
 
         Args:
             topic: 对话主题（辩题或学习主题）
-            on_chunk: 回调函数 on_chunk(participant_id, content_chunk)
+            on_chunk: 回调函数 on_chunk(participant_id, content_chunk)，
+                发言生成过程中按 STREAM_FLUSH_INTERVAL 合并推送文本片段
 
         Yields:
             {"participant": "llm1", "content": "...", "timestamp": "...", "role": "..."}
         """
-        if self.policy == "sequential":
-            # 顺序策略：固定顺序生成
-            yield from self._generate_sequential(topic, on_chunk)
-        elif self.policy == "unified_ratio":
-            # 统一比例策略：智能选择发言人
-            yield from self._generate_unified_ratio(topic, on_chunk)
-        else:
-            # 默认顺序策略
-            yield from self._generate_sequential(topic, on_chunk)
+        plan = self._plan(topic)
+        turn = next(plan, None)
+        while turn is not None:
+            chunk_callback = None
+            if on_chunk:
+                chunk_callback = partial(on_chunk, turn.participant_id)
+            content = stream_chat_completion(self.client, chunk_callback, **self._request(turn))
+            yield self._finish_turn(turn, content)
+            turn = _send(plan, content)
 
-    def _generate_sequential(
+    async def agenerate_dialogue(
         self,
         topic: str,
-        on_chunk: Optional[Callable[[str, str], None]] = None
-    ) -> Iterator[Dict]:
+        on_chunk: Optional[Callable[[str, str], Awaitable[None]]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        generate_dialogue 的异步版本（AsyncOpenAI），供 WebSocket 等运行在事件循环中的调用方使用，
+        等待模型时不阻塞事件循环
+
+        Args:
+            topic: 对话主题
+            on_chunk: 异步回调 await on_chunk(participant_id, content_chunk)
+        """
+        plan = self._plan(topic)
+        turn = next(plan, None)
+        while turn is not None:
+            chunk_callback = None
+            if on_chunk:
+                chunk_callback = partial(on_chunk, turn.participant_id)
+            content = await astream_chat_completion(self.async_client, chunk_callback, **self._request(turn))
+            yield self._finish_turn(turn, content)
+            turn = _send(plan, content)
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI 客户端（首次使用时创建，同步调用方不需要）"""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.client.api_key,
+                base_url=self.client.base_url
+            )
+        return self._async_client
+
+    def _plan(self, topic: str) -> Generator[_Turn, str, None]:
+        """按策略安排发言：依次产出每轮的请求，并接收生成的内容"""
+        if self.policy == "unified_ratio":
+            # 统一比例策略：智能选择发言人
+            return self._plan_unified_ratio(topic)
+        # 顺序策略（默认）：固定顺序生成
+        return self._plan_sequential(topic)
+
+    def _plan_sequential(self, topic: str) -> Generator[_Turn, str, None]:
         """顺序策略生成对话（原有逻辑）"""
         # 获取参与者顺序（根据participants的顺序）
         participant_order = list(self.participants.keys())
 
         # 第一轮：judge/tutor开场
         moderator_id = participant_order[2]  # 假设第3个是主持人/导师
-        opening = self._generate_opening(moderator_id, topic)
-
-        # 记录并yield开场白
-        entry = self._log_message(moderator_id, opening)
-        if on_chunk:
-            on_chunk(moderator_id, opening)
-        yield entry
+        yield self._opening_turn(moderator_id, topic)
 
         # 多轮对话
         for round_num in range(1, self.rounds + 1):
             # 参与者1发言
-            response_1 = self._generate_response(
-                participant_order[0],
-                topic,
-                round_num
-            )
-            entry_1 = self._log_message(participant_order[0], response_1)
-            if on_chunk:
-                on_chunk(participant_order[0], response_1)
-            yield entry_1
+            yield self._response_turn(participant_order[0], topic, round_num)
 
             # 参与者2发言
-            response_2 = self._generate_response(
-                participant_order[1],
-                topic,
-                round_num
-            )
-            entry_2 = self._log_message(participant_order[1], response_2)
-            if on_chunk:
-                on_chunk(participant_order[1], response_2)
-            yield entry_2
+            yield self._response_turn(participant_order[1], topic, round_num)
 
             # 主持人/导师点评
             if round_num < self.rounds:  # 不是最后一轮
-                comment = self._generate_comment(moderator_id, round_num)
+                yield self._comment_turn(moderator_id, round_num)
             else:  # 最后一轮，总结
-                comment = self._generate_summary(moderator_id)
-
-            entry_mod = self._log_message(moderator_id, comment)
-            if on_chunk:
-                on_chunk(moderator_id, comment)
-            yield entry_mod
+                yield self._summary_turn(moderator_id)
 
-    def _generate_unified_ratio(
-        self,
-        topic: str,
-        on_chunk: Optional[Callable[[str, str], None]] = None
-    ) -> Iterator[Dict]:
+    def _plan_unified_ratio(self, topic: str) -> Generator[_Turn, str, None]:
         """
         统一比例策略生成对话
         根据字数比例智能选择发言人，实现更平衡的对话
         """
         # 开场：judge/tutor 开场
         moderator_id = self._get_next_speaker(topic, 0)
-        opening = self._generate_opening(moderator_id, topic)
+        opening = yield self._opening_turn(moderator_id, topic)
         self._update_word_count(moderator_id, opening)
 
-        entry = self._log_message(moderator_id, opening)
-        if on_chunk:
-            on_chunk(moderator_id, opening)
-        yield entry
-
         # 多轮对话，每轮根据比例选择发言人
         for round_num in range(1, self.rounds * 2 + 1):  # 更多发言机会
             speaker_id = self._get_next_speaker(topic, round_num)
@@ -228,23 +323,17 @@ class ConversationManager:
             if speaker_id == moderator_id:
                 # 主持人/导师发言
                 if round_num < self.rounds * 2:
-                    content = self._generate_comment(moderator_id, round_num)
+                    content = yield self._comment_turn(moderator_id, round_num)
                 else:
-                    content = self._generate_summary(moderator_id)
+                    content = yield self._summary_turn(moderator_id)
             else:
                 # 其他参与者发言
-                content = self._generate_response(speaker_id, topic, round_num)
+                content = yield self._response_turn(speaker_id, topic, round_num)
 
             # 更新字数统计
             self._update_word_count(speaker_id, content)
 
-            # 记录并yield
-            entry = self._log_message(speaker_id, content)
-            if on_chunk:
-                on_chunk(speaker_id, content)
-            yield entry
-
-    def _generate_opening(self, participant_id: str, topic: str) -> str:
+    def _opening_turn(self, participant_id: str, topic: str) -> _Turn:
         """生成开场白"""
         participant = self.participants[participant_id]
 
@@ -255,26 +344,14 @@ class ConversationManager:
             {"role": "user", "content": prompt}
         ]
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.8,
-            max_tokens=200
-        )
-
-        content = response.choices[0].message.content.strip()
-
-        # 添加到历史
-        self.histories[participant_id].append({"role": "assistant", "content": content})
+        return _Turn(participant_id, messages, temperature=0.8, max_tokens=200)
 
-        return content
-
-    def _generate_response(
+    def _response_turn(
         self,
         participant_id: str,
         topic: str,
         round_num: int
-    ) -> str:
+    ) -> _Turn:
         """生成参与者回复"""
         participant = self.participants[participant_id]
 
@@ -297,22 +374,9 @@ class ConversationManager:
         for msg in self.histories[participant_id]:
             messages.insert(-1, msg)  # 插在最后一条user消息前
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.9,
-            max_tokens=500
-        )
-
-        content = response.choices[0].message.content.strip()
-
-        # 添加到历史
-        self.histories[participant_id].append({"role": "user", "content": prompt})
-        self.histories[participant_id].append({"role": "assistant", "content": content})
-
-        return content
+        return _Turn(participant_id, messages, temperature=0.9, max_tokens=500, history_prompt=prompt)
 
-    def _generate_comment(self, participant_id: str, round_num: int) -> str:
+    def _comment_turn(self, participant_id: str, round_num: int) -> _Turn:
         """生成主持人点评"""
         participant = self.participants[participant_id]
 
@@ -330,21 +394,9 @@ class ConversationManager:
             {"role": "user", "content": prompt}
         ]
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=400
-        )
-
-        content = response.choices[0].message.content.strip()
-
-        # 添加到历史
-        self.histories[participant_id].append({"role": "assistant", "content": content})
+        return _Turn(participant_id, messages, temperature=0.7, max_tokens=400)
 
-        return content
-
-    def _generate_summary(self, participant_id: str) -> str:
+    def _summary_turn(self, participant_id: str) -> _Turn:
         """生成总结"""
         participant = self.participants[participant_id]
 
@@ -365,19 +417,24 @@ class ConversationManager:
             {"role": "user", "content": prompt}
         ]
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.6,
-            max_tokens=600
-        )
+        return _Turn(participant_id, messages, temperature=0.6, max_tokens=600)
 
-        content = response.choices[0].message.content.strip()
+    def _request(self, turn: _Turn) -> Dict:
+        return {
+            "model": self.model,
+            "messages": turn.messages,
+            "temperature": turn.temperature,
+            "max_tokens": turn.max_tokens,
+        }
 
+    def _finish_turn(self, turn: _Turn, content: str) -> Dict:
+        """把生成的发言加入历史和对话日志"""
         # 添加到历史
-        self.histories[participant_id].append({"role": "assistant", "content": content})
+        if turn.history_prompt is not None:
+            self.histories[turn.participant_id].append({"role": "user", "content": turn.history_prompt})
+        self.histories[turn.participant_id].append({"role": "assistant", "content": content})
 
-        return content
+        return self._log_message(turn.participant_id, content)
 
     def _build_context(
         self,
@@ -206,9 +206,13 @@ def apply_show_cover_candidate(show, candidate_path: str) -> str:
     return show.cover.url
 
 
-def generate_episode_cover(episode) -> bool:
+def render_episode_cover(episode) -> bytes | None:
+    """Generate cover image bytes without touching the database (safe to run in a worker thread)."""
     prompt = _build_prompt(title=episode.title, script=episode.script or "")
-    image_bytes = _generate_cover_bytes(prompt)
+    return _generate_cover_bytes(prompt)
+
+
+def save_episode_cover(episode, image_bytes: bytes | None) -> bool:
     if not image_bytes:
         return False
 
@@ -216,3 +220,7 @@ def generate_episode_cover(episode) -> bool:
     episode.cover.save(filename, ContentFile(image_bytes), save=False)
     episode.save(update_fields=["cover", "updated_at"])
     return True
+
+
+def generate_episode_cover(episode) -> bool:
+    return save_episode_cover(episode, render_episode_cover(episode))
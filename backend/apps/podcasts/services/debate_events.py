@@ -0,0 +1,181 @@
+"""
+Per-episode debate events over Redis pub/sub.
+
+Debate tasks publish every new dialogue entry, text delta and the final
+status to ``podcasts:debate:<episode id>``; SSE viewers subscribe to that
+channel instead of polling the database. ``DialogueEntry`` rows are read once
+per connection for catch-up, after subscribing, and entries are
+de-duplicated by their ``seq`` (the event index).
+
+Publishing is best-effort: if Redis is unreachable the event is dropped and
+publishing is retried after a short cooldown, and viewers fall back to
+polling the database.
+
+Usage:
+    publish_debate_event(episode.id, "dialogue", entry, index=3)
+    deltas = DeltaPublisher(episode.id)  # on_chunk for a streamed turn
+    pubsub = subscribe(episode.id)  # None when Redis is unavailable
+    pubsub = await subscribe_async(episode.id)  # ASGI viewers, no thread per stream
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "podcasts:debate"
+REDIS_RETRY_AFTER = 30.0  # seconds without Redis before trying again
+
+# Events that end a viewer's stream
+TERMINAL_EVENTS = {"complete", "stream_error"}
+
+_client: Optional[redis.Redis] = None
+_client_lock = threading.Lock()
+_retry_at = 0.0
+
+
+def channel_name(episode_id: int) -> str:
+    return f"{CHANNEL_PREFIX}:{episode_id}"
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _redis_url() -> str:
+    return str(getattr(settings, "DEBATE_EVENTS_REDIS_URL", "") or "").strip()
+
+
+def _get_client() -> Optional[redis.Redis]:
+    global _client
+    url = _redis_url()
+    if not url or time.monotonic() < _retry_at:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return _client
+
+
+def _mark_unavailable(exc: Exception) -> None:
+    global _retry_at
+    logger.warning("Redis 辩论事件通道不可用: %s", exc)
+    _retry_at = time.monotonic() + REDIS_RETRY_AFTER
+
+
+def publish_debate_event(episode_id: int, event: str, data: Dict[str, Any], *, index: Optional[int] = None) -> bool:
+    """Publish ``event`` to the episode's viewers; returns False if it could not be sent."""
+    client = _get_client()
+    if client is None:
+        return False
+    message = {"event": event, "data": data}
+    if index is not None:
+        message["index"] = index
+    try:
+        client.publish(channel_name(episode_id), json.dumps(message))
+    except redis.RedisError as exc:
+        _mark_unavailable(exc)
+        return False
+    return True
+
+
+class DeltaPublisher:
+    """
+    ``on_chunk(participant_id, text)`` callback that publishes the entry being
+    generated as ``delta`` events.
+
+    The entry's ``seq`` is only known once it is appended (a human message may
+    take the next one while the turn is streaming), so deltas are keyed by
+    ``turn_id`` instead of an index. Each event carries the whole text so far;
+    the finished entry, tagged with ``finish``, carries the same ``turnId`` in
+    its ``dialogue`` event and tells viewers where the streamed text belongs.
+    ``advance`` then starts a new turn.
+    """
+
+    def __init__(self, episode_id: int):
+        self.episode_id = episode_id
+        self.turn_id = uuid.uuid4().hex
+        self.content = ""
+
+    def __call__(self, participant_id: str, text: str) -> None:
+        self.content += text
+        publish_debate_event(
+            self.episode_id,
+            "delta",
+            {"turnId": self.turn_id, "participant": participant_id, "content": self.content.strip()},
+        )
+
+    def finish(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of the finished ``entry`` tagged with this turn's ``turnId``."""
+        return {**entry, "turnId": self.turn_id}
+
+    def advance(self) -> None:
+        self.turn_id = uuid.uuid4().hex
+        self.content = ""
+
+
+def subscribe(episode_id: int):
+    """Subscribed ``PubSub`` for the episode (caller closes it), or None without Redis."""
+    url = _redis_url()
+    if not url or time.monotonic() < _retry_at:
+        return None
+    # Subscriptions hold their connection for the whole stream, so they get their own client
+    client = redis.Redis.from_url(url, socket_connect_timeout=0.5)
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(channel_name(episode_id))
+    except redis.RedisError as exc:
+        _mark_unavailable(exc)
+        pubsub.close()
+        return None
+    return pubsub
+
+
+async def subscribe_async(episode_id: int):
+    """``subscribe`` for the event loop: a subscribed ``redis.asyncio`` PubSub, or None."""
+    url = _redis_url()
+    if not url or time.monotonic() < _retry_at:
+        return None
+    client = aioredis.Redis.from_url(url, socket_connect_timeout=0.5)
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(channel_name(episode_id))
+    except redis.RedisError as exc:
+        _mark_unavailable(exc)
+        await pubsub.aclose()
+        return None
+    return pubsub
+
+
+def decode_message(message: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not message or message.get("type") != "message":
+        return None
+    try:
+        return json.loads(message["data"])
+    except (TypeError, ValueError):
+        return None
+
+
+def terminal_event(episode, total: int) -> Optional[tuple]:
+    """
+    The (event, data) that ends a stream for an episode that is no longer generating.
+
+    ``total`` is the number of dialogue entries the viewer has received.
+    """
+    if episode.status == "failed":
+        return "stream_error", {"error": episode.generation_error or "生成失败"}
+    if episode.status == "published" or (
+        episode.status == "draft" and episode.generation_stage == "script_completed"
+    ):
+        return "complete", {"status": episode.status, "total": total}
+    return None
@@ -4,8 +4,9 @@ MoFA `podcast-generator` flow (flows/podcast-generator).
 
 Updated to match MoFA Flow logic exactly:
 - Time-based text segmentation (instead of fixed character count)
-- Float32 audio processing with batching
+- Native 16-bit PCM from the MiniMax frames to the encoder (no float round trip)
 - Enhanced punctuation handling
+- Segments are encoded to MP3 incrementally as they are synthesized
 """
 
 from __future__ import annotations
@@ -14,20 +15,34 @@ import asyncio
 import logging
 import os
 import random
-import re
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 from django.conf import settings
 from pydub import AudioSegment
 
-from .minimax_client import MiniMaxError, MiniMaxVoiceConfig, synthesize_to_pcm
+from .assembly import PCMAssembler
+from .audio_encoder import AudioEncoderError, LiveHLSWriter, StreamingMP3Encoder
+from .checkpoint import GenerationCheckpoint
+from .minimax_client import (
+    DEFAULT_WS_URL,
+    MiniMaxError,
+    MiniMaxRetryPolicy,
+    MiniMaxSessionPool,
+    MiniMaxVoiceConfig,
+    synthesize_pcm16,
+    synthesize_pcm16_batch,
+)
+from .rate_limit import MiniMaxRateLimiter
+from .segmenter import DEFAULT_PUNCTUATION_MARKS, ScriptSegmenter
+from .speaking_rate import SpeakingRateTracker
+from .tts_cache import TTSSegmentCache
 
 logger = logging.getLogger(__name__)
 
-# MoFA Flow default punctuation marks (more comprehensive)
-DEFAULT_PUNCTUATION_MARKS = "。！？.!?，,、；;：:"
-
 
 def _get_vocal_logo_paths() -> Tuple[Optional[str], Optional[str], bool]:
     minimax_settings = getattr(settings, "MINIMAX_TTS", {}) or {}
@@ -44,46 +59,80 @@ def _get_vocal_logo_paths() -> Tuple[Optional[str], Optional[str], bool]:
     return start_path or None, end_path or None, True
 
 
-def _prepend_append_vocal_logo(audio: AudioSegment) -> AudioSegment:
+# Decoded vocal logos per worker process: (path, sample_rate, channels) -> (mtime_ns, size, pcm)
+_VOCAL_LOGO_CACHE: Dict[Tuple[str, int, int], Tuple[int, int, bytes]] = {}
+
+
+def _load_vocal_logo_pcm(path: Optional[str], label: str, sample_rate: int, channels: int) -> Optional[bytes]:
+    """
+    Return one vocal logo as 16-bit PCM in the requested layout.
+
+    The file is decoded and resampled once per process and reused until its
+    mtime or size changes.
+    """
+    if not path:
+        return None
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        logger.warning("%s vocal logo 文件不存在，已跳过: %s", label, path)
+        return None
+
+    key = (os.path.abspath(path), sample_rate, channels)
+    cached = _VOCAL_LOGO_CACHE.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    try:
+        pcm = _to_pcm(AudioSegment.from_file(path), sample_rate, channels)
+    except Exception as exc:
+        logger.warning("加载%s vocal logo 失败，已跳过: %s (%s)", label, path, exc)
+        return None
+
+    _VOCAL_LOGO_CACHE[key] = (stat.st_mtime_ns, stat.st_size, pcm)
+    return pcm
+
+
+def _load_vocal_logos(sample_rate: int, channels: int) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """Return the start/end vocal logos as ready-to-write 16-bit PCM, or None where disabled/missing."""
     start_path, end_path, enabled = _get_vocal_logo_paths()
     if not enabled:
-        return audio
+        return None, None
 
-    start_logo: Optional[AudioSegment] = None
-    end_logo: Optional[AudioSegment] = None
+    return (
+        _load_vocal_logo_pcm(start_path, "片头", sample_rate, channels),
+        _load_vocal_logo_pcm(end_path, "片尾", sample_rate, channels),
+    )
 
-    if start_path and os.path.exists(start_path):
-        try:
-            start_logo = AudioSegment.from_file(start_path)
-        except Exception as exc:
-            logger.warning("加载片头 vocal logo 失败，已跳过: %s (%s)", start_path, exc)
-    elif start_path:
-        logger.warning("片头 vocal logo 文件不存在，已跳过: %s", start_path)
 
-    if end_path and os.path.exists(end_path):
-        try:
-            end_logo = AudioSegment.from_file(end_path)
-        except Exception as exc:
-            logger.warning("加载片尾 vocal logo 失败，已跳过: %s (%s)", end_path, exc)
-    elif end_path:
-        logger.warning("片尾 vocal logo 文件不存在，已跳过: %s", end_path)
+def _prepend_append_vocal_logo(audio: AudioSegment) -> AudioSegment:
+    start_pcm, end_pcm = _load_vocal_logos(audio.frame_rate, audio.channels)
+
+    def as_segment(pcm: bytes) -> AudioSegment:
+        return AudioSegment(data=pcm, sample_width=2, frame_rate=audio.frame_rate, channels=audio.channels)
 
     final_audio = audio
-    if start_logo is not None:
-        final_audio = start_logo + final_audio
-    if end_logo is not None:
-        final_audio = final_audio + end_logo
+    if start_pcm is not None:
+        final_audio = as_segment(start_pcm) + final_audio
+    if end_pcm is not None:
+        final_audio = final_audio + as_segment(end_pcm)
 
-    if start_logo is not None or end_logo is not None:
+    if start_pcm is not None or end_pcm is not None:
         logger.info(
             "已添加 vocal logo: start=%s, end=%s",
-            start_logo is not None,
-            end_logo is not None,
+            start_pcm is not None,
+            end_pcm is not None,
         )
 
     return final_audio
 
 
+def _to_pcm(audio: AudioSegment, sample_rate: int, channels: int) -> bytes:
+    """Resample ``audio`` to the output layout and return its 16-bit PCM frames."""
+    return audio.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(2).raw_data
+
+
 def _coerce_bool(value, default: bool = True) -> bool:
     if value is None:
         return default
@@ -96,70 +145,56 @@ def _coerce_bool(value, default: bool = True) -> bool:
     return default
 
 
-def _find_split_index(text: str, max_length: int, split_marks: str) -> int:
-    """
-    Find a split index at or before max_length using provided marks or whitespace.
-
-    Copied from MoFA Flow script_segmenter for sentence-aware splitting.
-    """
-    if max_length <= 0:
-        return -1
+def _to_audio_segment(audio_int16: np.ndarray, sample_rate: int, config: MiniMaxVoiceConfig) -> AudioSegment:
+    """Wrap a 16-bit PCM buffer in an AudioSegment for pydub."""
+    return AudioSegment(
+        data=audio_int16.tobytes(),
+        sample_width=2,  # 16-bit
+        frame_rate=sample_rate,
+        channels=config.audio_channel,
+    )
 
-    limit = min(len(text), max_length)
 
-    # Try to split at punctuation marks first
-    if split_marks:
-        for idx in range(limit, 0, -1):
-            if text[idx - 1] in split_marks:
-                return idx
+@dataclass
+class SegmentTiming:
+    """Where one synthesized segment sits in the finished episode."""
 
-    # Fall back to whitespace
-    for idx in range(limit, 0, -1):
-        if text[idx - 1].isspace():
-            return idx
+    speaker: str
+    text: str
+    start_ms: int
+    end_ms: int
 
-    return -1
 
-
-def _split_long_text(text: str, max_length: int, punctuation_marks: str) -> List[str]:
+@dataclass
+class GenerationResult:
     """
-    Split long text into chunks that respect sentence boundaries.
-
-    Args:
-        text: Text to split
-        max_length: Maximum characters per segment
-        punctuation_marks: String of punctuation marks for splitting
+    Summary of a generated episode, computed from the PCM written to the encoder.
 
-    Returns:
-        List of text segments (all <= max_length if possible)
+    Callers use it instead of decoding the MP3 again to learn its duration.
     """
-    if max_length <= 0 or len(text) <= max_length:
-        return [text]
-
-    # Build split marks from punctuation
-    split_marks = set(punctuation_marks)
-
-    chunks: List[str] = []
-    remainder = text.strip()
-
-    while remainder:
-        if len(remainder) <= max_length:
-            chunks.append(remainder)
-            break
-
-        # Find best split point
-        split_idx = _find_split_index(remainder, max_length, punctuation_marks)
-        if split_idx == -1:
-            # No good split point found, force split at max_length
-            split_idx = max_length
-
-        chunk = remainder[:split_idx].strip()
-        if chunk:
-            chunks.append(chunk)
 
-        remainder = remainder[split_idx:].lstrip()
-
-    return chunks
+    output_path: str
+    sample_rate: int
+    channels: int
+    sample_count: int
+    file_size: int
+    segments: List[SegmentTiming] = field(default_factory=list)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.sample_count / float(self.sample_rate)
+
+    def timings_meta(self, text_preview_chars: int = 60) -> List[Dict[str, Any]]:
+        """Segment timestamps in a JSON-friendly form, e.g. for ``Episode.generation_meta``."""
+        return [
+            {
+                "speaker": timing.speaker,
+                "start_ms": timing.start_ms,
+                "end_ms": timing.end_ms,
+                "text": timing.text[:text_preview_chars],
+            }
+            for timing in self.segments
+        ]
 
 
 class PodcastGenerator:
@@ -217,6 +252,7 @@ class PodcastGenerator:
             minimax_settings.get("enable_english_normalization"), True
         )
         self.batch_duration_ms = int(minimax_settings.get("batch_duration_ms", 2000))
+        self.ws_url = str(minimax_settings.get("ws_url") or DEFAULT_WS_URL)
 
         # Time-based text segmentation (MoFA Flow approach)
         # Convert max duration (seconds) to character count
@@ -224,6 +260,7 @@ class PodcastGenerator:
         # For 10 seconds: ~40-50 characters
         max_segment_duration = float(minimax_settings.get("max_segment_duration", 10.0))  # seconds
         chars_per_second = float(minimax_settings.get("tts_chars_per_second", 4.5))  # Conservative for Chinese
+        self.max_segment_duration = max_segment_duration
         self.max_segment_chars = int(max_segment_duration * chars_per_second)
 
         logger.info(
@@ -233,12 +270,48 @@ class PodcastGenerator:
         )
 
         self.punctuation_marks = minimax_settings.get("punctuation_marks", DEFAULT_PUNCTUATION_MARKS)
+        self.segmenter = ScriptSegmenter(self.max_segment_chars, self.punctuation_marks)
+        # Per-voice chars/second learned from returned audio; sizes segments near max_segment_duration
+        self.speaking_rates = SpeakingRateTracker.from_settings(minimax_settings, chars_per_second)
+
+        self.synthesis_concurrency = int(minimax_settings.get("synthesis_concurrency", 4))
+        if self.synthesis_concurrency < 1:
+            raise ValueError("MiniMax 并发配置不正确，synthesis_concurrency 至少为 1")
+
+        # Keep started MiniMax tasks open and reuse them across segments
+        self.session_reuse = _coerce_bool(minimax_settings.get("session_reuse"), True)
+        self.session_idle_timeout = float(minimax_settings.get("session_idle_timeout", 30.0))
+
+        # Send runs of consecutive same-voice segments as one batch of task_continue messages
+        self.speaker_batching = _coerce_bool(minimax_settings.get("speaker_batching"), False)
+        self.speaker_batch_size = max(1, int(minimax_settings.get("speaker_batch_size", 8)))
+
+        # Content-addressed PCM cache: unchanged segments are never re-synthesized
+        self.segment_cache = TTSSegmentCache.from_settings(minimax_settings)
+
+        # Shared request budget across workers, and per-segment retry with backoff
+        self.rate_limiter = MiniMaxRateLimiter.from_settings(minimax_settings)
+        self.retry_policy = MiniMaxRetryPolicy.from_settings(minimax_settings)
 
         self.silence_min_ms = int(minimax_settings.get("silence_min_ms", 300))
         self.silence_max_ms = int(minimax_settings.get("silence_max_ms", 1200))
         if self.silence_min_ms < 0 or self.silence_max_ms < self.silence_min_ms:
             raise ValueError("MiniMax 静音区间配置不正确，请检查 silence_min_ms / silence_max_ms")
 
+        # 'stream' encodes segments as they arrive; 'buffer' lays the episode out in one
+        # NumPy buffer first, which enables crossfades and whole-episode peak normalization
+        self.assembly_mode = str(minimax_settings.get("assembly_mode") or "stream").lower()
+        if self.assembly_mode not in ("stream", "buffer"):
+            raise ValueError("MiniMax 拼接模式配置不正确，assembly_mode 只能是 stream 或 buffer")
+        self.crossfade_ms = int(minimax_settings.get("crossfade_ms", 0))
+        if self.crossfade_ms < 0:
+            raise ValueError("MiniMax 交叉淡化配置不正确，crossfade_ms 不能为负数")
+        headroom = minimax_settings.get("normalize_headroom_db", 0.1)
+        self.normalize_headroom_db = None if headroom in (None, "") else float(headroom)
+
+        # Duration of each HLS segment when listening while an episode generates
+        self.live_segment_seconds = float(minimax_settings.get("live_segment_seconds", 6.0))
+
         aliases = minimax_settings.get("aliases", {})
         if isinstance(aliases, dict):
             self.character_aliases = {**self.CHARACTER_ALIASES, **aliases}
@@ -268,6 +341,8 @@ class PodcastGenerator:
                     self.enable_english_normalization,
                 ),
                 batch_duration_ms=int(override.get("batch_duration_ms", self.batch_duration_ms)),
+                max_concurrency=int(override.get("max_concurrency", 0)),
+                ws_url=self.ws_url,
             )
 
         for alias, data in self.DEFAULT_VOICES.items():
@@ -293,6 +368,8 @@ class PodcastGenerator:
                     self.enable_english_normalization,
                 ),
                 batch_duration_ms=int(override.get("batch_duration_ms", self.batch_duration_ms)),
+                max_concurrency=int(override.get("max_concurrency", 0)),
+                ws_url=self.ws_url,
             )
             self.voice_configs[alias] = config
 
@@ -303,7 +380,19 @@ class PodcastGenerator:
         *,
         character_aliases: Optional[Dict[str, str]] = None,
         voice_overrides: Optional[Dict[str, Dict[str, object]]] = None,
-    ) -> str:
+        checkpoint: Optional[GenerationCheckpoint] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        live_dir: Optional[str] = None,
+    ) -> GenerationResult:
+        """
+        Synthesize ``script_content`` into an MP3 at ``output_path``.
+
+        With a ``checkpoint``, finished segments are recorded as they complete
+        and segments recorded by an earlier attempt are not synthesized again.
+        ``on_progress(completed, total)`` is called from a worker thread after
+        each segment is encoded. With ``live_dir``, the audio is also written
+        to a growing HLS playlist there while it is generated.
+        """
         logger.info("MiniMax 播客生成开始")
 
         effective_aliases = self._build_character_aliases(character_aliases)
@@ -314,7 +403,8 @@ class PodcastGenerator:
             character_aliases=effective_aliases,
             voice_configs=effective_voice_configs,
         )
-        segments = self._expand_segments(segments, voice_configs=effective_voice_configs)
+        limits = self._segment_limits(effective_voice_configs.values(), checkpoint)
+        segments = self._expand_segments(segments, voice_configs=effective_voice_configs, limits=limits)
 
         if not segments:
             raise ValueError("脚本中未找到有效的角色对话内容")
@@ -322,37 +412,39 @@ class PodcastGenerator:
         logger.info("共解析 %s 个语音片段", len(segments))
 
         try:
-            audio_segments = asyncio.run(
-                self._generate_all_segments(segments, voice_configs=effective_voice_configs)
+            result = asyncio.run(
+                self._encode_segments(
+                    self._generate_all_segments(
+                        segments,
+                        voice_configs=effective_voice_configs,
+                        checkpoint=checkpoint,
+                    ),
+                    output_path,
+                    total=len(segments),
+                    on_progress=on_progress,
+                    live_dir=live_dir,
+                )
             )
         except Exception as exc:
             logger.exception("调用 MiniMax 生成音频失败: %s", exc)
+            self._finish_speaking_rates(succeeded=False)
             raise
+        self._finish_speaking_rates(succeeded=True)
 
-        if not audio_segments:
-            raise ValueError("MiniMax 未生成任何音频片段")
-
-        final_audio = AudioSegment.silent(duration=0)
-        last_speaker: Optional[str] = None
-
-        for speaker, audio_chunk in audio_segments:
-            if last_speaker and last_speaker != speaker:
-                silence = random.randint(self.silence_min_ms, self.silence_max_ms)
-                final_audio += AudioSegment.silent(duration=silence)
-                logger.debug("插入静音 %sms (%s → %s)", silence, last_speaker, speaker)
+        logger.info("MiniMax 播客生成完成，输出路径: %s (%.1fs)", output_path, result.duration_seconds)
 
-            final_audio += audio_chunk
-            last_speaker = speaker
+        return result
 
-        final_audio = _prepend_append_vocal_logo(final_audio)
-
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        final_audio.export(output_path, format="mp3")
-        logger.info("MiniMax 播客生成完成，输出路径: %s", output_path)
-
-        return output_path
-
-    def generate_multi(self, dialogue: List[Dict], participants_config: List[Dict], output_path: str) -> str:
+    def generate_multi(
+        self,
+        dialogue: List[Dict],
+        participants_config: List[Dict],
+        output_path: str,
+        *,
+        checkpoint: Optional[GenerationCheckpoint] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        live_dir: Optional[str] = None,
+    ) -> GenerationResult:
         """
         Generate multi-person podcast audio from dialogue JSON (for debate/conference).
 
@@ -360,9 +452,12 @@ class PodcastGenerator:
             dialogue: List of dialogue entries [{"participant": "llm1", "content": "..."},...]
             participants_config: List of participant configs [{"id": "llm1", "voice_id": "...", "role": "..."},...]
             output_path: Where to save the generated MP3
+            checkpoint: Optional per-episode checkpoint to record and resume segments
+            on_progress: Optional ``(completed, total)`` callback, called from a worker thread
+            live_dir: Optional directory for a growing HLS playlist of the audio so far
 
         Returns:
-            Path to the generated audio file
+            GenerationResult describing the generated audio file
         """
         logger.info("MiniMax 多人播客生成开始 (%d 参与者, %d 对话条目)", len(participants_config), len(dialogue))
 
@@ -389,10 +484,12 @@ class PodcastGenerator:
                 audio_channel=self.audio_channel,
                 enable_english_normalization=self.enable_english_normalization,
                 batch_duration_ms=self.batch_duration_ms,
+                ws_url=self.ws_url,
             )
             participant_voices[participant_id] = config
 
         # Split long dialogue entries
+        limits = self._segment_limits(participant_voices.values(), checkpoint)
         segments = []
         for entry in dialogue:
             participant_id = entry['participant']
@@ -403,7 +500,7 @@ class PodcastGenerator:
                 continue
 
             # Split long content into smaller segments
-            parts = _split_long_text(content, self.max_segment_chars, self.punctuation_marks)
+            parts = self.segmenter.split(content, self._split_limit(participant_voices[participant_id], limits))
             for part in parts:
                 if part:
                     segments.append((participant_id, part))
@@ -414,73 +511,259 @@ class PodcastGenerator:
             raise ValueError("未找到有效的对话内容")
 
         try:
-            audio_segments = asyncio.run(self._generate_multi_segments(segments, participant_voices))
+            result = asyncio.run(
+                self._encode_segments(
+                    self._generate_multi_segments(segments, participant_voices, checkpoint=checkpoint),
+                    output_path,
+                    total=len(segments),
+                    on_progress=on_progress,
+                    live_dir=live_dir,
+                )
+            )
         except Exception as exc:
             logger.exception("调用 MiniMax 生成多人音频失败: %s", exc)
+            self._finish_speaking_rates(succeeded=False)
             raise
+        self._finish_speaking_rates(succeeded=True)
 
-        if not audio_segments:
-            raise ValueError("MiniMax 未生成任何音频片段")
+        logger.info("MiniMax 多人播客生成完成，输出路径: %s (%.1fs)", output_path, result.duration_seconds)
 
-        # Concatenate with silence between speaker changes
-        final_audio = AudioSegment.silent(duration=0)
-        last_speaker: Optional[str] = None
+        return result
 
-        for speaker, audio_chunk in audio_segments:
-            if last_speaker and last_speaker != speaker:
-                silence = random.randint(self.silence_min_ms, self.silence_max_ms)
-                final_audio += AudioSegment.silent(duration=silence)
-                logger.debug("插入静音 %sms (%s → %s)", silence, last_speaker, speaker)
+    async def _encode_segments(
+        self,
+        segments: AsyncIterator[Tuple[str, str, MiniMaxVoiceConfig, int, np.ndarray]],
+        output_path: str,
+        *,
+        total: int = 0,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        live_dir: Optional[str] = None,
+    ) -> GenerationResult:
+        """
+        Stream vocal logos, segment audio and speaker-change silences into the MP3 encoder.
 
-            final_audio += audio_chunk
-            last_speaker = speaker
+        Segments are written as soon as they arrive in script order, so memory
+        stays bounded by the synthesis window instead of the episode length.
+        Pipe writes (and any resampling) run in a worker thread: when ffmpeg
+        falls behind, only this consumer waits, while the segments already in
+        flight keep receiving audio from MiniMax on the event loop.
 
-        final_audio = _prepend_append_vocal_logo(final_audio)
+        Timings come from the frame count written so far, so the result is
+        exact without reading the MP3 back.
 
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        final_audio.export(output_path, format="mp3")
-        logger.info("MiniMax 多人播客生成完成，输出路径: %s", output_path)
+        With ``live_dir`` the same PCM is mirrored into a ``LiveHLSWriter``;
+        if that stream fails, generation of the MP3 carries on without it.
+        """
+        if self.assembly_mode == "buffer":
+            if live_dir:
+                logger.info("buffer 拼接模式在全部片段完成后才编码，跳过边生成边播放")
+            return await self._assemble_segments(segments, output_path, total=total, on_progress=on_progress)
 
-        return output_path
+        start_logo, end_logo = _load_vocal_logos(self.sample_rate, self.audio_channel)
+        last_speaker: Optional[str] = None
+        timings: List[SegmentTiming] = []
+        live = self._open_live_writer(live_dir)
+
+        def emit(encoder: StreamingMP3Encoder, pcm) -> None:
+            nonlocal live
+            encoder.write(pcm)
+            if live is not None:
+                try:
+                    live.write(pcm)
+                except AudioEncoderError as exc:
+                    logger.warning("边生成边播放的 HLS 流中断，继续生成完整音频: %s", exc)
+                    live.abort()
+                    live = None
+
+        def write_segment(encoder: StreamingMP3Encoder, audio_int16: np.ndarray, sample_rate: int,
+                          config: MiniMaxVoiceConfig) -> None:
+            if sample_rate == self.sample_rate and config.audio_channel == self.audio_channel:
+                emit(encoder, audio_int16)
+            else:
+                segment_audio = _to_audio_segment(audio_int16, sample_rate, config)
+                emit(encoder, _to_pcm(segment_audio, self.sample_rate, self.audio_channel))
 
-    async def _generate_multi_segments(
-        self,
-        segments: List[Tuple[str, str]],
-        participant_voices: Dict[str, MiniMaxVoiceConfig]
-    ) -> List[Tuple[str, AudioSegment]]:
-        """Generate audio for multi-person dialogue segments."""
-        results: List[Tuple[str, AudioSegment]] = []
+        try:
+            async with aclosing(segments):
+                with StreamingMP3Encoder(output_path, sample_rate=self.sample_rate, channels=self.audio_channel) as encoder:
+                    if start_logo is not None:
+                        await asyncio.to_thread(emit, encoder, start_logo)
+
+                    async for speaker, text, config, sample_rate, audio_int16 in segments:
+                        # Concatenate with silence between speaker changes
+                        if last_speaker and last_speaker != speaker:
+                            silence = random.randint(self.silence_min_ms, self.silence_max_ms)
+                            await asyncio.to_thread(
+                                emit, encoder, bytes(int(self.sample_rate * silence / 1000) * encoder.frame_size)
+                            )
+                            logger.debug("插入静音 %sms (%s → %s)", silence, last_speaker, speaker)
+
+                        start_ms = int(encoder.duration_seconds * 1000)
+                        await asyncio.to_thread(write_segment, encoder, audio_int16, sample_rate, config)
+                        timings.append(
+                            SegmentTiming(
+                                speaker=speaker,
+                                text=text,
+                                start_ms=start_ms,
+                                end_ms=int(encoder.duration_seconds * 1000),
+                            )
+                        )
+
+                        last_speaker = speaker
+                        if on_progress is not None:
+                            # Off the event loop: progress callbacks typically write to the database
+                            await asyncio.to_thread(on_progress, len(timings), total)
+
+                    if not timings:
+                        raise ValueError("MiniMax 未生成任何音频片段")
+
+                    if end_logo is not None:
+                        await asyncio.to_thread(emit, encoder, end_logo)
+        except BaseException:
+            if live is not None:
+                live.abort()
+            raise
 
-        for index, (participant_id, text) in enumerate(segments, start=1):
-            config = participant_voices.get(participant_id)
-            if not config:
-                logger.warning("跳过未配置语音的参与者 %s", participant_id)
-                continue
+        if live is not None:
+            try:
+                live.close()
+            except AudioEncoderError as exc:
+                logger.warning("边生成边播放的 HLS 流收尾失败: %s", exc)
 
+        if start_logo is not None or end_logo is not None:
             logger.info(
-                "MiniMax 生成片段 %s/%s (%s): '%s...' (len=%d)",
-                index, len(segments), participant_id, text[:30], len(text)
+                "已添加 vocal logo: start=%s, end=%s",
+                start_logo is not None,
+                end_logo is not None,
             )
 
-            def client_logger(message: str, *, _pid=participant_id, _index=index):
-                logger.debug("[MiniMax][%s #%s] %s", _pid, _index, message)
+        return GenerationResult(
+            output_path=output_path,
+            sample_rate=self.sample_rate,
+            channels=self.audio_channel,
+            sample_count=encoder.frames_written,
+            file_size=os.path.getsize(output_path),
+            segments=timings,
+        )
+
+    def _open_live_writer(self, live_dir: Optional[str]) -> Optional[LiveHLSWriter]:
+        if not live_dir:
+            return None
+        live = LiveHLSWriter(
+            live_dir,
+            sample_rate=self.sample_rate,
+            channels=self.audio_channel,
+            segment_seconds=self.live_segment_seconds,
+        )
+        try:
+            live.open()
+        except AudioEncoderError as exc:
+            logger.warning("无法启动边生成边播放的 HLS 流: %s", exc)
+            return None
+        return live
+
+    async def _assemble_segments(
+        self,
+        segments: AsyncIterator[Tuple[str, str, MiniMaxVoiceConfig, int, np.ndarray]],
+        output_path: str,
+        *,
+        total: int = 0,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> GenerationResult:
+        """
+        Buffer-mode counterpart of ``_encode_segments``.
+
+        Segments are collected as views, laid out by ``PCMAssembler`` in a
+        single preallocated int16 buffer (silences are its zero-filled gaps,
+        same-speaker continuations are crossfaded by ``crossfade_ms``), peak
+        normalized in place and handed to the encoder in one write. Memory
+        grows with the episode length, so this mode is opt-in.
+        """
+        start_logo, end_logo = _load_vocal_logos(self.sample_rate, self.audio_channel)
+        assembler = PCMAssembler(self.sample_rate, self.audio_channel, crossfade_ms=self.crossfade_ms)
+        spoken: List[Tuple[int, str, str]] = []
+        last_speaker: Optional[str] = None
+
+        def match_layout(audio_int16: np.ndarray, sample_rate: int, config: MiniMaxVoiceConfig) -> np.ndarray:
+            if sample_rate == self.sample_rate and config.audio_channel == self.audio_channel:
+                return audio_int16
+            segment_audio = _to_audio_segment(audio_int16, sample_rate, config)
+            return np.frombuffer(_to_pcm(segment_audio, self.sample_rate, self.audio_channel), dtype=np.int16)
+
+        if start_logo is not None:
+            assembler.add(start_logo, crossfade=False)
+
+        async with aclosing(segments):
+            async for speaker, text, config, sample_rate, audio_int16 in segments:
+                if sample_rate != self.sample_rate or config.audio_channel != self.audio_channel:
+                    audio_int16 = await asyncio.to_thread(match_layout, audio_int16, sample_rate, config)
+
+                gap_ms = 0
+                if last_speaker and last_speaker != speaker:
+                    gap_ms = random.randint(self.silence_min_ms, self.silence_max_ms)
+                    logger.debug("插入静音 %sms (%s → %s)", gap_ms, last_speaker, speaker)
+
+                # Only continuations of the same speaker are crossfaded; logos and turns keep hard edges
+                index = assembler.add(audio_int16, gap_ms=gap_ms, crossfade=last_speaker == speaker)
+                spoken.append((index, speaker, text))
+
+                last_speaker = speaker
+                if on_progress is not None:
+                    await asyncio.to_thread(on_progress, len(spoken), total)
+
+        if not spoken:
+            raise ValueError("MiniMax 未生成任何音频片段")
+
+        if end_logo is not None:
+            assembler.add(end_logo, crossfade=False)
 
-            # Get float32 audio array from MiniMax
-            sample_rate, audio_float32 = await synthesize_to_pcm(config, text, logger=client_logger)
+        pcm = await asyncio.to_thread(assembler.render, normalize_headroom_db=self.normalize_headroom_db)
+        spans = assembler.layout()
 
-            # Convert float32 [-1, 1] back to int16 for pydub
-            audio_int16 = (audio_float32 * 32767).astype(np.int16)
+        with StreamingMP3Encoder(output_path, sample_rate=self.sample_rate, channels=self.audio_channel) as encoder:
+            await asyncio.to_thread(encoder.write, pcm)
 
-            # Create AudioSegment from int16 array
-            segment_audio = AudioSegment(
-                data=audio_int16.tobytes(),
-                sample_width=2,  # 16-bit
-                frame_rate=sample_rate,
-                channels=config.audio_channel,
+        if start_logo is not None or end_logo is not None:
+            logger.info(
+                "已添加 vocal logo: start=%s, end=%s",
+                start_logo is not None,
+                end_logo is not None,
             )
-            results.append((participant_id, segment_audio))
 
-        return results
+        def to_ms(frame: int) -> int:
+            return int(frame * 1000 / self.sample_rate)
+
+        return GenerationResult(
+            output_path=output_path,
+            sample_rate=self.sample_rate,
+            channels=self.audio_channel,
+            sample_count=encoder.frames_written,
+            file_size=os.path.getsize(output_path),
+            segments=[
+                SegmentTiming(speaker=speaker, text=text, start_ms=to_ms(spans[index][0]), end_ms=to_ms(spans[index][1]))
+                for index, speaker, text in spoken
+            ],
+        )
+
+    async def _generate_multi_segments(
+        self,
+        segments: List[Tuple[str, str]],
+        participant_voices: Dict[str, MiniMaxVoiceConfig],
+        *,
+        checkpoint: Optional[GenerationCheckpoint] = None,
+    ) -> AsyncIterator[Tuple[str, str, MiniMaxVoiceConfig, int, np.ndarray]]:
+        """Generate audio for multi-person dialogue segments, yielded in dialogue order."""
+        jobs: List[Tuple[int, str, str, MiniMaxVoiceConfig]] = []
+        for index, (participant_id, text) in enumerate(segments, start=1):
+            config = participant_voices.get(participant_id)
+            if not config:
+                logger.warning("跳过未配置语音的参与者 %s", participant_id)
+                continue
+            jobs.append((index, participant_id, text, config))
+
+        async with aclosing(self._synthesize_in_order(jobs, total=len(segments), checkpoint=checkpoint)) as results:
+            async for result in results:
+                yield result
 
     def _build_character_aliases(
         self,
@@ -515,6 +798,8 @@ class PodcastGenerator:
                 audio_channel=config.audio_channel,
                 enable_english_normalization=config.enable_english_normalization,
                 batch_duration_ms=config.batch_duration_ms,
+                max_concurrency=config.max_concurrency,
+                ws_url=config.ws_url,
             )
 
         if not isinstance(voice_overrides, dict):
@@ -545,6 +830,7 @@ class PodcastGenerator:
                 audio_channel=self.audio_channel,
                 enable_english_normalization=self.enable_english_normalization,
                 batch_duration_ms=self.batch_duration_ms,
+                ws_url=self.ws_url,
             )
 
         return voice_configs
@@ -557,58 +843,71 @@ class PodcastGenerator:
         voice_configs: Dict[str, MiniMaxVoiceConfig],
     ) -> List[Tuple[str, str]]:
         segments: List[Tuple[str, str]] = []
-        current_character: Optional[str] = None
-        current_text: List[str] = []
-
-        def finalize_segment() -> None:
-            nonlocal current_character, current_text
-            if current_character and current_text:
-                combined = " ".join(current_text).strip()
-                if combined:
-                    segments.append((current_character, combined))
-            current_text = []
-
-        for raw_line in script_content.splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
+        for turn in self.segmenter.parse(script_content):
+            character = character_aliases.get(turn.role)
+            if not character:
+                lowered = turn.role.lower()
+                character = voice_configs.get(lowered) and lowered
+
+            if not character:
+                logger.debug("跳过未知角色: %s", turn.role)
                 continue
 
-            match = re.search(r"【([^】]+)】", line)
-            if match:
-                finalize_segment()
-                tag_content = match.group(1).strip()
-
-                character = character_aliases.get(tag_content)
-                if not character:
-                    lowered = tag_content.lower()
-                    character = voice_configs.get(lowered) and lowered
+            if turn.text:
+                segments.append((character, turn.text))
 
-                if not character:
-                    logger.debug("跳过未知角色: %s", tag_content)
-                    current_character = None
-                    current_text = []
-                    continue
+        return segments
 
-                remainder = line.split("】", 1)[1] if "】" in line else ""
-                remainder = remainder.lstrip("*").strip()
+    def _max_chars_for(self, config: MiniMaxVoiceConfig) -> int:
+        if self.speaking_rates is None:
+            return self.max_segment_chars
+        return self.speaking_rates.max_chars(config, self.max_segment_duration)
 
-                current_character = character
-                current_text = [remainder] if remainder else []
-                continue
-
-            if current_character:
-                clean_line = line.strip("*").strip()
-                if clean_line:
-                    current_text.append(clean_line)
+    def _segment_limits(
+        self,
+        voice_configs: Iterable[MiniMaxVoiceConfig],
+        checkpoint: Optional[GenerationCheckpoint] = None,
+    ) -> Dict[str, int]:
+        """
+        Per-voice ``max_chars`` for one episode, keyed by ``SpeakingRateTracker.make_key``.
 
-        finalize_segment()
-        return segments
+        Learned rates move between attempts, so the limits an episode was
+        first split with are kept in its checkpoint and reused on retry;
+        otherwise a resumed episode would be split differently and none of
+        its checkpointed segments would match.
+        """
+        limits = checkpoint.segment_limits() if checkpoint is not None else {}
+        recorded = dict(limits)
+        for config in voice_configs:
+            key = SpeakingRateTracker.make_key(config)
+            if key not in limits:
+                limits[key] = self._max_chars_for(config)
+        if checkpoint is not None and limits != recorded:
+            checkpoint.save_segment_limits(limits)
+        return limits
+
+    def _split_limit(self, config: MiniMaxVoiceConfig, limits: Optional[Dict[str, int]]) -> int:
+        if limits:
+            frozen = limits.get(SpeakingRateTracker.make_key(config))
+            if frozen:
+                return frozen
+        return self._max_chars_for(config)
+
+    def _finish_speaking_rates(self, *, succeeded: bool) -> None:
+        """Store the run's rate observations only if the episode was generated."""
+        if self.speaking_rates is None:
+            return
+        if succeeded:
+            self.speaking_rates.flush()
+        else:
+            self.speaking_rates.discard()
 
     def _expand_segments(
         self,
         segments: List[Tuple[str, str]],
         *,
         voice_configs: Dict[str, MiniMaxVoiceConfig],
+        limits: Optional[Dict[str, int]] = None,
     ) -> List[Tuple[str, str]]:
         expanded: List[Tuple[str, str]] = []
         for speaker, text in segments:
@@ -617,7 +916,7 @@ class PodcastGenerator:
                 logger.warning("未配置 %s 的语音，跳过该段落", speaker)
                 continue
 
-            parts = _split_long_text(text, self.max_segment_chars, self.punctuation_marks)
+            parts = self.segmenter.split(text, self._split_limit(voice_config, limits))
             expanded.extend((speaker, part) for part in parts if part)
 
         return expanded
@@ -627,38 +926,189 @@ class PodcastGenerator:
         segments: List[Tuple[str, str]],
         *,
         voice_configs: Dict[str, MiniMaxVoiceConfig],
-    ) -> List[Tuple[str, AudioSegment]]:
+        checkpoint: Optional[GenerationCheckpoint] = None,
+    ) -> AsyncIterator[Tuple[str, str, MiniMaxVoiceConfig, int, np.ndarray]]:
         """
         Generate audio for all text segments.
 
-        Processes float32 numpy arrays from MiniMax and converts to AudioSegment.
+        Yields ``(speaker, text, voice_config, sample_rate, int16 PCM)`` in script order.
         """
-        results: List[Tuple[str, AudioSegment]] = []
-
+        jobs: List[Tuple[int, str, str, MiniMaxVoiceConfig]] = []
         for index, (speaker, text) in enumerate(segments, start=1):
             config = voice_configs.get(speaker)
             if not config:
                 logger.warning("跳过未配置语音的角色 %s", speaker)
                 continue
+            jobs.append((index, speaker, text, config))
 
-            logger.info("MiniMax 生成片段 %s/%s (%s): '%s...' (len=%d)", index, len(segments), speaker, text[:30], len(text))
+        async with aclosing(self._synthesize_in_order(jobs, total=len(segments), checkpoint=checkpoint)) as results:
+            async for result in results:
+                yield result
 
-            def client_logger(message: str, *, _speaker=speaker, _index=index):
+    def _batch_jobs(
+        self,
+        jobs: List[Tuple[int, str, str, MiniMaxVoiceConfig]],
+    ) -> List[List[Tuple[int, str, str, MiniMaxVoiceConfig]]]:
+        """Group runs of consecutive same-voice jobs, up to ``speaker_batch_size`` each."""
+        if not self.speaker_batching:
+            return [[job] for job in jobs]
+
+        batches: List[List[Tuple[int, str, str, MiniMaxVoiceConfig]]] = []
+        for job in jobs:
+            current = batches[-1] if batches else None
+            if (
+                current
+                and len(current) < self.speaker_batch_size
+                and current[-1][1] == job[1]
+                and current[-1][3].session_key() == job[3].session_key()
+            ):
+                current.append(job)
+            else:
+                batches.append([job])
+        return batches
+
+    async def _synthesize_in_order(
+        self,
+        jobs: List[Tuple[int, str, str, MiniMaxVoiceConfig]],
+        *,
+        total: int,
+        checkpoint: Optional[GenerationCheckpoint] = None,
+    ) -> AsyncIterator[Tuple[str, str, MiniMaxVoiceConfig, int, np.ndarray]]:
+        """
+        Synthesize jobs concurrently and yield 16-bit PCM results in script order.
+
+        At most ``synthesis_concurrency`` segments are in flight; a voice with
+        ``max_concurrency`` set is further limited to that many. A new segment is
+        only started once the window has room, so finished-but-unconsumed audio
+        never exceeds the window either. Segments share MiniMax sessions through
+        a ``MiniMaxSessionPool`` unless ``session_reuse`` is disabled, and
+        segments already in ``segment_cache`` skip MiniMax entirely. Requests
+        go through ``rate_limiter`` and failed segments are retried per
+        ``retry_policy`` before the episode is failed. With a ``checkpoint``,
+        segments recorded by a previous attempt are restored from it and new
+        ones are recorded as soon as they finish. The audio durations of newly
+        synthesized segments are buffered in ``speaking_rates``; ``generate``
+        and ``generate_multi`` store them only after the episode succeeds.
+
+        With ``speaker_batching``, consecutive segments of the same voice are
+        sent as one batch of ``task_continue`` messages in a single task and
+        split again at each ``is_final``, so every segment keeps its own result.
+        """
+        window = self.synthesis_concurrency
+        voice_limits: Dict[str, asyncio.Semaphore] = {}
+        pool = MiniMaxSessionPool(idle_timeout=self.session_idle_timeout) if self.session_reuse else None
+        cache = self.segment_cache
+
+        async def restore(index: int, speaker: str, text: str, config: MiniMaxVoiceConfig):
+            if checkpoint is not None:
+                restored = await asyncio.to_thread(checkpoint.load, index, config, text)
+                if restored is not None:
+                    logger.info("MiniMax 片段 %s/%s (%s) 从检查点恢复", index, total, speaker)
+                    return restored
+
+            if cache is not None:
+                cached = await asyncio.to_thread(cache.get, config, text)
+                if cached is not None:
+                    logger.info("MiniMax 片段 %s/%s (%s) 命中缓存", index, total, speaker)
+                    return cached
+            return None
+
+        async def record(index: int, text: str, config: MiniMaxVoiceConfig, sample_rate: int, pcm) -> None:
+            if self.speaking_rates is not None:
+                self.speaking_rates.observe(config, text, len(pcm) / (2 * config.audio_channel * sample_rate))
+            if cache is not None:
+                await asyncio.to_thread(cache.put, config, text, pcm)
+            if checkpoint is not None:
+                # Cache hits are cheap to look up again on resume; only MiniMax output is recorded
+                await asyncio.to_thread(checkpoint.save, index, config, text, pcm)
+
+        async def request(batch: List[Tuple[int, str, str, MiniMaxVoiceConfig]]) -> Tuple[int, List[bytearray]]:
+            first_index, speaker, _text, config = batch[0]
+
+            def client_logger(message: str, *, _speaker=speaker, _index=first_index):
                 logger.debug("[MiniMax][%s #%s] %s", _speaker, _index, message)
 
-            # Get float32 audio array from MiniMax
-            sample_rate, audio_float32 = await synthesize_to_pcm(config, text, logger=client_logger)
-
-            # Convert float32 [-1, 1] back to int16 for pydub
-            audio_int16 = (audio_float32 * 32767).astype(np.int16)
-
-            # Create AudioSegment from int16 array
-            segment_audio = AudioSegment(
-                data=audio_int16.tobytes(),
-                sample_width=2,  # 16-bit
-                frame_rate=sample_rate,
-                channels=config.audio_channel,
+            if len(batch) == 1:
+                sample_rate, pcm = await synthesize_pcm16(
+                    config,
+                    batch[0][2],
+                    logger=client_logger,
+                    pool=pool,
+                    limiter=self.rate_limiter,
+                    retry=self.retry_policy,
+                )
+                return sample_rate, [pcm]
+
+            logger.info("MiniMax 批量生成片段 %s-%s/%s (%s)", first_index, batch[-1][0], total, speaker)
+            return await synthesize_pcm16_batch(
+                config,
+                [text for _index, _speaker, text, _config in batch],
+                logger=client_logger,
+                pool=pool,
+                limiter=self.rate_limiter,
+                retry=self.retry_policy,
             )
-            results.append((speaker, segment_audio))
 
-        return results
+        async def synthesize(
+            batch: List[Tuple[int, str, str, MiniMaxVoiceConfig]],
+        ) -> List[Tuple[str, str, MiniMaxVoiceConfig, int, np.ndarray]]:
+            results: Dict[int, Tuple[int, Any]] = {}
+            pending: List[Tuple[int, str, str, MiniMaxVoiceConfig]] = []
+            for index, speaker, text, config in batch:
+                restored = await restore(index, speaker, text, config)
+                if restored is not None:
+                    results[index] = (config.sample_rate, restored)
+                else:
+                    pending.append((index, speaker, text, config))
+
+            if pending:
+                for index, speaker, text, _config in pending:
+                    logger.info("MiniMax 生成片段 %s/%s (%s): '%s...' (len=%d)", index, total, speaker, text[:30], len(text))
+
+                config = pending[0][3]
+                limit = voice_limits.get(config.voice_id)
+                if limit is None and 0 < config.max_concurrency < window:
+                    limit = voice_limits.setdefault(config.voice_id, asyncio.Semaphore(config.max_concurrency))
+
+                if limit is None:
+                    sample_rate, pcms = await request(pending)
+                else:
+                    async with limit:
+                        sample_rate, pcms = await request(pending)
+
+                for (index, _speaker, text, job_config), pcm in zip(pending, pcms):
+                    await record(index, text, job_config, sample_rate, pcm)
+                    results[index] = (sample_rate, pcm)
+
+            # MiniMax already sends 16-bit PCM; view it in place rather than copying
+            return [
+                (speaker, text, config, results[index][0], np.frombuffer(results[index][1], dtype=np.int16))
+                for index, speaker, text, config in batch
+            ]
+
+        in_flight: Deque[asyncio.Task] = deque()
+        in_flight_segments = 0
+        try:
+            for batch in self._batch_jobs(jobs):
+                in_flight.append(asyncio.ensure_future(synthesize(batch)))
+                in_flight_segments += len(batch)
+                while in_flight and in_flight_segments >= window:
+                    finished = await in_flight.popleft()
+                    in_flight_segments -= len(finished)
+                    for result in finished:
+                        yield result
+
+            while in_flight:
+                for result in await in_flight.popleft():
+                    yield result
+        finally:
+            # Abort the rest of the window if a segment failed or the consumer stopped early
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            if pool is not None:
+                await pool.close()
+            if cache is not None:
+                stats = cache.stats()
+                logger.info("TTS 片段缓存: 命中 %s, 未命中 %s", stats["hits"], stats["misses"])
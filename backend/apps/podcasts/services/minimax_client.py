@@ -12,17 +12,81 @@ from __future__ import annotations
 
 import asyncio
 import json
+import random
 import ssl
+import time
 from dataclasses import dataclass
-from typing import AsyncGenerator, Callable, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import websockets
+from websockets.exceptions import WebSocketException
+
+if TYPE_CHECKING:
+    from .rate_limit import MiniMaxRateLimiter
+
+DEFAULT_WS_URL = "wss://api.minimax.io/ws/v1/t2a_v2"
+
+# base_resp.status_code values (and HTTP handshake statuses) that mean "slow down"
+RATE_LIMIT_STATUS_CODES = frozenset({429, 1002, 1039})
+# Failures a retry cannot fix: authentication, account balance, invalid parameters
+FATAL_STATUS_CODES = frozenset({401, 403, 1004, 1008, 2013})
 
 
 class MiniMaxError(RuntimeError):
     """Raised when the MiniMax API returns an unexpected response."""
 
+    def __init__(self, message: str, *, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def is_rate_limited(self) -> bool:
+        return self.status_code in RATE_LIMIT_STATUS_CODES
+
+    @property
+    def is_retryable(self) -> bool:
+        return self.status_code not in FATAL_STATUS_CODES
+
+
+def _status_code(response: Dict[str, Any]) -> Optional[int]:
+    """Extract ``base_resp.status_code`` from a MiniMax event."""
+    base_resp = response.get("base_resp")
+    if isinstance(base_resp, dict):
+        try:
+            return int(base_resp.get("status_code"))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _handshake_status(exc: BaseException) -> Optional[int]:
+    """HTTP status of a rejected WebSocket handshake (e.g. 429), if any."""
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+@dataclass
+class MiniMaxRetryPolicy:
+    """Per-segment retry with jittered exponential backoff."""
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    @classmethod
+    def from_settings(cls, minimax_settings: Dict[str, object]) -> "MiniMaxRetryPolicy":
+        return cls(
+            attempts=max(1, int(minimax_settings.get("retry_attempts", 3))),
+            base_delay=float(minimax_settings.get("retry_base_delay", 0.5)),
+            max_delay=float(minimax_settings.get("retry_max_delay", 8.0)),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt`` (1-based): exponential, capped, with jitter."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
 
 @dataclass
 class MiniMaxVoiceConfig:
@@ -39,6 +103,24 @@ class MiniMaxVoiceConfig:
     audio_channel: int = 1
     enable_english_normalization: bool = True
     batch_duration_ms: int = 2000  # Audio batching to prevent shared memory issues
+    max_concurrency: int = 0  # Segments of this voice in flight at once (0 = generator-wide limit)
+    ws_url: str = DEFAULT_WS_URL  # Point at a local stand-in server for tests and benchmarks
+
+    def session_key(self) -> Tuple:
+        """Settings sent with ``task_start``; segments sharing them can share a task."""
+        return (
+            self.ws_url,
+            self.api_key,
+            self.model,
+            self.voice_id,
+            self.speed,
+            self.volume,
+            self.pitch,
+            self.enable_english_normalization,
+            self.sample_rate,
+            self.audio_bitrate,
+            self.audio_channel,
+        )
 
     def validate(self) -> None:
         if not self.api_key:
@@ -62,6 +144,12 @@ class MiniMaxVoiceConfig:
         if self.audio_channel not in {1, 2}:
             raise MiniMaxError(f"仅支持单声道或双声道 (1 or 2)，当前 {self.audio_channel}")
 
+        if self.max_concurrency < 0:
+            raise MiniMaxError(f"并发数不能为负数，当前 {self.max_concurrency}")
+
+        if not self.ws_url.startswith(("ws://", "wss://")):
+            raise MiniMaxError(f"MiniMax WebSocket 地址无效: {self.ws_url}")
+
 
 class MiniMaxWebSocketClient:
     """
@@ -82,6 +170,12 @@ class MiniMaxWebSocketClient:
         self.logger = logger or (lambda message: None)
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
         self._connected = False
+        self._task_started = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the connection is up and a task is ready for ``task_continue``."""
+        return self._ws is not None and self._connected and self._task_started
 
     async def __aenter__(self) -> "MiniMaxWebSocketClient":
         await self.connect()
@@ -95,27 +189,31 @@ class MiniMaxWebSocketClient:
         """Establish the WebSocket connection."""
         headers = {"Authorization": f"Bearer {self.config.api_key}"}
 
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
+        ssl_context = None
+        if self.config.ws_url.startswith("wss://"):
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
 
         try:
             # MiniMax WebSocket API uses Bearer token in Authorization header
             headers = {"Authorization": f"Bearer {self.config.api_key}"}
             self._ws = await websockets.connect(
-                "wss://api.minimax.io/ws/v1/t2a_v2",
+                self.config.ws_url,
                 additional_headers=headers,
                 ssl=ssl_context,
             )
 
             response = json.loads(await self._ws.recv())
             if response.get("event") != "connected_success":
-                raise MiniMaxError(f"MiniMax 握手失败: {response}")
+                raise MiniMaxError(f"MiniMax 握手失败: {response}", status_code=_status_code(response))
 
             self._connected = True
             self.logger("MiniMax 已建立连接")
+        except MiniMaxError:
+            raise
         except Exception as exc:  # pragma: no cover - network errors are runtime issues
-            raise MiniMaxError(f"MiniMax 连接失败: {exc}") from exc
+            raise MiniMaxError(f"MiniMax 连接失败: {exc}", status_code=_handshake_status(exc)) from exc
 
     async def start_task(self) -> None:
         """Send task_start command and wait for acknowledgement."""
@@ -143,9 +241,77 @@ class MiniMaxWebSocketClient:
         await self._ws.send(json.dumps(start_payload))
         response = json.loads(await self._ws.recv())
         if response.get("event") != "task_started":
-            raise MiniMaxError(f"MiniMax 未能启动任务: {response}")
+            raise MiniMaxError(f"MiniMax 未能启动任务: {response}", status_code=_status_code(response))
+        self._task_started = True
         self.logger("MiniMax 任务启动成功")
 
+    async def _send_text(self, text: str) -> None:
+        if not self._ws:
+            raise MiniMaxError("MiniMax WebSocket 未初始化")
+
+        await self._ws.send(json.dumps({"event": "task_continue", "text": text}))
+        self.logger(f"MiniMax 开始生成语音 (长度 {len(text)})")
+
+    async def _audio_fragments(self, text: str) -> AsyncGenerator[str, None]:
+        """Send ``text`` as a ``task_continue`` and yield hex audio fragments until ``is_final``."""
+        await self._send_text(text)
+        async for audio_hex in self._receive_fragments():
+            yield audio_hex
+
+    async def _receive_fragments(self) -> AsyncGenerator[str, None]:
+        """Yield hex audio fragments of the oldest pending ``task_continue`` until its ``is_final``."""
+        while True:
+            response = json.loads(await self._ws.recv())
+
+            if response.get("event") == "task_failed":
+                self._task_started = False
+                raise MiniMaxError(f"MiniMax 任务失败: {response}", status_code=_status_code(response))
+
+            # Audio fragments
+            data = response.get("data")
+            if isinstance(data, dict) and data.get("audio"):
+                yield data["audio"]
+
+            # Completed
+            if response.get("is_final"):
+                return
+
+    async def read_pcm16(self, text: str) -> bytearray:
+        """
+        Synthesize ``text`` and return its raw 16-bit little-endian PCM.
+
+        Hex fragments are decoded straight into one bytearray, without the
+        numpy/float32 round trip of ``stream_text``.
+        """
+        pcm = bytearray()
+        fragment_count = 0
+        async for audio_hex in self._audio_fragments(text):
+            pcm += bytes.fromhex(audio_hex)
+            fragment_count += 1
+
+        self.logger(f"语音生成完成，共处理 {fragment_count} 个原始片段, {len(pcm)} 字节")
+        return pcm
+
+    async def read_pcm16_batch(self, texts: Sequence[str]) -> List[bytearray]:
+        """
+        Synthesize several texts in this task and return one PCM buffer per text.
+
+        Every ``task_continue`` is sent up front so MiniMax can work through
+        them back to back; the audio stream is split at each ``is_final``.
+        """
+        for text in texts:
+            await self._send_text(text)
+
+        results: List[bytearray] = []
+        for _ in texts:
+            pcm = bytearray()
+            async for audio_hex in self._receive_fragments():
+                pcm += bytes.fromhex(audio_hex)
+            results.append(pcm)
+
+        self.logger(f"批量语音生成完成，共 {len(results)} 段, {sum(len(pcm) for pcm in results)} 字节")
+        return results
+
     async def stream_text(self, text: str) -> AsyncGenerator[Tuple[int, np.ndarray], None]:
         """
         Stream PCM audio chunks for the given text.
@@ -153,59 +319,44 @@ class MiniMaxWebSocketClient:
         Uses batching logic from MoFA Flow to prevent shared memory issues.
         Yields float32 numpy arrays normalized to [-1, 1] range.
         """
-        if not self._ws:
-            raise MiniMaxError("MiniMax WebSocket 未初始化")
-
-        await self._ws.send(json.dumps({"event": "task_continue", "text": text}))
-        self.logger(f"MiniMax 开始生成语音 (长度 {len(text)})")
-
         # Batching configuration (from MoFA Flow)
         batch_duration_threshold = self.config.batch_duration_ms / 1000.0  # Convert ms to seconds
         chunk_buffer = []
         batch_accumulated_duration = 0.0
         chunk_counter = 0
 
-        while True:
-            response = json.loads(await self._ws.recv())
-
-            # Audio fragments
-            if "data" in response and "audio" in response["data"]:
-                audio_hex = response["data"]["audio"]
-                if audio_hex:
-                    chunk_counter += 1
-                    audio_bytes = bytes.fromhex(audio_hex)
+        async for audio_hex in self._audio_fragments(text):
+            chunk_counter += 1
+            audio_bytes = bytes.fromhex(audio_hex)
 
-                    # Convert PCM bytes to numpy float32 array (MoFA Flow approach)
-                    # PCM format: 16-bit signed integers, normalize to [-1, 1]
-                    audio_int16 = np.frombuffer(audio_bytes, dtype=np.int16)
-                    audio_float32 = audio_int16.astype(np.float32) / 32768.0
+            # Convert PCM bytes to numpy float32 array (MoFA Flow approach)
+            # PCM format: 16-bit signed integers, normalize to [-1, 1]
+            audio_int16 = np.frombuffer(audio_bytes, dtype=np.int16)
+            audio_float32 = audio_int16.astype(np.float32) / 32768.0
 
-                    fragment_duration = len(audio_float32) / self.config.sample_rate
+            fragment_duration = len(audio_float32) / self.config.sample_rate
 
-                    # Add to buffer
-                    chunk_buffer.append(audio_float32)
-                    batch_accumulated_duration += fragment_duration
+            # Add to buffer
+            chunk_buffer.append(audio_float32)
+            batch_accumulated_duration += fragment_duration
 
-                    # Send batch when accumulated duration exceeds threshold
-                    if batch_accumulated_duration >= batch_duration_threshold:
-                        batched_audio = np.concatenate(chunk_buffer)
-                        self.logger(f"发送批次音频: {len(batched_audio)} 采样点, {batch_accumulated_duration:.2f}秒")
-                        yield self.config.sample_rate, batched_audio
+            # Send batch when accumulated duration exceeds threshold
+            if batch_accumulated_duration >= batch_duration_threshold:
+                batched_audio = np.concatenate(chunk_buffer)
+                self.logger(f"发送批次音频: {len(batched_audio)} 采样点, {batch_accumulated_duration:.2f}秒")
+                yield self.config.sample_rate, batched_audio
 
-                        # Reset buffer
-                        chunk_buffer = []
-                        batch_accumulated_duration = 0.0
+                # Reset buffer
+                chunk_buffer = []
+                batch_accumulated_duration = 0.0
 
-            # Completed
-            if response.get("is_final"):
-                # Send remaining chunks in buffer
-                if chunk_buffer:
-                    batched_audio = np.concatenate(chunk_buffer)
-                    self.logger(f"发送最后批次音频: {len(batched_audio)} 采样点, {batch_accumulated_duration:.2f}秒")
-                    yield self.config.sample_rate, batched_audio
+        # Send remaining chunks in buffer
+        if chunk_buffer:
+            batched_audio = np.concatenate(chunk_buffer)
+            self.logger(f"发送最后批次音频: {len(batched_audio)} 采样点, {batch_accumulated_duration:.2f}秒")
+            yield self.config.sample_rate, batched_audio
 
-                self.logger(f"语音生成完成，共处理 {chunk_counter} 个原始片段")
-                break
+        self.logger(f"语音生成完成，共处理 {chunk_counter} 个原始片段")
 
     async def close(self) -> None:
         """Finish the task and close the connection."""
@@ -217,34 +368,271 @@ class MiniMaxWebSocketClient:
             await self._ws.close()
             self._ws = None
             self._connected = False
+            self._task_started = False
             self.logger("MiniMax 连接已关闭")
 
 
+class MiniMaxSessionPool:
+    """
+    Keep started MiniMax tasks open and reuse them across segments.
+
+    Every segment is sent as another ``task_continue`` on an idle session with
+    the same voice settings, so the TLS handshake, ``connected_success`` and
+    ``task_start`` round trips are paid once per session instead of once per
+    segment. A pool is bound to the event loop it is used in.
+
+    Usage:
+        async with MiniMaxSessionPool() as pool:
+            sample_rate, audio = await synthesize_to_pcm(config, text, pool=pool)
+    """
+
+    def __init__(self, idle_timeout: float = 30.0):
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Tuple, List[Tuple[MiniMaxWebSocketClient, float]]] = {}
+        self._closed = False
+
+    async def __aenter__(self) -> "MiniMaxSessionPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def acquire(
+        self,
+        config: MiniMaxVoiceConfig,
+        logger: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[MiniMaxWebSocketClient, bool]:
+        """
+        Return ``(client, reused)``: an idle started session, or a freshly started one.
+        """
+        if self._closed:
+            raise MiniMaxError("MiniMax 会话池已关闭")
+
+        idle = self._idle.get(config.session_key(), [])
+        now = time.monotonic()
+        while idle:
+            client, released_at = idle.pop()
+            if client.is_open and now - released_at <= self.idle_timeout:
+                client.logger = logger or (lambda message: None)
+                return client, True
+            await self._discard(client)
+
+        client = MiniMaxWebSocketClient(config, logger=logger)
+        try:
+            await client.connect()
+            await client.start_task()
+        except BaseException:
+            await self._discard(client)
+            raise
+        return client, False
+
+    async def release(self, client: MiniMaxWebSocketClient, *, reusable: bool = True) -> None:
+        """Return a session to the pool, or close it if it is broken or the pool is closed."""
+        if not reusable or self._closed or not client.is_open:
+            await self._discard(client)
+            return
+        self._idle.setdefault(client.config.session_key(), []).append((client, time.monotonic()))
+
+    async def synthesize(
+        self,
+        config: MiniMaxVoiceConfig,
+        text: str,
+        logger: Optional[Callable[[str], None]] = None,
+    ) -> bytearray:
+        """
+        Synthesize ``text`` over a pooled session and return its 16-bit PCM.
+
+        A reused session may have been dropped by the server while idle; in that
+        case the segment is retried once on a fresh connection.
+        """
+        return await self._run(config, lambda client: client.read_pcm16(text), logger)
+
+    async def synthesize_batch(
+        self,
+        config: MiniMaxVoiceConfig,
+        texts: Sequence[str],
+        logger: Optional[Callable[[str], None]] = None,
+    ) -> List[bytearray]:
+        """Synthesize ``texts`` back to back in one pooled session; see ``read_pcm16_batch``."""
+        return await self._run(config, lambda client: client.read_pcm16_batch(texts), logger)
+
+    async def _run(
+        self,
+        config: MiniMaxVoiceConfig,
+        operation: Callable[[MiniMaxWebSocketClient], Awaitable[Any]],
+        logger: Optional[Callable[[str], None]],
+    ) -> Any:
+        while True:
+            client, reused = await self.acquire(config, logger=logger)
+            try:
+                result = await operation(client)
+            except (MiniMaxError, WebSocketException, OSError) as exc:
+                await self.release(client, reusable=False)
+                if not reused:
+                    raise MiniMaxError(
+                        f"MiniMax 合成失败: {exc}",
+                        status_code=getattr(exc, "status_code", None),
+                    ) from exc
+                (logger or (lambda message: None))(f"复用的 MiniMax 会话已失效，重新连接: {exc}")
+                continue
+            except BaseException:
+                # Cancelled mid-stream: the task still has audio in flight, don't reuse it
+                await self.release(client, reusable=False)
+                raise
+
+            await self.release(client)
+            return result
+
+    async def close(self) -> None:
+        """Finish every idle task and close its connection."""
+        self._closed = True
+        idle, self._idle = self._idle, {}
+        for sessions in idle.values():
+            for client, _ in sessions:
+                await self._discard(client)
+
+    @staticmethod
+    async def _discard(client: MiniMaxWebSocketClient) -> None:
+        try:
+            await client.close()
+        except Exception:  # pragma: no cover - connection already gone
+            pass
+
+
+async def synthesize_pcm16(
+    config: MiniMaxVoiceConfig,
+    text: str,
+    logger: Optional[Callable[[str], None]] = None,
+    *,
+    pool: Optional[MiniMaxSessionPool] = None,
+    limiter: Optional["MiniMaxRateLimiter"] = None,
+    retry: Optional[MiniMaxRetryPolicy] = None,
+) -> Tuple[int, bytearray]:
+    """
+    Synthesize `text` and return raw 16-bit little-endian PCM with its sample rate.
+
+    This is the native path used by the podcast generator: audio stays int16
+    from the wire to the encoder. When ``pool`` is given the segment is sent
+    over a reused MiniMax session instead of opening a new connection.
+
+    Each attempt first takes a token from ``limiter``. Failed attempts are
+    retried according to ``retry`` (3 attempts by default) unless MiniMax
+    reported a fatal error such as a bad API key; throttling responses also
+    slow the limiter down.
+
+    Returns:
+        Tuple of (sample_rate, pcm_bytes)
+    """
+    async def attempt() -> bytearray:
+        if pool is not None:
+            pcm = await pool.synthesize(config, text, logger=logger)
+        else:
+            async with MiniMaxWebSocketClient(config, logger=logger) as client:
+                pcm = await client.read_pcm16(text)
+        if not pcm:
+            raise MiniMaxError("MiniMax 未返回任何音频片段")
+        return pcm
+
+    config.validate()
+    pcm = await _with_retry(attempt, logger=logger, limiter=limiter, retry=retry)
+    return config.sample_rate, pcm
+
+
+async def synthesize_pcm16_batch(
+    config: MiniMaxVoiceConfig,
+    texts: Sequence[str],
+    logger: Optional[Callable[[str], None]] = None,
+    *,
+    pool: Optional[MiniMaxSessionPool] = None,
+    limiter: Optional["MiniMaxRateLimiter"] = None,
+    retry: Optional[MiniMaxRetryPolicy] = None,
+) -> Tuple[int, List[bytearray]]:
+    """
+    Synthesize consecutive ``texts`` of one voice within a single MiniMax task.
+
+    Same contract as ``synthesize_pcm16`` but for a run of segments: one
+    session is used for all of them, each text is a ``task_continue`` and the
+    PCM is returned per text. A failed attempt retries the whole batch.
+
+    Returns:
+        Tuple of (sample_rate, [pcm_bytes per text])
+    """
+    async def attempt() -> List[bytearray]:
+        if pool is not None:
+            results = await pool.synthesize_batch(config, texts, logger=logger)
+        else:
+            async with MiniMaxWebSocketClient(config, logger=logger) as client:
+                results = await client.read_pcm16_batch(texts)
+        if not all(results):
+            raise MiniMaxError("MiniMax 未返回任何音频片段")
+        return results
+
+    config.validate()
+    results = await _with_retry(attempt, logger=logger, limiter=limiter, retry=retry, tokens=len(texts))
+    return config.sample_rate, results
+
+
+async def _with_retry(
+    attempt: Callable[[], Awaitable[Any]],
+    *,
+    logger: Optional[Callable[[str], None]],
+    limiter: Optional["MiniMaxRateLimiter"],
+    retry: Optional[MiniMaxRetryPolicy],
+    tokens: int = 1,
+) -> Any:
+    """Run ``attempt`` under the rate limiter, retrying retryable failures with backoff."""
+    retry = retry or MiniMaxRetryPolicy()
+    log = logger or (lambda message: None)
+
+    attempt_number = 1
+    while True:
+        if limiter is not None:
+            for _ in range(tokens):
+                await limiter.acquire()
+
+        try:
+            result = await attempt()
+        except (MiniMaxError, WebSocketException, OSError, asyncio.TimeoutError) as exc:
+            rate_limited = isinstance(exc, MiniMaxError) and exc.is_rate_limited
+            if rate_limited and limiter is not None:
+                limiter.penalize()
+
+            retryable = not isinstance(exc, MiniMaxError) or exc.is_retryable
+            if not retryable or attempt_number >= retry.attempts:
+                raise
+
+            delay = retry.backoff(attempt_number)
+            log(f"MiniMax 第 {attempt_number} 次尝试失败，{delay:.1f}s 后重试: {exc}")
+            await asyncio.sleep(delay)
+            attempt_number += 1
+            continue
+
+        if limiter is not None:
+            limiter.reward()
+        return result
+
+
 async def synthesize_to_pcm(
     config: MiniMaxVoiceConfig,
     text: str,
     logger: Optional[Callable[[str], None]] = None,
+    *,
+    pool: Optional[MiniMaxSessionPool] = None,
+    limiter: Optional["MiniMaxRateLimiter"] = None,
+    retry: Optional[MiniMaxRetryPolicy] = None,
 ) -> Tuple[int, np.ndarray]:
     """
     Convenience helper: synthesize `text` and return float32 numpy array with sample rate.
 
+    Only needed when a DSP stage wants float samples; otherwise prefer
+    `synthesize_pcm16`, which skips the float conversion.
+
     Returns:
         Tuple of (sample_rate, audio_float32_array)
         Audio is normalized to [-1, 1] range as float32.
     """
-    config.validate()
-
-    chunks: list[np.ndarray] = []
-    async with MiniMaxWebSocketClient(config, logger=logger) as client:
-        async for sample_rate, chunk in client.stream_text(text):
-            chunks.append(chunk)
-
-    if not chunks:
-        raise MiniMaxError("MiniMax 未返回任何音频片段")
-
-    # Concatenate all batched audio chunks
-    final_audio = np.concatenate(chunks)
-    return config.sample_rate, final_audio
+    sample_rate, pcm = await synthesize_pcm16(config, text, logger=logger, pool=pool, limiter=limiter, retry=retry)
+    return sample_rate, np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
 
 
 def synthesize_text(
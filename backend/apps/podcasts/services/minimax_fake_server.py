@@ -0,0 +1,171 @@
+"""
+Local stand-in for the MiniMax TTS WebSocket API.
+
+Speaks the same ``connected_success`` / ``task_start`` / ``task_continue`` /
+``is_final`` / ``task_finish`` protocol as ``wss://api.minimax.io/ws/v1/t2a_v2``
+and returns a synthetic tone, so the TTS path can be tested and benchmarked
+offline. Point ``MINIMAX_TTS['ws_url']`` (or ``MiniMaxVoiceConfig.ws_url``)
+at ``FakeMiniMaxServer.url``.
+
+Usage:
+    async with FakeMiniMaxServer(first_audio_latency=0.2, audio_speed=10) as server:
+        config = MiniMaxVoiceConfig(api_key="test", voice_id="v", ws_url=server.url)
+        ...
+
+Or standalone:
+    python -m apps.podcasts.services.minimax_fake_server --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+logger = logging.getLogger(__name__)
+
+
+class FakeMiniMaxServer:
+    """
+    In-process fake MiniMax TTS server.
+
+    Args:
+        host/port: Listen address; port 0 picks a free port.
+        first_audio_latency: Seconds between ``task_continue`` and the first audio frame.
+        audio_speed: How many times faster than real time audio is streamed
+            (0 sends all frames at once).
+        chars_per_second: Speaking rate used to size the generated audio.
+        frame_ms: Audio duration carried by each ``data.audio`` frame.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        first_audio_latency: float = 0.05,
+        audio_speed: float = 0.0,
+        chars_per_second: float = 4.5,
+        frame_ms: int = 100,
+    ):
+        self.host = host
+        self.port = port
+        self.first_audio_latency = first_audio_latency
+        self.audio_speed = audio_speed
+        self.chars_per_second = chars_per_second
+        self.frame_ms = frame_ms
+        self.stats: Dict[str, int] = {
+            "connections": 0,
+            "task_starts": 0,
+            "segments": 0,
+            "audio_bytes": 0,
+        }
+        self._server: Optional[websockets.Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def __aenter__(self) -> "FakeMiniMaxServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def start(self) -> None:
+        self._server = await websockets.serve(self._handle, self.host, self.port, max_size=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("MiniMax 模拟服务已启动: %s", self.url)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def synthesize(self, text: str, sample_rate: int, channels: int = 1) -> bytes:
+        """Deterministic 16-bit PCM for ``text``: a 220 Hz tone sized by ``chars_per_second``."""
+        frames = max(1, int(sample_rate * len(text) / self.chars_per_second))
+        tone = (np.sin(2 * np.pi * 220 * np.arange(frames) / sample_rate) * 8000).astype(np.int16)
+        if channels > 1:
+            tone = np.repeat(tone, channels)
+        return tone.tobytes()
+
+    async def _handle(self, ws) -> None:
+        self.stats["connections"] += 1
+        audio_setting = {"sample_rate": 32000, "channel": 1}
+        try:
+            await ws.send(json.dumps({"event": "connected_success", "base_resp": {"status_code": 0}}))
+            async for raw in ws:
+                message = json.loads(raw)
+                event = message.get("event")
+
+                if event == "task_start":
+                    self.stats["task_starts"] += 1
+                    audio_setting.update(message.get("audio_setting") or {})
+                    await ws.send(json.dumps({"event": "task_started", "base_resp": {"status_code": 0}}))
+                elif event == "task_continue":
+                    await self._stream_segment(ws, message.get("text", ""), audio_setting)
+                elif event == "task_finish":
+                    await ws.send(json.dumps({"event": "task_finished", "base_resp": {"status_code": 0}}))
+                    return
+        except ConnectionClosed:
+            # Clients may close right after task_finish without waiting for the reply
+            pass
+
+    async def _stream_segment(self, ws, text: str, audio_setting: Dict[str, int]) -> None:
+        self.stats["segments"] += 1
+        sample_rate = int(audio_setting.get("sample_rate", 32000))
+        channels = int(audio_setting.get("channel", 1))
+        pcm = self.synthesize(text, sample_rate, channels)
+        self.stats["audio_bytes"] += len(pcm)
+
+        if self.first_audio_latency > 0:
+            await asyncio.sleep(self.first_audio_latency)
+
+        frame_bytes = max(2 * channels, int(sample_rate * self.frame_ms / 1000) * 2 * channels)
+        frame_delay = self.frame_ms / 1000 / self.audio_speed if self.audio_speed > 0 else 0
+        for offset in range(0, len(pcm), frame_bytes):
+            await ws.send(json.dumps({"data": {"audio": pcm[offset:offset + frame_bytes].hex()}, "is_final": False}))
+            if frame_delay:
+                await asyncio.sleep(frame_delay)
+
+        await ws.send(json.dumps({"data": {"audio": ""}, "is_final": True, "base_resp": {"status_code": 0}}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local fake MiniMax TTS WebSocket server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="first audio latency in seconds")
+    parser.add_argument("--audio-speed", type=float, default=0.0, help="x real time, 0 = unthrottled")
+    parser.add_argument("--chars-per-second", type=float, default=4.5)
+    args = parser.parse_args()
+
+    async def serve_forever():
+        server = FakeMiniMaxServer(
+            args.host,
+            args.port,
+            first_audio_latency=args.latency,
+            audio_speed=args.audio_speed,
+            chars_per_second=args.chars_per_second,
+        )
+        async with server:
+            print(f"Fake MiniMax listening on {server.url}")
+            await asyncio.Future()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Token-bucket rate limiting for MiniMax TTS requests.
+
+Every Celery worker draws from one bucket stored in Redis, so concurrent
+episodes share MiniMax's request budget instead of each assuming it has the
+whole quota. If Redis is unreachable the limiter falls back to an in-process
+bucket and tries Redis again after a short cooldown.
+
+On top of the shared bucket each limiter adapts its own request rate: a
+throttling response halves it, and every successful request wins a little
+of it back (AIMD), so throughput degrades gracefully under throttling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = bucket key; ARGV = rate (tokens/s), capacity, requested tokens.
+# Returns the seconds to wait before retrying (as a string, Lua numbers are
+# truncated to integers in replies), or "0" when the tokens were taken.
+TOKEN_BUCKET_LUA = """
+redis.replicate_commands()
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+  tokens = tokens - requested
+else
+  wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class LocalTokenBucket:
+    """Thread-safe in-process token bucket, used when Redis is unavailable."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._tokens: Optional[float] = None
+        self._updated_at = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, rate: float, capacity: float, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available and return 0, otherwise return the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            if self._tokens is None:
+                self._tokens = capacity
+            else:
+                self._tokens = min(capacity, self._tokens + (now - self._updated_at) * rate)
+            self._updated_at = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / rate
+
+
+class MiniMaxRateLimiter:
+    """
+    Adaptive token-bucket limiter shared across workers through Redis.
+
+    Usage:
+        limiter = MiniMaxRateLimiter(rate=5, burst=10, redis_url="redis://...")
+        await limiter.acquire()    # before each MiniMax request
+        limiter.penalize()         # MiniMax reported throttling
+        limiter.reward()           # request succeeded
+    """
+
+    REDIS_RETRY_AFTER = 30.0  # seconds on the local bucket before trying Redis again
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        redis_url: Optional[str] = None,
+        key: str = "minimax:tts:bucket",
+        min_factor: float = 0.1,
+        recovery_step: float = 0.05,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.redis_url = redis_url or None
+        self.key = key
+        self.min_factor = min_factor
+        self.recovery_step = recovery_step
+        self.factor = 1.0
+        self._local = LocalTokenBucket()
+        self._redis: Optional[redis.Redis] = None
+        self._script = None
+        self._redis_retry_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, minimax_settings: Dict[str, object]) -> Optional["MiniMaxRateLimiter"]:
+        rate = float(minimax_settings.get("rate_limit_per_second", 5.0) or 0)
+        if rate <= 0:
+            return None
+        return cls(
+            rate,
+            int(minimax_settings.get("rate_limit_burst", 10)),
+            redis_url=str(minimax_settings.get("rate_limit_redis_url") or "").strip() or None,
+        )
+
+    @property
+    def effective_rate(self) -> float:
+        return self.rate * self.factor
+
+    @property
+    def effective_burst(self) -> float:
+        return max(1.0, self.burst * self.factor)
+
+    async def acquire(self) -> None:
+        """Wait until a request token is available."""
+        while True:
+            wait = await asyncio.to_thread(self._reserve)
+            if wait <= 0:
+                return
+            # Jitter so workers woken at the same moment don't collide again
+            await asyncio.sleep(wait * random.uniform(1.0, 1.2))
+
+    def penalize(self) -> None:
+        """Halve this limiter's rate after MiniMax throttled a request."""
+        with self._lock:
+            self.factor = max(self.min_factor, self.factor * 0.5)
+            factor = self.factor
+        logger.warning("MiniMax 限流，请求速率降至 %.2f/s", self.rate * factor)
+
+    def reward(self) -> None:
+        """Recover some of the rate after a successful request."""
+        with self._lock:
+            self.factor = min(1.0, self.factor + self.recovery_step)
+
+    def _reserve(self) -> float:
+        rate, burst = self.effective_rate, self.effective_burst
+        script = self._redis_script()
+        if script is not None:
+            try:
+                return float(script(keys=[self.key], args=[rate, burst, 1]))
+            except redis.RedisError as exc:
+                logger.warning("Redis 令牌桶不可用，暂时使用进程内限流: %s", exc)
+                self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_AFTER
+        return self._local.reserve(rate, burst)
+
+    def _redis_script(self):
+        if not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._script is None:
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+            self._script = self._redis.register_script(TOKEN_BUCKET_LUA)
+        return self._script
@@ -0,0 +1,138 @@
+"""
+Per-voice speaking rates learned from synthesized audio.
+
+Segment length is derived from a target duration, so a voice that speaks
+faster (or text that is mostly English) should get longer segments. The
+tracker keeps an exponential moving average of characters per second for
+every voice/model/speed combination in the ``SpeakingRate`` table, fed by
+the duration of the PCM MiniMax actually returned, so every worker process
+shares what was learned and it survives restarts.
+
+Observations are buffered in memory and written in one ``flush()`` after a
+generation succeeds (``discard()`` drops them when it fails), so the event
+loop never waits on the database. Learned rates are rounded to
+``RATE_STEP`` so small drifts of the average do not re-split scripts and
+invalidate cached segment audio.
+
+Usage:
+    rates = SpeakingRateTracker(default_rate=4.5)
+    max_chars = rates.max_chars(config, target_seconds=10)
+    rates.observe(config, text, seconds)
+    rates.flush()
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from apps.podcasts.models import SpeakingRate
+
+from .minimax_client import MiniMaxVoiceConfig
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tts_rate"
+
+# Very short segments are dominated by leading/trailing silence and say little about the rate
+MIN_OBSERVED_CHARS = 8
+MIN_OBSERVED_SECONDS = 1.0
+
+# Granularity of the rates used for sizing (chars/second)
+RATE_STEP = 0.5
+
+
+class SpeakingRateTracker:
+    """
+    Learn characters per second per voice and size segments with it.
+
+    Args:
+        default_rate: Rate used until a voice has ``min_samples`` observations.
+        alpha: EMA weight of each new observation.
+        min_samples: Observations required before the learned rate is trusted.
+        min_rate/max_rate: Bounds applied to learned rates.
+    """
+
+    def __init__(
+        self,
+        default_rate: float,
+        *,
+        alpha: float = 0.2,
+        min_samples: int = 3,
+        min_rate: float = 1.0,
+        max_rate: float = 30.0,
+    ):
+        self.default_rate = default_rate
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._pending: Dict[str, List[Tuple[int, float]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, minimax_settings: Dict[str, object], default_rate: float) -> Optional["SpeakingRateTracker"]:
+        from .generator import _coerce_bool
+
+        if not _coerce_bool(minimax_settings.get("adaptive_segmentation"), True):
+            return None
+        return cls(
+            default_rate,
+            alpha=float(minimax_settings.get("speaking_rate_alpha", 0.2)),
+            min_samples=int(minimax_settings.get("speaking_rate_min_samples", 3)),
+        )
+
+    @staticmethod
+    def make_key(config: MiniMaxVoiceConfig) -> str:
+        identity = f"{config.model}\x00{config.voice_id}\x00{config.speed}"
+        return f"{KEY_PREFIX}:{hashlib.sha1(identity.encode('utf-8')).hexdigest()[:20]}"
+
+    def rate(self, config: MiniMaxVoiceConfig) -> float:
+        """Learned chars/second for ``config``, or ``default_rate`` while still learning."""
+        entry = SpeakingRate.objects.filter(key=self.make_key(config)).values("rate", "samples").first()
+        if not entry or entry["samples"] < self.min_samples:
+            return self.default_rate
+        rate = round(float(entry["rate"]) / RATE_STEP) * RATE_STEP
+        return min(self.max_rate, max(self.min_rate, rate))
+
+    def max_chars(self, config: MiniMaxVoiceConfig, target_seconds: float) -> int:
+        return max(1, int(target_seconds * self.rate(config)))
+
+    def observe(self, config: MiniMaxVoiceConfig, text: str, seconds: float) -> None:
+        """Record that ``text`` took ``seconds`` of audio; stored on the next ``flush()``."""
+        chars = len(text.strip())
+        if chars < MIN_OBSERVED_CHARS or seconds < MIN_OBSERVED_SECONDS:
+            return
+        with self._lock:
+            self._pending.setdefault(self.make_key(config), []).append((chars, seconds))
+
+    def discard(self) -> None:
+        """Drop buffered observations (the generation they came from failed)."""
+        with self._lock:
+            self._pending = {}
+
+    def flush(self) -> None:
+        """Fold buffered observations into the stored averages."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        for key, observations in pending.items():
+            # Row lock so concurrent workers finishing episodes don't overwrite each other
+            with transaction.atomic():
+                entry, _created = SpeakingRate.objects.select_for_update().get_or_create(
+                    key=key, defaults={"rate": self.default_rate, "samples": 0}
+                )
+                rate, samples = float(entry.rate), int(entry.samples)
+                for chars, seconds in observations:
+                    observed = chars / seconds
+                    # Average plainly until the EMA has enough history to lean on
+                    weight = max(self.alpha, 1.0 / (samples + 1))
+                    rate += weight * (observed - rate)
+                    samples += 1
+                entry.rate, entry.samples = rate, samples
+                entry.save(update_fields=["rate", "samples", "updated_at"])
+            logger.debug("语速更新 %s: %.2f 字/秒 (样本 %s)", key, rate, samples)
@@ -0,0 +1,165 @@
+"""
+Content-addressed on-disk cache for synthesized TTS segments.
+
+Each entry is the raw 16-bit PCM MiniMax returned for one segment, keyed by
+a hash of the normalized text and the voice settings that affect the audio.
+Re-generating a script after editing one line therefore only calls MiniMax
+for the segments whose text actually changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import unicodedata
+from typing import Dict, Optional
+
+from .minimax_client import MiniMaxVoiceConfig
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_VERSION = 1
+CACHE_FILE_SUFFIX = ".pcm"
+
+
+def normalize_segment_text(text: str) -> str:
+    """Normalize text so that whitespace-only edits don't change the cache key."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+class TTSSegmentCache:
+    """
+    Size-bounded LRU cache of segment PCM on disk.
+
+    Entries live under ``cache_dir/<2-char shard>/<sha256>.pcm``. A hit bumps
+    the file's mtime, and once the directory grows past ``max_bytes`` the
+    least recently used entries are evicted. The cache is safe to share
+    between worker processes: writes are atomic renames and a file evicted
+    by another process simply reads as a miss.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, minimax_settings: Dict[str, object]) -> Optional["TTSSegmentCache"]:
+        cache_dir = str(minimax_settings.get("segment_cache_dir") or "").strip()
+        max_mb = int(minimax_settings.get("segment_cache_max_mb", 1024) or 0)
+        if not cache_dir or max_mb <= 0:
+            return None
+        return cls(cache_dir, max_mb * 1024 * 1024)
+
+    @staticmethod
+    def make_key(config: MiniMaxVoiceConfig, text: str) -> str:
+        payload = {
+            "v": CACHE_KEY_VERSION,
+            "text": normalize_segment_text(text),
+            "model": config.model,
+            "voice_id": config.voice_id,
+            "speed": config.speed,
+            "volume": config.volume,
+            "pitch": config.pitch,
+            "sample_rate": config.sample_rate,
+            "channel": config.audio_channel,
+            "english_normalization": config.enable_english_normalization,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, config: MiniMaxVoiceConfig, text: str) -> Optional[bytes]:
+        """Return cached PCM for ``text`` in ``config``'s voice, or None."""
+        path = self._path(self.make_key(config, text))
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, config: MiniMaxVoiceConfig, text: str, pcm: bytes) -> None:
+        """Store PCM for ``text``; failures are logged and otherwise ignored."""
+        path = self._path(self.make_key(config, text))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(pcm)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError as exc:
+            logger.warning("写入 TTS 片段缓存失败，已跳过: %s (%s)", path, exc)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(pcm)
+            over_limit = self._size > self.max_bytes
+
+        if over_limit:
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{CACHE_FILE_SUFFIX}")
+
+    def _entries(self):
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(CACHE_FILE_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _scan_size(self) -> int:
+        return sum(size for _path, size, _mtime in self._entries())
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is back under 90% of its limit."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _path, size, _mtime in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+
+        for path, size, _mtime in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._size = total
+
+        if removed:
+            logger.info("TTS 片段缓存已淘汰 %s 个条目，当前 %.1f MB", removed, total / 1024 / 1024)
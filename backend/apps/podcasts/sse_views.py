@@ -1,16 +1,232 @@
 """
 SSE (Server-Sent Events) 视图 - 用于实时流式传输
+
+经 ASGI（config.asgi / daphne）提供服务时，事件流是事件循环中的异步迭代器，
+等待 Redis 推送时不占用线程，客户端断开时 Django 取消迭代器并释放订阅；
+经 WSGI（gunicorn）提供服务时使用同步生成器。
+对话从 DialogueEntry 表按 seq 增量读取，不再反复读取整段 Episode.dialogue。
 """
+import asyncio
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
 from django.http import StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import AccessToken
-from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
-from django.contrib.auth import get_user_model
-import json
-import time
+
+from .services.debate_events import (
+    TERMINAL_EVENTS, decode_message, format_sse, subscribe, subscribe_async, terminal_event,
+)
 
 User = get_user_model()
 
+POLL_INTERVAL = 0.5
+STREAM_IDLE_TIMEOUT = 240  # 最多等待4分钟没有新事件
+HEARTBEAT_INTERVAL = 15  # 空闲时发送注释行，防止代理断开连接
+HEARTBEAT = ": ping\n\n"
+STATUS_FIELDS = ['status', 'generation_stage', 'generation_error']
+
+
+class _DialogueCursor:
+    """记录已发送给客户端的发言序号，用于去重和补齐"""
+
+    def __init__(self):
+        self.next_seq = 0
+
+    def route(self, message):
+        """
+        处理一条推送消息
+
+        返回 (是否发送, 需要从数据库补齐的序号范围 (start, end) 或 None)
+        """
+        index = message.get('index')
+        if message.get('event') != 'dialogue' or index is None:
+            return True, None
+        if index < self.next_seq:
+            return False, None
+        backfill = (self.next_seq, index) if index > self.next_seq else None
+        self.next_seq = index + 1
+        return True, backfill
+
+    def emit(self, rows):
+        """把从数据库读到的发言转成事件，并前移游标"""
+        chunks = []
+        for row in rows:
+            chunks.append(format_sse('dialogue', row.as_dict()))
+            self.next_seq = row.seq + 1
+        return chunks
+
+
+def _entries(episode_id, start, end=None):
+    """序号在 [start, end) 内的发言（只查询新增的行，不读取整段对话）"""
+    from .models import DialogueEntry
+
+    return DialogueEntry.after(episode_id, start - 1, before=end)
+
+
+def _terminal(episode, cursor):
+    return terminal_event(episode, cursor.next_seq)
+
+
+# 同步（WSGI）
+
+def _subscribed_events(episode, pubsub):
+    """数据库只在连接时读一次，之后的对话由 Redis 推送"""
+    cursor = _DialogueCursor()
+    yield from cursor.emit(_entries(episode.id, cursor.next_seq))
+
+    terminal = _terminal(episode, cursor)
+    if terminal:
+        yield format_sse(*terminal)
+        return
+
+    deadline = time.monotonic() + STREAM_IDLE_TIMEOUT
+    while time.monotonic() < deadline:
+        message = decode_message(pubsub.get_message(timeout=1.0))
+        if message is None:
+            continue
+        send, backfill = cursor.route(message)
+        if not send:
+            continue
+        if backfill:
+            # 中间有事件丢失（如 Redis 短暂不可用），从数据库补齐
+            for row in _entries(episode.id, *backfill):
+                yield format_sse('dialogue', row.as_dict())
+
+        yield format_sse(message.get('event'), message.get('data'))
+        if message.get('event') in TERMINAL_EVENTS:
+            return
+        deadline = time.monotonic() + STREAM_IDLE_TIMEOUT
+
+    yield format_sse('stream_error', {'error': '超时'})
+
+
+def _poll_events(episode):
+    """轮询数据库（Redis 不可用时使用），每次只取游标之后的新发言"""
+    cursor = _DialogueCursor()
+    for _ in range(int(STREAM_IDLE_TIMEOUT / POLL_INTERVAL)):
+        # 先读状态再读发言：状态变化之前写入的发言一定在本轮发出
+        episode.refresh_from_db(fields=STATUS_FIELDS)
+        yield from cursor.emit(_entries(episode.id, cursor.next_seq))
+
+        terminal = _terminal(episode, cursor)
+        if terminal:
+            yield format_sse(*terminal)
+            return
+        time.sleep(POLL_INTERVAL)
+
+    yield format_sse('stream_error', {'error': '超时'})
+
+
+def _event_stream(episode_id):
+    from .models import Episode
+
+    # 先订阅再读库：读库之后发布的事件一定能收到，之前的由数据库补齐
+    pubsub = subscribe(episode_id)
+    try:
+        try:
+            episode = Episode.objects.get(id=episode_id)
+        except Episode.DoesNotExist:
+            yield format_sse('stream_error', {'error': 'Episode不存在'})
+            return
+
+        # 提示客户端重连间隔（毫秒）
+        yield "retry: 1000\n\n"
+
+        if pubsub is None:
+            # Redis 不可用时退回轮询数据库
+            yield from _poll_events(episode)
+        else:
+            yield from _subscribed_events(episode, pubsub)
+    finally:
+        if pubsub is not None:
+            pubsub.close()
+
+
+# 异步（ASGI）
+
+async def _subscribed_events_async(episode, pubsub):
+    cursor = _DialogueCursor()
+    for chunk in cursor.emit([row async for row in _entries(episode.id, cursor.next_seq)]):
+        yield chunk
+
+    terminal = _terminal(episode, cursor)
+    if terminal:
+        yield format_sse(*terminal)
+        return
+
+    now = time.monotonic()
+    deadline, next_heartbeat = now + STREAM_IDLE_TIMEOUT, now + HEARTBEAT_INTERVAL
+    while time.monotonic() < deadline:
+        message = decode_message(await pubsub.get_message(timeout=1.0))
+        if message is None:
+            if time.monotonic() >= next_heartbeat:
+                yield HEARTBEAT
+                next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+            continue
+        send, backfill = cursor.route(message)
+        if not send:
+            continue
+        if backfill:
+            async for row in _entries(episode.id, *backfill):
+                yield format_sse('dialogue', row.as_dict())
+
+        yield format_sse(message.get('event'), message.get('data'))
+        if message.get('event') in TERMINAL_EVENTS:
+            return
+        now = time.monotonic()
+        deadline, next_heartbeat = now + STREAM_IDLE_TIMEOUT, now + HEARTBEAT_INTERVAL
+
+    yield format_sse('stream_error', {'error': '超时'})
+
+
+async def _poll_events_async(episode):
+    cursor = _DialogueCursor()
+    next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+    for _ in range(int(STREAM_IDLE_TIMEOUT / POLL_INTERVAL)):
+        await episode.arefresh_from_db(fields=STATUS_FIELDS)
+        chunks = cursor.emit([row async for row in _entries(episode.id, cursor.next_seq)])
+        for chunk in chunks:
+            yield chunk
+
+        terminal = _terminal(episode, cursor)
+        if terminal:
+            yield format_sse(*terminal)
+            return
+        if chunks:
+            next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+        elif time.monotonic() >= next_heartbeat:
+            yield HEARTBEAT
+            next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(POLL_INTERVAL)
+
+    yield format_sse('stream_error', {'error': '超时'})
+
+
+async def _event_stream_async(episode_id):
+    from .models import Episode
+
+    pubsub = await subscribe_async(episode_id)
+    try:
+        try:
+            episode = await Episode.objects.aget(id=episode_id)
+        except Episode.DoesNotExist:
+            yield format_sse('stream_error', {'error': 'Episode不存在'})
+            return
+
+        yield "retry: 1000\n\n"
+
+        events = _poll_events_async(episode) if pubsub is None else _subscribed_events_async(episode, pubsub)
+        async for chunk in events:
+            yield chunk
+    finally:
+        # 客户端断开时 Django 取消迭代器，CancelledError 经过这里释放订阅
+        if pubsub is not None:
+            await pubsub.aclose()
+
 
 @require_http_methods(["GET"])
 def debate_stream(request, episode_id):
@@ -19,12 +235,10 @@ def debate_stream(request, episode_id):
 
     事件类型：
     - dialogue: 新对话生成
-    - delta: 已发送对话的增量更新（按字流式）
+    - delta: 生成中发言的增量文本（按 turnId 对应，完整发言随 dialogue 事件到达）
     - complete: 生成完成
     - stream_error: 错误
     """
-    from .models import Episode
-
     # JWT authentication (EventSource doesn't support custom headers)
     token_string = request.GET.get('token')
     if not token_string or token_string == 'null':
@@ -42,67 +256,14 @@ def debate_stream(request, episode_id):
             yield f"event: stream_error\ndata: {json.dumps({'error': '无效的token'})}\n\n"
         return StreamingHttpResponse(error_stream(), content_type='text/event-stream')
 
-    def event_stream():
-        try:
-            episode = Episode.objects.get(id=episode_id)
-        except Episode.DoesNotExist:
-            yield f"event: stream_error\ndata: {json.dumps({'error': 'Episode不存在'})}\n\n"
-            return
-
-        # 提示客户端重连间隔（毫秒）
-        yield "retry: 1000\n\n"
-
-        # 记录已发送的对话数量
-        sent_count = 0
-        last_sent_content = ""
-        poll_interval = 0.5
-        max_retries = 480  # 最多等待4分钟（0.5秒 * 480）
-        retry_count = 0
-
-        while retry_count < max_retries:
-            episode.refresh_from_db()
-
-            # 检查是否有新对话
-            current_dialogue = episode.dialogue or []
-            if len(current_dialogue) > sent_count:
-                # 发送新对话
-                for entry in current_dialogue[sent_count:]:
-                    yield f"event: dialogue\ndata: {json.dumps(entry)}\n\n"
-                sent_count = len(current_dialogue)
-                last_sent_content = current_dialogue[sent_count - 1].get('content', '')
-            elif sent_count > 0 and len(current_dialogue) >= sent_count:
-                # 同一条发言内容继续增长，发 delta 事件
-                latest_entry = current_dialogue[sent_count - 1]
-                latest_content = latest_entry.get('content', '')
-                if latest_content != last_sent_content:
-                    payload = {
-                        "index": sent_count - 1,
-                        "participant": latest_entry.get('participant'),
-                        "content": latest_content,
-                        "timestamp": latest_entry.get('timestamp')
-                    }
-                    yield f"event: delta\ndata: {json.dumps(payload)}\n\n"
-                    last_sent_content = latest_content
-
-            # 检查状态
-            if episode.status == 'published':
-                yield f"event: complete\ndata: {json.dumps({'status': 'published', 'total': sent_count})}\n\n"
-                break
-            elif episode.status == 'failed':
-                error_message = episode.generation_error or '生成失败'
-                yield f"event: stream_error\ndata: {json.dumps({'error': error_message})}\n\n"
-                break
-
-            # 等待后再检查
-            time.sleep(poll_interval)
-            retry_count += 1
-
-        # 超时
-        if retry_count >= max_retries:
-            yield f"event: stream_error\ndata: {json.dumps({'error': '超时'})}\n\n"
+    # ASGI 下用异步迭代器，流的整个生命周期只是一个协程
+    if isinstance(request, ASGIRequest):
+        stream = _event_stream_async(episode_id)
+    else:
+        stream = _event_stream(episode_id)
 
     response = StreamingHttpResponse(
-        event_stream(),
+        stream,
         content_type='text/event-stream'
     )
     response['Cache-Control'] = 'no-cache'
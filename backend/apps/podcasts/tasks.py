@@ -3,13 +3,88 @@
 """
 from celery import shared_task
 from django.utils import timezone
-from django.db import transaction
 import os
 from utils.audio_processor import process_audio, get_audio_duration
 import json
 import time
 
 
+def _start_live_playback(episode):
+    """
+    准备边生成边播放的 HLS 目录（MEDIA_ROOT/live/<id>/），并把播放列表地址写入 generation_meta。
+
+    未启用时返回 None。
+    """
+    import shutil
+    from django.conf import settings
+
+    if not settings.MINIMAX_TTS.get('live_playback', True):
+        return None
+
+    live_dir = os.path.join(settings.MEDIA_ROOT, 'live', str(episode.id))
+    shutil.rmtree(live_dir, ignore_errors=True)
+
+    media_url = settings.MEDIA_URL if settings.MEDIA_URL.endswith('/') else settings.MEDIA_URL + '/'
+    episode.generation_meta = {
+        **(episode.generation_meta or {}),
+        'live_playlist': f"{media_url}live/{episode.id}/index.m3u8",
+    }
+    episode.save(update_fields=['generation_meta', 'updated_at'])
+    return live_dir
+
+
+def _finish_live_playback(episode, live_dir):
+    """完整 MP3 就绪（或生成失败）后删除 HLS 目录，并从 generation_meta 中移除播放列表地址。"""
+    import shutil
+
+    if not live_dir:
+        return
+    shutil.rmtree(live_dir, ignore_errors=True)
+    meta = dict(episode.generation_meta or {})
+    meta.pop('live_playlist', None)
+    episode.generation_meta = meta
+
+
+def _audio_progress_reporter(episode, checkpoint=None, min_interval=2.0, live_dir=None):
+    """
+    构造生成器的进度回调：把 audio_progress 写入 generation_meta（节流）。
+
+    回调在生成器的工作线程中执行，因此只用 update() 写入并随后关闭该线程的数据库连接。
+    提供 live_dir 时同时记录 HLS 播放列表中已可播放的秒数（playable_seconds）。
+    """
+    from django.db import connections
+    from .models import Episode
+    from .services.audio_encoder import LiveHLSWriter, playable_seconds
+
+    last_saved = [0.0]
+
+    def report(completed, total):
+        now = time.monotonic()
+        if completed < total and now - last_saved[0] < min_interval:
+            return
+        last_saved[0] = now
+
+        progress = {
+            'completed': completed,
+            'total': total,
+            'resumed': checkpoint.restored if checkpoint else 0,
+        }
+        if live_dir:
+            progress['playable_seconds'] = round(
+                playable_seconds(os.path.join(live_dir, LiveHLSWriter.PLAYLIST_NAME)), 1
+            )
+        episode.generation_meta = {
+            **(episode.generation_meta or {}),
+            'audio_progress': progress,
+        }
+        try:
+            Episode.objects.filter(id=episode.id).update(generation_meta=episode.generation_meta)
+        finally:
+            connections.close_all()
+
+    return report
+
+
 @shared_task
 def process_episode_audio(episode_id):
     """
@@ -66,6 +141,31 @@ def process_episode_audio(episode_id):
             pass
         raise
 
+@shared_task
+def cleanup_stale_uploads_task():
+    """清理超过 AUDIO_UPLOAD_EXPIRE_HOURS 未续传的分片上传（删除半截文件和上传记录）"""
+    from datetime import timedelta
+    from django.conf import settings
+    from django.db import transaction
+    from .models import EpisodeUpload
+    from .services import chunked_upload
+
+    cutoff = timezone.now() - timedelta(hours=settings.AUDIO_UPLOAD_EXPIRE_HOURS)
+    stale = EpisodeUpload.objects.filter(status='uploading', updated_at__lt=cutoff)
+    removed = 0
+    for upload_id in stale.values_list('id', flat=True):
+        with transaction.atomic():
+            # 加锁后重新确认，期间收到新分片的上传不清理
+            upload = stale.select_for_update().filter(id=upload_id).first()
+            if upload is None:
+                continue
+            chunked_upload.remove_upload_file(upload.file_path)
+            upload.delete()
+            removed += 1
+
+    return f"Removed {removed} stale uploads"
+
+
 @shared_task
 def generate_podcast_task(episode_id, script_content, voice_config=None):
     """
@@ -73,19 +173,29 @@ def generate_podcast_task(episode_id, script_content, voice_config=None):
     """
     from .models import Episode
     from .services.generator import PodcastGenerator
-    from .services.cover_ai import generate_episode_cover
+    from .services.checkpoint import GenerationCheckpoint
+    from .services.cover_ai import render_episode_cover, save_episode_cover
     from .services.speaker_config import build_generator_runtime_options
-    from pydub import AudioSegment
+    from concurrent.futures import ThreadPoolExecutor
     import os
     from django.conf import settings
 
     episode = None # Initialize episode to None for error handling
+    cover_executor = None
+    live_dir = None
     try:
         episode = Episode.objects.get(id=episode_id)
         episode.status = 'processing'
         episode.generation_stage = 'generating_audio'
+        episode.script = script_content  # 保存脚本，默认使用AI生成的脚本
         episode.save()
 
+        # 封面只依赖标题和脚本，与音频合成并行生成（线程内不访问数据库）
+        cover_future = None
+        if not episode.cover:
+            cover_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"cover-{episode_id}")
+            cover_future = cover_executor.submit(render_episode_cover, episode)
+
         # 转换 speaker_config 为 voice_overrides 格式
         character_aliases, voice_overrides = build_generator_runtime_options(voice_config)
 
@@ -105,26 +215,39 @@ def generate_podcast_task(episode_id, script_content, voice_config=None):
             if storage.exists(placeholder_name):
                 storage.delete(placeholder_name)
 
+        # 检查点：重试时跳过上次已合成的片段
+        checkpoint = GenerationCheckpoint.for_episode(episode.id, settings.MINIMAX_TTS)
+        # 边生成边播放：片段写入 MP3 的同时写入 HLS 播放列表
+        live_dir = _start_live_playback(episode)
+
         # Generate audio with proper voice overrides
-        generator.generate(
+        result = generator.generate(
             script_content,
             full_path,
             character_aliases=character_aliases,
-            voice_overrides=voice_overrides
+            voice_overrides=voice_overrides,
+            checkpoint=checkpoint,
+            on_progress=_audio_progress_reporter(episode, checkpoint, live_dir=live_dir),
+            live_dir=live_dir,
         )
 
         # Update episode with audio
         episode.audio_file.name = relative_path
-        episode.script = script_content  # 保存脚本，默认使用AI生成的脚本
-        episode.duration = int(AudioSegment.from_mp3(full_path).duration_seconds)
-        episode.file_size = os.path.getsize(full_path)
+        episode.duration = int(result.duration_seconds)
+        episode.file_size = result.file_size
+        episode.generation_meta = {
+            **(episode.generation_meta or {}),
+            'segment_timings': result.timings_meta(),
+        }
+        _finish_live_playback(episode, live_dir)
+        live_dir = None
         episode.generation_stage = 'generating_cover'
         episode.save()
 
-        # Generate AI cover if not already has one
-        if not episode.cover:
+        # Attach the AI cover rendered alongside the audio
+        if cover_future is not None:
             try:
-                generate_episode_cover(episode)
+                save_episode_cover(episode, cover_future.result())
             except Exception as cover_err:
                 # Cover generation failure should not block audio publishing
                 print(f"Cover generation failed for episode {episode_id}: {cover_err}")
@@ -134,6 +257,9 @@ def generate_podcast_task(episode_id, script_content, voice_config=None):
         episode.published_at = timezone.now()
         episode.save()
 
+        if checkpoint:
+            checkpoint.clear()
+
         # 更新节目统计
         show = episode.show
         show.episodes_count = show.episodes.filter(status='published').count()
@@ -142,10 +268,14 @@ def generate_podcast_task(episode_id, script_content, voice_config=None):
     except Exception as e:
         print(f"Failed to generate podcast for episode {episode_id}: {e}")
         if episode: # Only update status if episode object was successfully retrieved
+            _finish_live_playback(episode, live_dir)
             episode.status = 'failed'
             episode.generation_error = str(e)[:1000]
             episode.save()
         raise
+    finally:
+        if cover_executor is not None:
+            cover_executor.shutdown(wait=False, cancel_futures=True)
 
 
 @shared_task
@@ -159,8 +289,9 @@ def generate_debate_task(episode_id, topic, mode='debate', rounds=3):
         mode: 'debate' 或 'conference'
         rounds: 对话轮数
     """
-    from .models import Episode
+    from .models import DialogueEntry, Episode
     from .services.conversation import ConversationManager
+    from .services.debate_events import DeltaPublisher, publish_debate_event
     from .services.participants import get_participants_by_mode
 
     episode = None
@@ -191,20 +322,22 @@ def generate_debate_task(episode_id, topic, mode='debate', rounds=3):
             rounds=rounds
         )
 
-        # 生成对话（流式，每生成一条就保存）
+        # 重新生成时清空旧发言
+        DialogueEntry.objects.filter(episode_id=episode_id).delete()
+
+        # 生成对话（流式，每生成一条追加一行，不重写已有对话；生成中的发言以 delta 事件推送）
         dialogue_entries = []
-        for entry in manager.generate_dialogue(topic):
+        deltas = DeltaPublisher(episode_id)
+        for entry in manager.generate_dialogue(topic, on_chunk=deltas):
             dialogue_entries.append(entry)
+            # 序号在追加时才确定（生成期间可能有插话），delta 按 turnId 对应到这条发言
+            entry = deltas.finish(entry)
+            row = DialogueEntry.append(episode_id, entry)
+            publish_debate_event(episode_id, 'dialogue', entry, index=row.seq)
+            deltas.advance()
 
-            # 实时保存，让前端可以看到进度
-            episode.dialogue = dialogue_entries.copy()
-            episode.save(update_fields=['dialogue'])
-
-            # 显式提交事务，让SSE能立即看到更新
-            transaction.commit()
-
-        # 最终保存（确保完整）
-        episode.dialogue = dialogue_entries
+        # 生成结束后物化一次完整对话，供导出和音频生成使用
+        episode.dialogue = DialogueEntry.entries_after(episode_id)
 
         # 将对话转换为脚本格式（用于兼容现有前端）
         script_lines = []
@@ -223,6 +356,7 @@ def generate_debate_task(episode_id, topic, mode='debate', rounds=3):
         episode.status = 'draft'
         episode.generation_stage = 'script_completed'
         episode.save()
+        publish_debate_event(episode_id, 'complete', {'status': episode.status, 'total': len(dialogue_entries)})
 
         return f"Debate/Conference {episode_id} script generated successfully with {len(dialogue_entries)} entries"
 
@@ -231,6 +365,7 @@ def generate_debate_task(episode_id, topic, mode='debate', rounds=3):
         if episode:
             episode.status = 'failed'
             episode.save()
+            publish_debate_event(episode_id, 'stream_error', {'error': episode.generation_error or '生成失败'})
         raise
 
 
@@ -248,17 +383,19 @@ def generate_debate_audio_task(episode_id, show_id=None, voice_config=None):
                 "guest_voice_id": "xxx"  # 嘉宾/反方音色
             }
     """
-    from .models import Episode, Show
+    from .models import DialogueEntry, Episode, Show
     from .services.generator import PodcastGenerator
-    from pydub import AudioSegment
+    from .services.checkpoint import GenerationCheckpoint
     from django.conf import settings
 
     episode = None
+    live_dir = None
     try:
         episode = Episode.objects.get(id=episode_id)
 
-        # Validate Episode has dialogue
-        if not episode.dialogue or not episode.participants_config:
+        # Validate Episode has dialogue (entries include messages appended after the last export)
+        dialogue = DialogueEntry.entries_after(episode.id) or episode.dialogue
+        if not dialogue or not episode.participants_config:
             raise ValueError("Episode must have dialogue and participants_config")
 
         # Get Show if show_id provided
@@ -306,11 +443,16 @@ def generate_debate_audio_task(episode_id, show_id=None, voice_config=None):
                     if guest_voice_id:
                         participant['voice_id'] = guest_voice_id
 
-        # Generate audio from dialogue
-        generator.generate_multi(
-            dialogue=episode.dialogue,
+        # Generate audio from dialogue (resuming from a previous attempt's checkpoint)
+        checkpoint = GenerationCheckpoint.for_episode(episode.id, settings.MINIMAX_TTS)
+        live_dir = _start_live_playback(episode)
+        result = generator.generate_multi(
+            dialogue=dialogue,
             participants_config=participants_config,
-            output_path=full_path
+            output_path=full_path,
+            checkpoint=checkpoint,
+            on_progress=_audio_progress_reporter(episode, checkpoint, live_dir=live_dir),
+            live_dir=live_dir,
         )
 
         # Update episode with audio
@@ -319,11 +461,20 @@ def generate_debate_audio_task(episode_id, show_id=None, voice_config=None):
             episode.show = show
         episode.status = 'published'
         episode.generation_stage = 'completed'
-        episode.duration = int(AudioSegment.from_mp3(full_path).duration_seconds)
-        episode.file_size = os.path.getsize(full_path)
+        episode.duration = int(result.duration_seconds)
+        episode.file_size = result.file_size
+        episode.generation_meta = {
+            **(episode.generation_meta or {}),
+            'segment_timings': result.timings_meta(),
+        }
+        _finish_live_playback(episode, live_dir)
+        live_dir = None
         episode.published_at = timezone.now()
         episode.save()
 
+        if checkpoint:
+            checkpoint.clear()
+
         # Update show statistics if show exists
         if show:
             show.episodes_count = show.episodes.filter(status='published').count()
@@ -334,6 +485,7 @@ def generate_debate_audio_task(episode_id, show_id=None, voice_config=None):
     except Exception as e:
         print(f"Failed to generate debate audio for episode {episode_id}: {e}")
         if episode:
+            _finish_live_playback(episode, live_dir)
             episode.status = 'failed'
             episode.save()
         raise
@@ -345,8 +497,9 @@ def generate_debate_followup_task(episode_id, topic, mode='debate'):
     在现有辩论上继续生成一轮（用于用户插话后的群聊推进）。
     只生成一条AI回复来回应用户消息。
     """
-    from .models import Episode
-    from .services.conversation import ConversationManager, _build_script_from_dialogue
+    from .models import DialogueEntry, Episode
+    from .services.conversation import _build_script_from_dialogue, stream_chat_completion
+    from .services.debate_events import DeltaPublisher, publish_debate_event
     from .services.participants import get_participants_by_mode
     from openai import OpenAI
     from django.conf import settings
@@ -372,7 +525,7 @@ def generate_debate_followup_task(episode_id, topic, mode='debate'):
             episode.save(update_fields=['participants_config', 'updated_at'])
 
         # 加载现有对话
-        dialogue_entries = [dict(item) for item in (episode.dialogue or [])]
+        dialogue_entries = DialogueEntry.entries_after(episode_id)
 
         # 确定下一发言人（轮询：judge -> llm1 -> llm2 -> judge）
         participant_order = ['judge', 'llm1', 'llm2'] if mode == 'debate' else ['tutor', 'student1', 'student2']
@@ -408,7 +561,11 @@ def generate_debate_followup_task(episode_id, topic, mode='debate'):
         )
         model = getattr(settings, 'OPENAI_MODEL', 'moonshot-v1-8k')
 
-        response = client.chat.completions.create(
+        # 流式生成，回复内容以 delta 事件实时推送给观看者
+        deltas = DeltaPublisher(episode_id)
+        content = stream_chat_completion(
+            client,
+            lambda text: deltas(next_speaker_id, text),
             model=model,
             messages=[
                 {"role": "system", "content": next_speaker.system_prompt},
@@ -418,23 +575,23 @@ def generate_debate_followup_task(episode_id, topic, mode='debate'):
             max_tokens=500
         )
 
-        content = response.choices[0].message.content.strip()
-
         # 添加AI回复到对话
-        new_entry = {
+        new_entry = deltas.finish({
             'participant': next_speaker_id,
             'role': next_speaker.role,
             'content': content,
             'timestamp': timezone.now().isoformat()
-        }
-        dialogue_entries.append(new_entry)
+        })
+        row = DialogueEntry.append(episode_id, new_entry)
+        publish_debate_event(episode_id, 'dialogue', new_entry, index=row.seq)
 
-        # 更新episode
-        episode.dialogue = dialogue_entries
-        episode.script = _build_script_from_dialogue(dialogue_entries, participants)
+        # 更新episode（物化完整对话，包含生成期间追加的插话）
+        episode.dialogue = DialogueEntry.entries_after(episode_id)
+        episode.script = _build_script_from_dialogue(episode.dialogue, participants)
         episode.status = 'published'
         episode.published_at = timezone.now()
         episode.save(update_fields=['dialogue', 'script', 'status', 'published_at', 'updated_at'])
+        publish_debate_event(episode_id, 'complete', {'status': 'published', 'total': len(episode.dialogue)})
 
         return f"Debate followup {episode_id} generated successfully"
 
@@ -444,6 +601,7 @@ def generate_debate_followup_task(episode_id, topic, mode='debate'):
             episode.status = 'failed'
             episode.generation_error = str(e)[:1000]
             episode.save(update_fields=['status', 'generation_error', 'updated_at'])
+            publish_debate_event(episode_id, 'stream_error', {'error': episode.generation_error or '生成失败'})
         raise
 
 
@@ -454,7 +612,7 @@ async def stream_debate_response(episode_id: int, room_group_name: str):
     """
     import asyncio
     from channels.layers import get_channel_layer
-    from .models import Episode
+    from .models import DialogueEntry, Episode
     from .services.conversation import ConversationManager
     from .services.participants import get_participants_by_mode
 
@@ -483,10 +641,31 @@ async def stream_debate_response(episode_id: int, room_group_name: str):
             policy='unified_ratio',
             rounds=1
         )
-        manager.set_dialogue_log(list(episode.dialogue or []))
+        manager.set_dialogue_log(await DialogueEntry.aentries_after(episode_id))
+
+        async def send_chunk(participant_id, text):
+            await channel_layer.group_send(
+                room_group_name,
+                {
+                    'type': 'dialogue_chunk',
+                    'participant': participant_id,
+                    'content': text,
+                    'is_complete': False
+                }
+            )
 
-        # Stream dialogue entries
-        for entry in manager.generate_dialogue(topic):
+        # Stream dialogue entries; tokens arrive as coalesced dialogue_chunk messages.
+        # AsyncOpenAI keeps the event loop free while the model generates.
+        async for entry in manager.agenerate_dialogue(topic, on_chunk=send_chunk):
+            await channel_layer.group_send(
+                room_group_name,
+                {
+                    'type': 'dialogue_chunk',
+                    'participant': entry.get('participant'),
+                    'content': '',
+                    'is_complete': True
+                }
+            )
             await channel_layer.group_send(
                 room_group_name,
                 {
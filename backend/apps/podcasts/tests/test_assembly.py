@@ -0,0 +1,116 @@
+import os
+import shutil
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+from pydub import AudioSegment
+
+from apps.podcasts.services.assembly import PCMAssembler, apply_peak_normalization
+from apps.podcasts.services.generator import PodcastGenerator
+
+
+class PCMAssemblerTests(SimpleTestCase):
+    def test_layout_places_gaps_as_zero_filled_silence(self):
+        assembler = PCMAssembler(sample_rate=1000)
+        assembler.add(np.full(100, 1000, dtype=np.int16))
+        assembler.add(np.full(50, -1000, dtype=np.int16).tobytes(), gap_ms=30)
+
+        self.assertEqual(assembler.layout(), [(0, 100), (130, 180)])
+        pcm = assembler.render()
+        self.assertEqual(pcm.dtype, np.int16)
+        self.assertEqual(len(pcm), 180)
+        self.assertTrue((pcm[:100] == 1000).all())
+        self.assertTrue((pcm[100:130] == 0).all())
+        self.assertTrue((pcm[130:] == -1000).all())
+
+    def test_crossfade_overlaps_adjacent_segments(self):
+        assembler = PCMAssembler(sample_rate=1000, crossfade_ms=20)
+        assembler.add(np.full(100, 1000, dtype=np.int16))
+        assembler.add(np.full(100, 3000, dtype=np.int16))
+        assembler.add(np.full(10, 500, dtype=np.int16), crossfade=False)
+
+        self.assertEqual(assembler.layout(), [(0, 100), (80, 180), (180, 190)])
+        pcm = assembler.render()
+        self.assertEqual(len(pcm), 190)
+        self.assertEqual(pcm[80], 1000)
+        self.assertEqual(pcm[99], 3000)
+        self.assertTrue((np.diff(pcm[80:100].astype(np.int32)) >= 0).all())
+        self.assertTrue((pcm[180:] == 500).all())
+
+    def test_crossfade_is_limited_by_shorter_segment(self):
+        assembler = PCMAssembler(sample_rate=1000, crossfade_ms=50)
+        assembler.add(np.ones(10, dtype=np.int16))
+        assembler.add(np.ones(100, dtype=np.int16))
+
+        self.assertEqual(assembler.layout(), [(0, 10), (0, 100)])
+
+    def test_stereo_layout_counts_frames(self):
+        assembler = PCMAssembler(sample_rate=1000, channels=2)
+        assembler.add(np.ones(20, dtype=np.int16))
+        assembler.add(np.ones(20, dtype=np.int16), gap_ms=5)
+
+        self.assertEqual(assembler.layout(), [(0, 10), (15, 25)])
+        self.assertEqual(len(assembler.render()), 50)
+
+    def test_peak_normalization_matches_headroom(self):
+        samples = np.array([0, 1000, -4000, 2000], dtype=np.int16)
+
+        gain = apply_peak_normalization(samples, headroom_db=0.1)
+
+        target = 32767 * 10 ** (-0.1 / 20)
+        self.assertAlmostEqual(gain, target / 4000)
+        self.assertAlmostEqual(abs(int(samples[2])), target, delta=1)
+        self.assertEqual(samples[0], 0)
+        self.assertEqual(apply_peak_normalization(np.zeros(4, dtype=np.int16)), 1.0)
+
+
+@skipUnless(shutil.which(AudioSegment.converter), "ffmpeg is required for MP3 encoding")
+class GeneratorBufferAssemblyTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+    def test_buffer_mode_matches_stream_timings(self):
+        async def fake_synthesize(config, text, logger=None, **kwargs):
+            return config.sample_rate, bytearray(np.full(config.sample_rate, 100, dtype=np.int16).tobytes())
+
+        script = "【大牛】第一句\n【一帆】第二句\n【一帆】第三句"
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(
+                BASE_DIR=tmpdir,
+                MINIMAX_TTS={
+                    "api_key": "test-key",
+                    "enable_vocal_logo": False,
+                    "silence_min_ms": 500,
+                    "silence_max_ms": 500,
+                    "assembly_mode": "buffer",
+                    "crossfade_ms": 100,
+                },
+            ):
+                generator = PodcastGenerator()
+                output_path = os.path.join(tmpdir, "episode.mp3")
+                progress = []
+                with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=fake_synthesize):
+                    result = generator.generate(
+                        script, output_path, on_progress=lambda completed, total: progress.append((completed, total))
+                    )
+
+            # Three 1s segments, one 500ms turn silence, one 100ms same-speaker crossfade
+            self.assertAlmostEqual(result.duration_seconds, 3.4)
+            self.assertEqual(result.file_size, os.path.getsize(output_path))
+            self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+            self.assertEqual(
+                [(timing.speaker, timing.start_ms, timing.end_ms) for timing in result.segments],
+                [("daniu", 0, 1000), ("yifan", 1500, 2500), ("yifan", 2400, 3400)],
+            )
+
+    def test_rejects_unknown_assembly_mode(self):
+        with override_settings(MINIMAX_TTS={"api_key": "test-key", "assembly_mode": "pydub"}):
+            with self.assertRaises(ValueError):
+                PodcastGenerator()
@@ -0,0 +1,131 @@
+import os
+import shutil
+import threading
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+from unittest.mock import patch
+
+import numpy as np
+from django.test import TestCase, override_settings
+from pydub import AudioSegment
+
+from apps.podcasts.services.audio_encoder import LiveHLSWriter, StreamingMP3Encoder, playable_seconds
+from apps.podcasts.services.generator import PodcastGenerator
+
+HAS_FFMPEG = shutil.which(AudioSegment.converter) is not None
+
+
+@skipUnless(HAS_FFMPEG, "ffmpeg is required for MP3 encoding")
+class StreamingMP3EncoderTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+    def test_writes_pcm_and_silence(self):
+        with TemporaryDirectory() as tmpdir:
+            output_path = os.path.join(tmpdir, "nested", "out.mp3")
+            with StreamingMP3Encoder(output_path, sample_rate=32000, channels=1) as encoder:
+                encoder.write(np.zeros(32000, dtype=np.int16).tobytes())
+                encoder.write_silence(500)
+
+            self.assertAlmostEqual(encoder.duration_seconds, 1.5)
+            self.assertGreater(os.path.getsize(output_path), 0)
+            self.assertEqual(os.listdir(os.path.dirname(output_path)), ["out.mp3"])
+
+    def test_failure_discards_partial_output(self):
+        with TemporaryDirectory() as tmpdir:
+            output_path = os.path.join(tmpdir, "out.mp3")
+            with self.assertRaises(RuntimeError):
+                with StreamingMP3Encoder(output_path, sample_rate=32000) as encoder:
+                    encoder.write(bytes(6400))
+                    raise RuntimeError("synthesis failed")
+
+            self.assertEqual(os.listdir(tmpdir), [])
+
+    def test_live_hls_writer_grows_playlist(self):
+        with TemporaryDirectory() as tmpdir:
+            live_dir = os.path.join(tmpdir, "live")
+            with LiveHLSWriter(live_dir, sample_rate=32000, segment_seconds=1) as live:
+                live.write(np.zeros(32000 * 3, dtype=np.int16))
+
+            with open(live.output_path) as fh:
+                playlist = fh.read()
+            self.assertIn("#EXT-X-PLAYLIST-TYPE:EVENT", playlist)
+            self.assertIn("#EXT-X-ENDLIST", playlist)
+            self.assertAlmostEqual(playable_seconds(live.output_path), 3.0, delta=0.1)
+            self.assertEqual(playable_seconds(os.path.join(tmpdir, "missing.m3u8")), 0.0)
+
+    def test_generator_streams_segments_and_silences(self):
+        async def fake_synthesize(config, text, logger=None, **kwargs):
+            return config.sample_rate, bytearray(config.sample_rate * 2)
+
+        script = "【大牛】第一句\n【一帆】第二句\n【一帆】第三句"
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(
+                BASE_DIR=tmpdir,
+                MINIMAX_TTS={
+                    "api_key": "test-key",
+                    "enable_vocal_logo": False,
+                    "silence_min_ms": 500,
+                    "silence_max_ms": 500,
+                },
+            ):
+                generator = PodcastGenerator()
+                output_path = os.path.join(tmpdir, "episode.mp3")
+                with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=fake_synthesize):
+                    progress = []
+                    result = generator.generate(
+                        script,
+                        output_path,
+                        on_progress=lambda completed, total: progress.append((completed, total)),
+                        live_dir=os.path.join(tmpdir, "live"),
+                    )
+
+            # Three 1s segments plus one 500ms speaker-change silence
+            self.assertAlmostEqual(result.duration_seconds, 3.5)
+            self.assertEqual(result.sample_count, 3.5 * 32000)
+            self.assertEqual(result.file_size, os.path.getsize(output_path))
+            self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+            self.assertEqual(
+                [(timing.speaker, timing.start_ms, timing.end_ms) for timing in result.segments],
+                [("daniu", 0, 1000), ("yifan", 1500, 2500), ("yifan", 2500, 3500)],
+            )
+            # The live HLS mirror carries the same audio
+            self.assertAlmostEqual(playable_seconds(os.path.join(tmpdir, "live", "index.m3u8")), 3.5, delta=0.1)
+
+    def test_generator_writes_logos_and_silences_off_the_event_loop(self):
+        async def fake_synthesize(config, text, logger=None, **kwargs):
+            return config.sample_rate, bytearray(config.sample_rate * 2)
+
+        loop_thread = threading.current_thread()
+        writers = []
+        encoder_write = StreamingMP3Encoder.write
+
+        def record_write(encoder, pcm):
+            writers.append(("hls" if isinstance(encoder, LiveHLSWriter) else "mp3", threading.current_thread()))
+            return encoder_write(encoder, pcm)
+
+        logo = bytes(3200)
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(
+                BASE_DIR=tmpdir,
+                MINIMAX_TTS={"api_key": "test-key", "silence_min_ms": 500, "silence_max_ms": 500},
+            ):
+                generator = PodcastGenerator()
+                with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=fake_synthesize), \
+                        patch("apps.podcasts.services.generator._load_vocal_logos", return_value=(logo, logo)), \
+                        patch.object(StreamingMP3Encoder, "write", record_write):
+                    result = generator.generate(
+                        "【大牛】第一句\n【一帆】第二句",
+                        os.path.join(tmpdir, "episode.mp3"),
+                        live_dir=os.path.join(tmpdir, "live"),
+                    )
+
+        # Start logo, two segments, one silence and the end logo, mirrored to HLS
+        self.assertAlmostEqual(result.duration_seconds, 2.6)
+        self.assertEqual([kind for kind, _ in writers].count("mp3"), 5)
+        self.assertEqual([kind for kind, _ in writers].count("hls"), 5)
+        self.assertNotIn(loop_thread, [thread for _, thread in writers])
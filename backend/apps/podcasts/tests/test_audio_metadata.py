@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import subprocess
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+from unittest.mock import MagicMock, patch
+
+import redis
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from pydub import AudioSegment
+
+from utils import audio_metadata
+from utils.audio_metadata import AudioMetadataError, get_audio_metadata, probe_audio
+from utils.audio_processor import get_audio_duration, validate_audio_file
+
+HAS_FFMPEG = shutil.which(AudioSegment.converter) is not None
+
+
+class ProbeAudioTests(SimpleTestCase):
+    def test_parses_ffprobe_json(self):
+        payload = {
+            "streams": [
+                {"codec_type": "video", "codec_name": "h264"},
+                {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2, "bit_rate": "128000"},
+            ],
+            "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": "125.48", "bit_rate": "900000"},
+        }
+        completed = subprocess.CompletedProcess([], 0, stdout=json.dumps(payload), stderr="")
+
+        with patch("utils.audio_metadata.shutil.which", return_value="/usr/bin/ffprobe"), \
+                patch("utils.audio_metadata.subprocess.run", return_value=completed) as run:
+            info = probe_audio("/tmp/episode.m4a")
+
+        self.assertEqual(run.call_args.args[0][0], "/usr/bin/ffprobe")
+        self.assertEqual(info["duration"], 125.48)
+        self.assertEqual((info["audio_streams"], info["video_streams"]), (1, 1))
+        self.assertEqual((info["codec"], info["bitrate"], info["sample_rate"], info["channels"]), ("aac", 128000, 48000, 2))
+
+
+@skipUnless(HAS_FFMPEG, "ffmpeg is required to probe audio")
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "audio_metadata": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "audio-metadata-tests"},
+})
+class AudioMetadataCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches["audio_metadata"].clear()
+
+    def make_mp3(self, path, seconds):
+        subprocess.run([
+            AudioSegment.converter, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+            "-c:a", "libmp3lame", "-b:a", "64k", path,
+        ], check=True)
+
+    def test_reads_header_fields(self):
+        with TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tone.mp3")
+            self.make_mp3(path, 2)
+
+            info = get_audio_metadata(path)
+
+        self.assertAlmostEqual(info["duration"], 2.0, delta=0.1)
+        self.assertEqual((info["codec"], info["sample_rate"], info["channels"]), ("mp3", 44100, 1))
+        self.assertEqual(info["bitrate"], 64000)
+
+    def test_cached_until_file_changes(self):
+        with TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tone.mp3")
+            self.make_mp3(path, 2)
+            self.assertEqual(get_audio_duration(path), 2)
+
+            with patch("utils.audio_metadata.probe_audio") as probe:
+                self.assertEqual(get_audio_duration(path), 2)
+                self.assertTrue(validate_audio_file(path)["valid"])
+            probe.assert_not_called()
+
+            self.make_mp3(path, 4)
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+            self.assertEqual(get_audio_duration(path), 4)
+
+    def test_missing_file(self):
+        with self.assertRaises(AudioMetadataError):
+            get_audio_metadata("/nonexistent/episode.mp3")
+
+    def test_probes_directly_while_redis_is_down(self):
+        shared = MagicMock()
+        shared.get.side_effect = redis.ConnectionError("refused")
+        self.addCleanup(setattr, audio_metadata, "_cache_retry_at", 0.0)
+
+        with TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tone.mp3")
+            self.make_mp3(path, 2)
+            with patch.object(audio_metadata, "caches", {"audio_metadata": shared}):
+                self.assertEqual(get_audio_duration(path), 2)
+                self.assertEqual(get_audio_duration(path), 2)
+
+        # 失败后进入冷却期，不再反复连接 Redis
+        shared.get.assert_called_once()
+        shared.set.assert_not_called()
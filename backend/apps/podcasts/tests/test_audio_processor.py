@@ -0,0 +1,79 @@
+import os
+import shutil
+import subprocess
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, override_settings
+from pydub import AudioSegment
+
+from utils import audio_processor
+from utils.audio_metadata import probe_audio
+from utils.audio_processor import process_audio, processing_slot, validate_audio_file
+
+HAS_FFMPEG = shutil.which(AudioSegment.converter) is not None
+
+
+def make_tone(path, *, seconds=3, volume=0.05, video=False):
+    command = [AudioSegment.converter, "-hide_banner", "-loglevel", "error", "-y",
+               "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds},volume={volume}"]
+    if video:
+        command += ["-f", "lavfi", "-i", f"color=c=black:s=32x32:d={seconds}", "-shortest"]
+    subprocess.run(command + [path], check=True)
+
+
+@skipUnless(HAS_FFMPEG, "ffmpeg is required for audio processing")
+@override_settings(AUDIO_PROCESSING={"max_jobs": 0})
+class ProcessAudioTests(SimpleTestCase):
+    def test_normalizes_and_transcodes_to_mp3(self):
+        with TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, "quiet.wav")
+            make_tone(input_path)
+
+            result = process_audio(input_path)
+
+            self.assertTrue(result["success"], result.get("error"))
+            self.assertEqual(result["output_path"], os.path.join(tmpdir, "quiet_processed.mp3"))
+            self.assertEqual(result["duration"], 3)
+            self.assertEqual(result["file_size"], os.path.getsize(result["output_path"]))
+            self.assertNotIn("quiet_processed.mp3.part", os.listdir(tmpdir))
+
+            measured = audio_processor.measure_loudness(result["output_path"])
+            self.assertAlmostEqual(float(measured["input_i"]), -16.0, delta=1.5)
+
+    def test_extracts_audio_from_video(self):
+        with TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, "clip.mp4")
+            make_tone(input_path, video=True)
+
+            info = probe_audio(input_path)
+            self.assertEqual((info["audio_streams"], info["video_streams"]), (1, 1))
+            self.assertEqual(info["sample_rate"], 44100)
+
+            result = process_audio(input_path, os.path.join(tmpdir, "out.mp3"))
+            self.assertTrue(result["success"], result.get("error"))
+            self.assertEqual(probe_audio(result["output_path"])["video_streams"], 0)
+
+    def test_rejects_files_without_audio(self):
+        with TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, "notes.mp3")
+            with open(input_path, "wb") as handle:
+                handle.write(b"not audio at all")
+
+            self.assertFalse(process_audio(input_path)["success"])
+            self.assertFalse(validate_audio_file(input_path)["valid"])
+            self.assertEqual(os.listdir(tmpdir), ["notes.mp3"])
+
+
+class ProcessingSlotTests(SimpleTestCase):
+    @skipUnless(audio_processor.fcntl, "slot limiting needs fcntl")
+    def test_processing_slots_are_bounded(self):
+        fcntl = audio_processor.fcntl
+        with TemporaryDirectory() as tmpdir:
+            with processing_slot(max_jobs=1, slot_dir=tmpdir):
+                with open(os.path.join(tmpdir, "slot-0.lock"), "a") as handle:
+                    with self.assertRaises(BlockingIOError):
+                        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+            with open(os.path.join(tmpdir, "slot-0.lock"), "a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
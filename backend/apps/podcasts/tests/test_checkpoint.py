@@ -0,0 +1,72 @@
+import asyncio
+import os
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.podcasts.services.checkpoint import GenerationCheckpoint
+from apps.podcasts.services.generator import PodcastGenerator
+from apps.podcasts.services.minimax_client import MiniMaxError, MiniMaxVoiceConfig
+
+
+async def _collect(segments):
+    return [item async for item in segments]
+
+
+class GenerationCheckpointTests(SimpleTestCase):
+    def setUp(self):
+        self.config = MiniMaxVoiceConfig(api_key="key", voice_id="voice-a")
+
+    def test_for_episode_uses_setting(self):
+        self.assertIsNone(GenerationCheckpoint.for_episode(7, {"checkpoint_dir": ""}))
+        checkpoint = GenerationCheckpoint.for_episode(7, {"checkpoint_dir": "/tmp/work"})
+        self.assertEqual(checkpoint.work_dir, os.path.join("/tmp/work", "episode-7"))
+
+    def test_segments_only_restore_for_same_text_and_voice(self):
+        with TemporaryDirectory() as tmpdir:
+            checkpoint = GenerationCheckpoint(os.path.join(tmpdir, "episode-1"))
+            checkpoint.save(3, self.config, "你好", b"\x01\x00")
+
+            self.assertEqual(checkpoint.load(3, self.config, "你好"), b"\x01\x00")
+            self.assertIsNone(checkpoint.load(3, self.config, "改过的"))
+            self.assertIsNone(checkpoint.load(4, self.config, "你好"))
+            other_voice = MiniMaxVoiceConfig(api_key="key", voice_id="voice-b")
+            self.assertIsNone(checkpoint.load(3, other_voice, "你好"))
+            self.assertEqual(checkpoint.restored, 1)
+            self.assertEqual(checkpoint.completed_indexes(), {3})
+
+            checkpoint.clear()
+            self.assertFalse(os.path.exists(checkpoint.work_dir))
+
+    @override_settings(MINIMAX_TTS={"api_key": "test-key", "segment_cache_max_mb": 0, "synthesis_concurrency": 1})
+    def test_retry_resumes_from_first_missing_segment(self):
+        generator = PodcastGenerator()
+        segments = [("daniu", f"第{i}句") for i in range(5)]
+        synthesized = []
+        fail_on = {"第3句"}
+
+        async def fake_synthesize(config, text, logger=None, **kwargs):
+            if text in fail_on:
+                raise MiniMaxError("boom")
+            synthesized.append(text)
+            return config.sample_rate, bytearray(4)
+
+        with TemporaryDirectory() as tmpdir:
+            checkpoint = GenerationCheckpoint(tmpdir)
+            with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=fake_synthesize):
+                with self.assertRaises(MiniMaxError):
+                    asyncio.run(_collect(generator._generate_all_segments(
+                        segments, voice_configs=generator.voice_configs, checkpoint=checkpoint,
+                    )))
+                self.assertEqual(checkpoint.completed_indexes(), {1, 2, 3})
+
+                fail_on.clear()
+                synthesized.clear()
+                results = asyncio.run(_collect(generator._generate_all_segments(
+                    segments, voice_configs=generator.voice_configs, checkpoint=checkpoint,
+                )))
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(synthesized, ["第3句", "第4句"])
+        self.assertEqual(checkpoint.restored, 3)
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.podcasts.models import Episode, EpisodeUpload, Show
+from apps.users.models import User
+
+
+class ChunkedUploadAPITests(APITestCase):
+    def setUp(self):
+        self.media = TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name, AUDIO_UPLOAD_CHUNK_MAX_SIZE=4)
+        self.settings_override.enable()
+
+        self.user = User.objects.create_user(
+            username='uploader',
+            email='uploader@example.com',
+            password='test-pass-123',
+            is_creator=True,
+        )
+        self.show = Show.objects.create(
+            title='Upload Show',
+            description='desc',
+            cover=SimpleUploadedFile('cover.jpg', b'c', content_type='image/jpeg'),
+            creator=self.user,
+        )
+        self.client.force_authenticate(self.user)
+        self.content = b'0123456789'
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def start(self, **overrides):
+        payload = {
+            'filename': 'talk.mp3',
+            'size': len(self.content),
+            'sha256': hashlib.sha256(self.content).hexdigest(),
+            'show_id': self.show.id,
+            'title': '分片上传',
+            'description': '测试',
+            **overrides,
+        }
+        return self.client.post('/api/podcasts/episode-uploads/', payload, format='json')
+
+    def put_chunk(self, upload_id, offset, data, **headers):
+        return self.client.put(
+            f'/api/podcasts/episode-uploads/{upload_id}/chunk/',
+            data=data,
+            content_type='application/octet-stream',
+            headers={'Upload-Offset': str(offset), **headers},
+        )
+
+    def test_resumable_upload_creates_episode(self):
+        response = self.start()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        upload_id = response.data['id']
+        self.assertEqual(response.data['chunk_max_size'], 4)
+
+        self.assertEqual(self.put_chunk(upload_id, 0, self.content[:4]).data['received_size'], 4)
+        # A resent chunk at a stale offset is refused with the offset to resume from
+        stale = self.put_chunk(upload_id, 0, self.content[:4])
+        self.assertEqual(stale.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(stale.data['received_size'], 4)
+
+        corrupt = self.put_chunk(upload_id, 4, b'xxxx', **{'X-Chunk-SHA256': hashlib.sha256(b'4567').hexdigest()})
+        self.assertEqual(corrupt.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(f'/api/podcasts/episode-uploads/{upload_id}/').data['received_size'], 4)
+
+        self.put_chunk(upload_id, 4, self.content[4:8], **{'X-Chunk-SHA256': hashlib.sha256(b'4567').hexdigest()})
+        self.assertEqual(
+            self.put_chunk(upload_id, 8, self.content[8:]).data['received_size'], len(self.content)
+        )
+
+        with patch('apps.podcasts.tasks.process_episode_audio.delay') as delay, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/podcasts/episode-uploads/{upload_id}/complete/')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        episode = Episode.objects.get(id=response.data['episode_id'])
+        delay.assert_called_once_with(episode.id)
+        self.assertEqual(episode.status, 'processing')
+        self.assertEqual(episode.show, self.show)
+        upload = EpisodeUpload.objects.get(id=upload_id)
+        self.assertEqual(episode.audio_file.name, upload.file_path)
+        with open(episode.audio_file.path, 'rb') as handle:
+            self.assertEqual(handle.read(), self.content)
+
+    def test_rejects_oversized_chunks_and_incomplete_completion(self):
+        upload_id = self.start().data['id']
+
+        self.assertEqual(
+            self.put_chunk(upload_id, 0, self.content[:5]).status_code,
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        self.assertEqual(
+            self.client.post(f'/api/podcasts/episode-uploads/{upload_id}/complete/').status_code,
+            status.HTTP_409_CONFLICT,
+        )
+
+    def test_checksum_mismatch_blocks_completion(self):
+        upload_id = self.start(sha256='0' * 64).data['id']
+        for offset in range(0, len(self.content), 4):
+            self.put_chunk(upload_id, offset, self.content[offset:offset + 4])
+
+        response = self.client.post(f'/api/podcasts/episode-uploads/{upload_id}/complete/')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['received_size'], 0)
+        self.assertFalse(Episode.objects.exists())
+
+        # 校验失败后从头重新上传
+        path = os.path.join(self.media.name, EpisodeUpload.objects.get(id=upload_id).file_path)
+        self.assertEqual(os.path.getsize(path), 0)
+        self.assertEqual(self.put_chunk(upload_id, 0, self.content[:4]).status_code, status.HTTP_200_OK)
+
+    def test_validates_file_and_episode_fields_up_front(self):
+        self.assertEqual(self.start(filename='talk.exe').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.start(size=600 * 1024 * 1024).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.start(title='').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(EpisodeUpload.objects.exists())
+
+    def test_abort_removes_partial_file(self):
+        upload_id = self.start().data['id']
+        self.put_chunk(upload_id, 0, self.content[:4])
+        path = os.path.join(self.media.name, EpisodeUpload.objects.get(id=upload_id).file_path)
+        self.assertTrue(os.path.exists(path))
+
+        response = self.client.delete(f'/api/podcasts/episode-uploads/{upload_id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(os.path.exists(path))
+
+    def test_stale_uploads_are_cleaned_up(self):
+        from apps.podcasts.tasks import cleanup_stale_uploads_task
+
+        stale_id = self.start().data['id']
+        fresh_id = self.start().data['id']
+        self.put_chunk(stale_id, 0, self.content[:4])
+        stale_path = os.path.join(self.media.name, EpisodeUpload.objects.get(id=stale_id).file_path)
+        EpisodeUpload.objects.filter(id=stale_id).update(updated_at=timezone.now() - timedelta(hours=25))
+
+        cleanup_stale_uploads_task()
+
+        self.assertFalse(os.path.exists(stale_path))
+        self.assertEqual(list(EpisodeUpload.objects.values_list('id', flat=True)), [uuid.UUID(fresh_id)])
+
+    def test_uploads_are_private(self):
+        upload_id = self.start().data['id']
+        other = User.objects.create_user(username='other', email='other@example.com', password='test-pass-123')
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self.put_chunk(upload_id, 0, b'0123').status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,176 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from apps.podcasts.models import DialogueEntry, Episode
+from apps.podcasts.services import conversation, debate_events
+from apps.podcasts.services.conversation import ConversationManager, stream_chat_completion
+from apps.podcasts.services.participants import get_participants_by_mode
+
+
+def stream_events(*texts):
+    return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]) for text in texts]
+
+
+def fake_client(*texts):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = lambda **params: stream_events(*texts)
+    return client
+
+
+def fake_async_client(*texts):
+    async def events():
+        for event in stream_events(*texts):
+            yield event
+
+    async def create(**params):
+        return events()
+
+    client = MagicMock()
+    client.chat.completions.create.side_effect = create
+    return client
+
+
+class StreamChatCompletionTests(SimpleTestCase):
+    def test_coalesces_tokens_within_flush_interval(self):
+        client = fake_client(' 我', '认为', None, '可以', '。')
+        chunks = []
+        # 第一个 token 立即推送，其后 0.01s 内的 token 合并，0.2s 时再推送一次
+        clock = iter([1.0, 1.01, 1.02, 1.2])
+
+        with patch.object(conversation.time, 'monotonic', side_effect=lambda: next(clock)):
+            content = stream_chat_completion(client, chunks.append, flush_interval=0.05, model='m', messages=[])
+
+        self.assertEqual(content, '我认为可以。')
+        self.assertEqual(chunks, [' 我', '认为可以。'])
+        self.assertTrue(client.chat.completions.create.call_args.kwargs['stream'])
+
+    def test_without_callback_uses_plain_completion(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=' 完整回复 '))]
+        )
+
+        self.assertEqual(stream_chat_completion(client, model='m', messages=[]), '完整回复')
+        self.assertNotIn('stream', client.chat.completions.create.call_args.kwargs)
+
+
+@override_settings(OPENAI_API_KEY='test-key')
+class ConversationStreamingTests(SimpleTestCase):
+    def test_turns_stream_chunks_with_participant(self):
+        manager = ConversationManager(get_participants_by_mode('debate'), rounds=1)
+        manager.client = fake_client('观点', '一')
+        chunks = []
+
+        entries = list(manager.generate_dialogue('AI', on_chunk=lambda pid, text: chunks.append((pid, text))))
+
+        self.assertEqual(len(entries), 4)
+        self.assertEqual(entries[0]['content'], '观点一')
+        self.assertEqual(chunks[0], (entries[0]['participant'], '观点'))
+
+
+    async def test_async_path_uses_async_client(self):
+        participants = get_participants_by_mode('conference')
+        manager = ConversationManager(participants, policy='unified_ratio', rounds=1)
+        manager._async_client = fake_async_client('我的', '看法')
+        manager.client = MagicMock()
+        manager.client.chat.completions.create.side_effect = AssertionError('blocking call on the event loop')
+        chunks = []
+
+        async def on_chunk(participant_id, text):
+            chunks.append((participant_id, text))
+
+        entries = [entry async for entry in manager.agenerate_dialogue('AI', on_chunk=on_chunk)]
+
+        self.assertEqual(len(entries), 3)
+        self.assertEqual({entry['content'] for entry in entries}, {'我的看法'})
+        self.assertEqual([pid for pid, _text in chunks[::2]], [entry['participant'] for entry in entries])
+        self.assertEqual(manager.dialogue_log, entries)
+
+
+class DeltaPublisherTests(SimpleTestCase):
+    def test_publishes_accumulated_text_for_turn(self):
+        with patch.object(debate_events, 'publish_debate_event') as publish:
+            deltas = debate_events.DeltaPublisher(5)
+            deltas('llm1', '正方')
+            deltas('llm1', '观点')
+            first = deltas.finish({'participant': 'llm1', 'content': '正方观点'})
+            deltas.advance()
+            deltas('llm2', '反方')
+
+        payloads = [call.args[2] for call in publish.call_args_list]
+        self.assertEqual(payloads[:2], [
+            {'turnId': first['turnId'], 'participant': 'llm1', 'content': '正方'},
+            {'turnId': first['turnId'], 'participant': 'llm1', 'content': '正方观点'},
+        ])
+        self.assertEqual(payloads[2]['content'], '反方')
+        self.assertNotEqual(payloads[2]['turnId'], first['turnId'])
+        self.assertEqual({call.args[1] for call in publish.call_args_list}, {'delta'})
+
+
+@override_settings(OPENAI_API_KEY='test-key')
+class DebateFollowupStreamingTests(TestCase):
+    def test_human_message_during_stream_keeps_its_seq(self):
+        from apps.podcasts.tasks import generate_debate_followup_task
+
+        episode = Episode.objects.create(title='辩论', description='desc', mode='debate', status='processing')
+        DialogueEntry.append(episode.id, {'participant': 'user', 'content': '我反对'})
+
+        def events(**params):
+            yield from stream_events('正方')
+            # 回复生成到一半时观众插话，占用下一个序号
+            DialogueEntry.append(episode.id, {'participant': 'user', 'content': '再补充一句'})
+            yield from stream_events('观点')
+
+        client = MagicMock()
+        client.chat.completions.create.side_effect = events
+        with patch('openai.OpenAI', return_value=client), \
+                patch.object(debate_events, 'publish_debate_event') as publish:
+            generate_debate_followup_task(episode.id, 'AI', 'debate')
+
+        rows = list(DialogueEntry.objects.filter(episode=episode).values_list('seq', 'participant', 'content'))
+        self.assertEqual(rows, [(0, 'user', '我反对'), (1, 'user', '再补充一句'), (2, 'llm1', '正方观点')])
+
+        deltas = [call.args[2] for call in publish.call_args_list if call.args[1] == 'delta']
+        dialogue = [call for call in publish.call_args_list if call.args[1] == 'dialogue']
+        self.assertEqual(len(dialogue), 1)
+        self.assertEqual(dialogue[0].kwargs['index'], 2)
+        self.assertNotIn('index', deltas[0])
+        self.assertEqual({delta['turnId'] for delta in deltas}, {dialogue[0].args[2]['turnId']})
+
+
+@override_settings(
+    OPENAI_API_KEY='test-key',
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+)
+class StreamDebateResponseTests(TransactionTestCase):
+    async def test_sends_chunks_before_entry(self):
+        from channels.layers import get_channel_layer
+
+        from apps.podcasts.tasks import stream_debate_response
+
+        episode = await Episode.objects.acreate(
+            title='辩论', description='desc', mode='debate', generation_meta={'topic': 'AI'}
+        )
+        layer = get_channel_layer()
+        channel = await layer.new_channel()
+        await layer.group_add('debate_test', channel)
+
+        with patch.object(ConversationManager, '__init__', return_value=None), \
+                patch.object(ConversationManager, 'set_dialogue_log'), \
+                patch.object(ConversationManager, 'agenerate_dialogue', fake_agenerate_dialogue):
+            await stream_debate_response(episode.id, 'debate_test')
+
+        messages = [await layer.receive(channel) for _ in range(5)]
+        self.assertEqual([message['type'] for message in messages], [
+            'status_update', 'dialogue_chunk', 'dialogue_chunk', 'dialogue_entry', 'status_update',
+        ])
+        self.assertEqual(messages[1]['content'], '你好')
+        self.assertTrue(messages[2]['is_complete'])
+        self.assertEqual(messages[3]['entry']['content'], '你好')
+
+
+async def fake_agenerate_dialogue(self, topic, on_chunk=None):
+    await on_chunk('judge', '你好')
+    yield {'participant': 'judge', 'role': '主持人', 'content': '你好', 'timestamp': '2026-01-01T00:00:00'}
@@ -0,0 +1,182 @@
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.podcasts.models import DialogueEntry, Episode
+from apps.podcasts.services import debate_events
+from apps.users.models import User
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.closed = False
+
+    def get_message(self, timeout=0.0):
+        if not self.messages:
+            return None
+        payload = self.messages.pop(0)
+        return {'type': 'message', 'data': json.dumps(payload).encode()}
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncPubSub(FakePubSub):
+    async def get_message(self, timeout=0.0):
+        if not self.messages:
+            await asyncio.sleep(timeout)
+            return None
+        message = self.messages.pop(0)
+        if message is None:
+            return None
+        return {'type': 'message', 'data': json.dumps(message).encode()}
+
+    async def aclose(self):
+        self.closed = True
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'event' in lines:
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+class PublishDebateEventTests(SimpleTestCase):
+    def test_publishes_to_episode_channel(self):
+        client = MagicMock()
+        with patch.object(debate_events, '_get_client', return_value=client):
+            sent = debate_events.publish_debate_event(7, 'dialogue', {'content': 'hi'}, index=2)
+
+        self.assertTrue(sent)
+        channel, message = client.publish.call_args.args
+        self.assertEqual(channel, 'podcasts:debate:7')
+        self.assertEqual(json.loads(message), {'event': 'dialogue', 'data': {'content': 'hi'}, 'index': 2})
+
+    @override_settings(DEBATE_EVENTS_REDIS_URL='')
+    def test_disabled_without_redis_url(self):
+        self.assertFalse(debate_events.publish_debate_event(7, 'complete', {}))
+        self.assertIsNone(debate_events.subscribe(7))
+
+
+class DebateStreamTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', email='viewer@example.com', password='test-pass-123')
+        self.token = str(AccessToken.for_user(self.user))
+        self.episode = Episode.objects.create(title='辩论', description='desc', mode='debate', status='processing')
+        DialogueEntry.append(self.episode.id, {'participant': 'judge', 'content': '开场'})
+        self.url = f'/api/podcasts/episodes/{self.episode.id}/stream/'
+
+    def stream(self):
+        response = self.client.get(self.url, {'token': self.token})
+        return parse_events(b''.join(response.streaming_content).decode())
+
+    def test_catches_up_from_db_then_relays_published_events(self):
+        pubsub = FakePubSub([
+            {'event': 'dialogue', 'index': 0, 'data': {'participant': 'judge', 'content': '开场'}},
+            {'event': 'dialogue', 'index': 1, 'data': {'participant': 'llm1', 'content': '正方'}},
+            {'event': 'delta', 'data': {'index': 1, 'content': '正方观点'}},
+            {'event': 'complete', 'data': {'status': 'draft', 'total': 2}},
+        ])
+
+        with patch('apps.podcasts.sse_views.subscribe', return_value=pubsub), \
+                patch.object(Episode, 'refresh_from_db') as refresh:
+            events = self.stream()
+
+        self.assertEqual([event for event, _data in events], ['dialogue', 'dialogue', 'delta', 'complete'])
+        self.assertEqual(events[1][1]['content'], '正方')
+        refresh.assert_not_called()
+        self.assertTrue(pubsub.closed)
+
+    def test_backfills_entries_missed_while_redis_was_down(self):
+        episode_id = self.episode.id
+        pubsub = FakePubSub([
+            {'event': 'dialogue', 'index': 2, 'data': {'participant': 'llm2', 'content': '反方'}},
+            {'event': 'complete', 'data': {'status': 'draft', 'total': 3}},
+        ])
+        get_message = pubsub.get_message
+
+        def get_message_after_gap(timeout=0.0):
+            # 第 1 条发言的推送丢失，只写入了数据库
+            if not DialogueEntry.objects.filter(episode_id=episode_id, seq=1).exists():
+                DialogueEntry.append(episode_id, {'participant': 'llm1', 'content': '正方'})
+            return get_message(timeout)
+
+        pubsub.get_message = get_message_after_gap
+        with patch('apps.podcasts.sse_views.subscribe', return_value=pubsub):
+            events = self.stream()
+
+        self.assertEqual([data.get('content') for _event, data in events[:3]], ['开场', '正方', '反方'])
+        self.assertEqual(events[-1][0], 'complete')
+
+    def test_finished_episode_completes_without_waiting(self):
+        self.episode.status = 'failed'
+        self.episode.generation_error = '模型超时'
+        self.episode.save()
+
+        with patch('apps.podcasts.sse_views.subscribe', return_value=FakePubSub([])):
+            events = self.stream()
+
+        self.assertEqual(events[-1], ('stream_error', {'error': '模型超时'}))
+
+    def test_polls_database_without_redis(self):
+        self.episode.status = 'published'
+        self.episode.save()
+
+        with patch('apps.podcasts.sse_views.subscribe', return_value=None):
+            events = self.stream()
+
+        self.assertEqual([event for event, _data in events], ['dialogue', 'complete'])
+
+
+class AsyncDebateStreamTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='listener', email='listener@example.com', password='test-pass-123')
+        self.token = str(AccessToken.for_user(self.user))
+        self.episode = Episode.objects.create(title='会议', description='desc', mode='conference', status='processing')
+        DialogueEntry.append(self.episode.id, {'participant': 'tutor', 'content': '欢迎'})
+        self.url = f'/api/podcasts/episodes/{self.episode.id}/stream/'
+
+    async def test_streams_asynchronously_with_heartbeats(self):
+        pubsub = FakeAsyncPubSub([
+            None,
+            {'event': 'dialogue', 'index': 1, 'data': {'participant': 'student1', 'content': '提问'}},
+            {'event': 'complete', 'data': {'status': 'published', 'total': 2}},
+        ])
+
+        with patch('apps.podcasts.sse_views.subscribe_async', return_value=pubsub) as subscribe_async, \
+                patch('apps.podcasts.sse_views.subscribe') as subscribe, \
+                patch('apps.podcasts.sse_views.HEARTBEAT_INTERVAL', 0):
+            response = await AsyncClient().get(self.url, {'token': self.token})
+            body = ''.join([chunk.decode() async for chunk in response.streaming_content])
+
+        subscribe_async.assert_called_once()
+        subscribe.assert_not_called()
+        self.assertIn(': ping', body)
+        self.assertEqual([event for event, _data in parse_events(body)], ['dialogue', 'dialogue', 'complete'])
+        self.assertTrue(pubsub.closed)
+
+    async def test_disconnect_releases_subscription(self):
+        from apps.podcasts.sse_views import _event_stream_async
+
+        pubsub = FakeAsyncPubSub([])
+        stream = _event_stream_async(self.episode.id)
+
+        async def consume():
+            async for _chunk in stream:
+                pass
+
+        with patch('apps.podcasts.sse_views.subscribe_async', return_value=pubsub):
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.assertTrue(pubsub.closed)
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from apps.podcasts.consumers import DebateConsumer
+from apps.podcasts.models import DialogueEntry, Episode
+from apps.podcasts.serializers import EpisodeDetailSerializer
+from apps.users.models import User
+
+
+class DialogueEntryTests(TestCase):
+    def setUp(self):
+        self.episode = Episode.objects.create(title='辩论', description='desc', mode='debate')
+
+    def test_append_assigns_sequential_seq_and_round_trips(self):
+        first = DialogueEntry.append(self.episode.id, {
+            'participant': 'judge', 'role': '主持人', 'content': '开场', 'timestamp': '2026-01-01T00:00:00',
+        })
+        second = DialogueEntry.append(self.episode.id, {'participant': 'user', 'content': '插话', 'clientId': 'c1'})
+
+        self.assertEqual((first.seq, second.seq), (0, 1))
+        self.assertEqual(DialogueEntry.entries_after(self.episode.id), [
+            {'participant': 'judge', 'role': '主持人', 'content': '开场', 'timestamp': '2026-01-01T00:00:00'},
+            {'participant': 'user', 'clientId': 'c1', 'content': '插话'},
+        ])
+        self.assertEqual([entry['content'] for entry in DialogueEntry.entries_after(self.episode.id, 0)], ['插话'])
+
+    def test_append_does_not_rewrite_episode_dialogue(self):
+        DialogueEntry.append(self.episode.id, {'participant': 'judge', 'content': '开场'})
+
+        self.episode.refresh_from_db()
+        self.assertIsNone(self.episode.dialogue)
+
+    def test_detail_serializer_prefers_entries(self):
+        self.episode.dialogue = [{'participant': 'judge', 'content': '开场'}]
+        self.episode.save(update_fields=['dialogue'])
+        self.assertEqual(EpisodeDetailSerializer(self.episode).data['dialogue'], self.episode.dialogue)
+
+        DialogueEntry.append(self.episode.id, {'participant': 'judge', 'content': '开场'})
+        DialogueEntry.append(self.episode.id, {'participant': 'user', 'content': '插话'})
+        self.assertEqual(len(EpisodeDetailSerializer(self.episode).data['dialogue']), 2)
+
+
+class DebateMessageTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='debater', email='debater@example.com', password='test-pass-123')
+        self.client.force_authenticate(self.user)
+        self.episode = Episode.objects.create(
+            title='辩论', description='desc', mode='debate', status='draft',
+            generation_meta={'creator_id': self.user.id, 'topic': 'AI'},
+        )
+        DialogueEntry.append(self.episode.id, {'participant': 'judge', 'content': '开场'})
+
+    def test_message_is_appended_and_published_with_its_seq(self):
+        with patch('apps.podcasts.services.debate_events.publish_debate_event') as publish, \
+                patch('apps.podcasts.tasks.generate_debate_followup_task.delay') as delay:
+            response = self.client.post(
+                f'/api/podcasts/episodes/{self.episode.id}/debate-message/',
+                {'message': '我反对', 'client_id': 'm1'},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 202)
+        row = DialogueEntry.objects.get(episode=self.episode, seq=1)
+        self.assertEqual((row.participant, row.content, row.extra), ('user', '我反对', {'clientId': 'm1'}))
+        self.assertEqual(publish.call_args.kwargs['index'], 1)
+        delay.assert_called_once_with(self.episode.id, 'AI', 'debate')
+
+
+class DebateConsumerMessageTests(TestCase):
+    async def test_websocket_message_is_published_with_its_seq(self):
+        episode = await Episode.objects.acreate(title='辩论', description='desc', mode='debate')
+        await DialogueEntry.objects.acreate(episode=episode, seq=0, participant='judge', content='开场')
+        consumer = DebateConsumer()
+        consumer.episode_id = episode.id
+
+        with patch('apps.podcasts.services.debate_events.publish_debate_event') as publish:
+            await consumer.add_human_message('我反对')
+
+        row = await DialogueEntry.objects.aget(episode=episode, seq=1)
+        self.assertEqual((row.participant, row.content), ('human', '我反对'))
+        publish.assert_called_once_with(episode.id, 'dialogue', row.as_dict(), index=1)
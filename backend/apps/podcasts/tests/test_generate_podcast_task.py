@@ -0,0 +1,101 @@
+import os
+import threading
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from apps.podcasts.models import Episode, Show
+from apps.podcasts.services.generator import GenerationResult, SegmentTiming
+from apps.podcasts.tasks import generate_podcast_task
+from apps.users.models import User
+
+
+class GeneratePodcastTaskTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        user = User.objects.create_user(username="creator", email="creator@example.com", password="test-pass-123")
+        show = Show.objects.create(
+            title="My Show",
+            description="desc",
+            cover=SimpleUploadedFile("cover.jpg", b"fake-cover-bytes", content_type="image/jpeg"),
+            creator=user,
+        )
+        self.episode = Episode.objects.create(show=show, title="Episode", status="draft")
+
+    def test_cover_is_rendered_while_audio_is_generated(self):
+        cover_started = threading.Event()
+
+        def fake_render(episode):
+            self.assertEqual(episode.script, "【大牛】你好")
+            cover_started.set()
+            return b"png-bytes"
+
+        def fake_generate(script, output_path, **kwargs):
+            # Only returns once the cover thread has started, i.e. the two overlap
+            self.assertTrue(cover_started.wait(timeout=5))
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, "wb") as fh:
+                fh.write(b"mp3")
+            return GenerationResult(
+                output_path=output_path,
+                sample_rate=32000,
+                channels=1,
+                sample_count=400000,
+                file_size=3,
+                segments=[SegmentTiming(speaker="daniu", text="你好", start_ms=0, end_ms=12500)],
+            )
+
+        generator = MagicMock()
+        generator.generate.side_effect = fake_generate
+        with patch("apps.podcasts.services.generator.PodcastGenerator", return_value=generator), \
+                patch("apps.podcasts.services.cover_ai.render_episode_cover", side_effect=fake_render):
+            generate_podcast_task(self.episode.id, "【大牛】你好")
+
+        self.episode.refresh_from_db()
+        self.assertEqual(self.episode.status, "published")
+        self.assertEqual(self.episode.duration, 12)
+        self.assertEqual(self.episode.file_size, 3)
+        self.assertEqual(
+            self.episode.generation_meta["segment_timings"],
+            [{"speaker": "daniu", "start_ms": 0, "end_ms": 12500, "text": "你好"}],
+        )
+        with self.episode.cover.open("rb") as fh:
+            self.assertEqual(fh.read(), b"png-bytes")
+
+    def test_live_playlist_is_published_while_generating(self):
+        seen = {}
+
+        def fake_generate(script, output_path, *, live_dir=None, on_progress=None, **kwargs):
+            seen["live_dir"] = live_dir
+            seen["meta"] = Episode.objects.get(id=self.episode.id).generation_meta
+            os.makedirs(live_dir, exist_ok=True)
+            with open(os.path.join(live_dir, "index.m3u8"), "w") as fh:
+                fh.write("#EXTM3U\n#EXTINF:6.0,\nseg-00000.ts\n#EXTINF:6.0,\nseg-00001.ts\n")
+            on_progress(1, 1)
+            seen["progress"] = Episode.objects.get(id=self.episode.id).generation_meta["audio_progress"]
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, "wb") as fh:
+                fh.write(b"mp3")
+            return GenerationResult(output_path, 32000, 1, 32000, 3, [])
+
+        generator = MagicMock()
+        generator.generate.side_effect = fake_generate
+        with patch("apps.podcasts.services.generator.PodcastGenerator", return_value=generator), \
+                patch("apps.podcasts.services.cover_ai.render_episode_cover", return_value=None):
+            generate_podcast_task(self.episode.id, "【大牛】你好")
+
+        self.assertEqual(seen["live_dir"], os.path.join(self.tmpdir.name, "live", str(self.episode.id)))
+        self.assertEqual(seen["meta"]["live_playlist"], f"/media/live/{self.episode.id}/index.m3u8")
+        self.assertEqual(seen["progress"]["playable_seconds"], 12.0)
+
+        self.episode.refresh_from_db()
+        self.assertEqual(self.episode.status, "published")
+        self.assertNotIn("live_playlist", self.episode.generation_meta)
+        self.assertFalse(os.path.exists(seen["live_dir"]))
@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.podcasts.services.generator import PodcastGenerator
+
+
+async def _collect(segments):
+    return [item async for item in segments]
+
+class ConcurrentSynthesisTests(SimpleTestCase):
+    def _fake_synthesize(self, delays, stats):
+        async def fake_synthesize(config, text, logger=None, **kwargs):
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            voice_in_flight = stats["voices"].get(config.voice_id, 0) + 1
+            stats["voices"][config.voice_id] = voice_in_flight
+            stats["max_voices"][config.voice_id] = max(stats["max_voices"].get(config.voice_id, 0), voice_in_flight)
+            try:
+                await asyncio.sleep(delays.get(text, 0.001))
+            finally:
+                stats["in_flight"] -= 1
+                stats["voices"][config.voice_id] -= 1
+            # Encode the segment number into the sample count so order is observable
+            return config.sample_rate, bytearray(2 * (int(text.split("-")[1]) + 1))
+
+        return fake_synthesize
+
+    @staticmethod
+    def _stats():
+        return {"in_flight": 0, "max_in_flight": 0, "voices": {}, "max_voices": {}}
+
+    @override_settings(MINIMAX_TTS={"api_key": "test-key", "synthesis_concurrency": 3})
+    def test_results_keep_script_order_and_window_is_bounded(self):
+        generator = PodcastGenerator()
+        segments = [("daniu" if i % 2 else "yifan", f"seg-{i}") for i in range(10)]
+        # Early segments finish last, so naive completion order would be reversed
+        delays = {text: 0.001 * (10 - i) for i, (_, text) in enumerate(segments)}
+        stats = self._stats()
+
+        with patch(
+            "apps.podcasts.services.generator.synthesize_pcm16",
+            side_effect=self._fake_synthesize(delays, stats),
+        ):
+            results = asyncio.run(
+                _collect(generator._generate_all_segments(segments, voice_configs=generator.voice_configs))
+            )
+
+        self.assertEqual([speaker for speaker, _text, _config, _rate, _audio in results], [speaker for speaker, _ in segments])
+        self.assertEqual([len(audio) for _speaker, _text, _config, _rate, audio in results], [i + 1 for i in range(10)])
+        self.assertEqual(stats["max_in_flight"], 3)
+
+    @override_settings(
+        MINIMAX_TTS={
+            "api_key": "test-key",
+            "synthesis_concurrency": 4,
+            "voices": {"daniu": {"max_concurrency": 1}},
+        }
+    )
+    def test_per_voice_limit(self):
+        generator = PodcastGenerator()
+        segments = [("daniu", f"seg-{i}") for i in range(6)]
+        stats = self._stats()
+
+        with patch(
+            "apps.podcasts.services.generator.synthesize_pcm16",
+            side_effect=self._fake_synthesize({}, stats),
+        ):
+            results = asyncio.run(
+                _collect(generator._generate_all_segments(segments, voice_configs=generator.voice_configs))
+            )
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(stats["max_voices"][generator.voice_configs["daniu"].voice_id], 1)
+
+    @override_settings(MINIMAX_TTS={"api_key": "test-key", "synthesis_concurrency": 2})
+    def test_failure_cancels_remaining_segments(self):
+        generator = PodcastGenerator()
+        segments = [("daniu", f"seg-{i}") for i in range(5)]
+        started = []
+
+        async def failing_synthesize(config, text, logger=None, **kwargs):
+            started.append(text)
+            if text == "seg-1":
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01)
+            return config.sample_rate, bytearray(2)
+
+        with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=failing_synthesize):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(_collect(generator._generate_all_segments(segments, voice_configs=generator.voice_configs)))
+
+        self.assertNotIn("seg-4", started)
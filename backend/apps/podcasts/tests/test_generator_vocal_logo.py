@@ -1,10 +1,13 @@
 import os
+import time
 from tempfile import TemporaryDirectory
 
+from unittest.mock import patch
+
 from django.test import SimpleTestCase, override_settings
 from pydub import AudioSegment
 
-from apps.podcasts.services.generator import _prepend_append_vocal_logo
+from apps.podcasts.services.generator import _load_vocal_logos, _prepend_append_vocal_logo
 
 
 class VocalLogoTests(SimpleTestCase):
@@ -66,3 +69,38 @@ class VocalLogoTests(SimpleTestCase):
                 final_audio = _prepend_append_vocal_logo(body_audio)
 
             self.assertAlmostEqual(len(final_audio), 1000, delta=5)
+
+    def test_logos_are_decoded_once_and_reloaded_on_change(self):
+        with TemporaryDirectory() as tmpdir:
+            start_path = os.path.join(tmpdir, "start.wav")
+            end_path = os.path.join(tmpdir, "end.wav")
+            self._write_wav(start_path, 300)
+            self._write_wav(end_path, 500)
+
+            with override_settings(
+                BASE_DIR=tmpdir,
+                MINIMAX_TTS={
+                    "enable_vocal_logo": True,
+                    "vocal_logo_start_path": start_path,
+                    "vocal_logo_end_path": end_path,
+                },
+            ), patch(
+                "apps.podcasts.services.generator.AudioSegment.from_file", side_effect=AudioSegment.from_file
+            ) as from_file:
+                start_pcm, end_pcm = _load_vocal_logos(32000, 1)
+                self.assertAlmostEqual(len(start_pcm), 32000 * 2 * 300 // 1000, delta=64)
+                self.assertAlmostEqual(len(end_pcm), 32000 * 2 * 500 // 1000, delta=64)
+
+                _load_vocal_logos(32000, 1)
+                self.assertEqual(from_file.call_count, 2)
+
+                # A different output layout is resampled separately
+                _load_vocal_logos(16000, 1)
+                self.assertEqual(from_file.call_count, 4)
+
+                self._write_wav(start_path, 400)
+                future = time.time() + 10
+                os.utime(start_path, (future, future))
+                start_pcm, _ = _load_vocal_logos(32000, 1)
+                self.assertEqual(from_file.call_count, 5)
+                self.assertAlmostEqual(len(start_pcm), 32000 * 2 * 400 // 1000, delta=64)
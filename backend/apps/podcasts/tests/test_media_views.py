@@ -0,0 +1,103 @@
+from tempfile import TemporaryDirectory
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.podcasts.media_views import parse_range
+from apps.podcasts.models import Episode, Show
+from apps.users.models import User
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=500-', 1000), (500, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=900-5000', 1000), (900, 999))
+        self.assertIsNone(parse_range('', 1000))
+        self.assertIsNone(parse_range('bytes=0-1,5-6', 1000))
+        self.assertFalse(parse_range('bytes=1000-', 1000))
+        self.assertFalse(parse_range('bytes=-0', 1000))
+
+
+class EpisodeAudioViewTests(TestCase):
+    def setUp(self):
+        self.media = TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name, MEDIA_ACCEL_REDIRECT_PREFIX='')
+        self.settings_override.enable()
+
+        self.creator = User.objects.create_user(
+            username='host', email='host@example.com', password='test-pass-123', is_creator=True
+        )
+        self.show = Show.objects.create(
+            title='Range Show',
+            description='desc',
+            cover=SimpleUploadedFile('cover.jpg', b'c', content_type='image/jpeg'),
+            creator=self.creator,
+        )
+        self.content = bytes(range(256)) * 40
+        self.episode = Episode.objects.create(
+            show=self.show, title='Long Talk', description='desc', status='published'
+        )
+        self.episode.audio_file.save('talk.mp3', ContentFile(self.content))
+        self.url = f'/api/podcasts/episodes/{self.episode.id}/audio/'
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_file_with_validators(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'audio/mpeg')
+        self.assertEqual(self.body(response), self.content)
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(self.body(response), self.content[100:200])
+
+        tail = self.client.get(self.url, HTTP_RANGE='bytes=9000-')
+        self.assertEqual(tail.status_code, 206)
+        self.assertEqual(tail['Content-Length'], str(len(self.content) - 9000))
+        self.assertEqual(self.body(tail), self.content[9000:])
+
+        unsatisfiable = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(unsatisfiable['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_stale_if_range_returns_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        etag = self.client.head(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_private_episode_requires_token(self):
+        self.episode.visibility = 'private'
+        self.episode.save(update_fields=['visibility'])
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        token = str(AccessToken.for_user(self.creator))
+        self.assertEqual(self.client.get(self.url, {'token': token}).status_code, 200)
+
+    def test_delegates_to_nginx(self):
+        with override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/'):
+            response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.episode.audio_file.name}')
+        self.assertEqual(response.content, b'')
@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from apps.podcasts.services.minimax_client import (
+    MiniMaxError,
+    MiniMaxRetryPolicy,
+    MiniMaxVoiceConfig,
+    MiniMaxWebSocketClient,
+    synthesize_pcm16,
+)
+
+
+class _FakeWebSocket:
+    def __init__(self, responses):
+        self.sent = []
+        self._responses = [json.dumps(response) for response in responses]
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def recv(self):
+        return self._responses.pop(0)
+
+
+def _client(responses):
+    client = MiniMaxWebSocketClient(MiniMaxVoiceConfig(api_key="key", voice_id="voice-a"))
+    client._ws = _FakeWebSocket(responses)
+    return client
+
+
+class ReadPCM16Tests(SimpleTestCase):
+    def test_decodes_hex_frames_without_float_conversion(self):
+        samples = np.array([0, 1, -1, 32767, -32768], dtype=np.int16)
+        raw = samples.tobytes()
+        client = _client([
+            {"data": {"audio": raw[:4].hex()}},
+            {"data": None},
+            {"data": {"audio": raw[4:].hex()}, "is_final": True},
+        ])
+
+        pcm = asyncio.run(client.read_pcm16("你好"))
+
+        self.assertIsInstance(pcm, bytearray)
+        self.assertEqual(bytes(pcm), raw)
+        self.assertEqual(client._ws.sent, [{"event": "task_continue", "text": "你好"}])
+
+    def test_batch_splits_audio_at_each_final(self):
+        client = _client([
+            {"data": {"audio": "0100"}},
+            {"data": {"audio": "0200"}, "is_final": True},
+            {"data": {"audio": "0300"}, "is_final": True},
+        ])
+
+        results = asyncio.run(client.read_pcm16_batch(["第一句", "第二句"]))
+
+        self.assertEqual([bytes(pcm) for pcm in results], [bytes.fromhex("01000200"), bytes.fromhex("0300")])
+        self.assertEqual([message["text"] for message in client._ws.sent], ["第一句", "第二句"])
+
+    def test_task_failed_raises(self):
+        client = _client([{"event": "task_failed", "base_resp": {"status_code": 1004}}])
+
+        with self.assertRaises(MiniMaxError) as ctx:
+            asyncio.run(client.read_pcm16("你好"))
+        self.assertEqual(ctx.exception.status_code, 1004)
+        self.assertFalse(ctx.exception.is_retryable)
+
+
+class _FlakyPool:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def synthesize(self, config, text, logger=None):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return bytearray(b"\x01\x00")
+
+
+class _RecordingLimiter:
+    def __init__(self):
+        self.events = []
+
+    async def acquire(self):
+        self.events.append("acquire")
+
+    def penalize(self):
+        self.events.append("penalize")
+
+    def reward(self):
+        self.events.append("reward")
+
+
+class SynthesizeRetryTests(SimpleTestCase):
+    def setUp(self):
+        self.config = MiniMaxVoiceConfig(api_key="key", voice_id="voice-a")
+        self.retry = MiniMaxRetryPolicy(attempts=3, base_delay=0, max_delay=0)
+
+    def test_retries_throttled_segment_and_slows_limiter(self):
+        pool = _FlakyPool([MiniMaxError("rate limited", status_code=1002), ConnectionResetError("reset")])
+        limiter = _RecordingLimiter()
+
+        sample_rate, pcm = asyncio.run(
+            synthesize_pcm16(self.config, "你好", pool=pool, limiter=limiter, retry=self.retry)
+        )
+
+        self.assertEqual((sample_rate, bytes(pcm)), (32000, b"\x01\x00"))
+        self.assertEqual(pool.calls, 3)
+        self.assertEqual(limiter.events, ["acquire", "penalize", "acquire", "acquire", "reward"])
+
+    def test_gives_up_after_max_attempts(self):
+        pool = _FlakyPool([MiniMaxError("boom")] * 5)
+
+        with self.assertRaises(MiniMaxError):
+            asyncio.run(synthesize_pcm16(self.config, "你好", pool=pool, retry=self.retry))
+        self.assertEqual(pool.calls, 3)
+
+    def test_fatal_errors_are_not_retried(self):
+        pool = _FlakyPool([MiniMaxError("invalid api key", status_code=1004)])
+
+        with self.assertRaises(MiniMaxError):
+            asyncio.run(synthesize_pcm16(self.config, "你好", pool=pool, retry=self.retry))
+        self.assertEqual(pool.calls, 1)
+
+    def test_backoff_grows_exponentially_with_jitter(self):
+        policy = MiniMaxRetryPolicy(attempts=5, base_delay=1.0, max_delay=3.0)
+        delays = [policy.backoff(attempt) for attempt in (1, 2, 3)]
+
+        self.assertTrue(0.5 <= delays[0] <= 1.0)
+        self.assertTrue(1.0 <= delays[1] <= 2.0)
+        self.assertTrue(1.5 <= delays[2] <= 3.0)
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import shutil
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from pydub import AudioSegment
+
+from apps.podcasts.services.generator import PodcastGenerator
+from apps.podcasts.services.minimax_client import MiniMaxSessionPool, MiniMaxVoiceConfig, synthesize_pcm16
+from apps.podcasts.services.minimax_fake_server import FakeMiniMaxServer
+
+
+async def _collect(segments):
+    return [item async for item in segments]
+
+
+class FakeMiniMaxServerTests(SimpleTestCase):
+    def test_pooled_session_streams_segments_over_one_task(self):
+        async def run():
+            async with FakeMiniMaxServer(first_audio_latency=0, frame_ms=20) as server:
+                config = MiniMaxVoiceConfig(api_key="test", voice_id="voice-a", ws_url=server.url)
+                async with MiniMaxSessionPool() as pool:
+                    results = [await synthesize_pcm16(config, text, pool=pool) for text in ("你好", "再见呀")]
+                return server, results
+
+        server, results = asyncio.run(run())
+
+        self.assertEqual([bytes(pcm) for _rate, pcm in results], [
+            server.synthesize("你好", 32000),
+            server.synthesize("再见呀", 32000),
+        ])
+        self.assertEqual((server.stats["connections"], server.stats["task_starts"], server.stats["segments"]), (1, 1, 2))
+
+    def test_generator_synthesizes_against_configured_endpoint(self):
+        async def run():
+            async with FakeMiniMaxServer(first_audio_latency=0.01) as server:
+                minimax_settings = {
+                    "api_key": "test",
+                    "ws_url": server.url,
+                    "synthesis_concurrency": 2,
+                    "segment_cache_max_mb": 0,
+                    "rate_limit_per_second": 0,
+                }
+                with override_settings(MINIMAX_TTS=minimax_settings):
+                    generator = PodcastGenerator()
+                segments = [("daniu", "第一句话"), ("yifan", "第二句"), ("daniu", "第三句话来了")]
+                results = await _collect(generator._generate_all_segments(segments, voice_configs=generator.voice_configs))
+                return server, segments, results
+
+        server, segments, results = asyncio.run(run())
+
+        self.assertEqual([text for _speaker, text, _config, _rate, _audio in results], [text for _, text in segments])
+        for (_speaker, text, _config, _rate, audio) in results:
+            self.assertEqual(audio.tobytes(), server.synthesize(text, 32000))
+        self.assertEqual(server.stats["segments"], 3)
+
+    def test_speaker_batching_sends_runs_in_one_task(self):
+        async def run():
+            async with FakeMiniMaxServer(first_audio_latency=0) as server:
+                minimax_settings = {
+                    "api_key": "test",
+                    "ws_url": server.url,
+                    "synthesis_concurrency": 4,
+                    "segment_cache_max_mb": 0,
+                    "rate_limit_per_second": 0,
+                    "session_reuse": False,
+                    "speaker_batching": True,
+                }
+                with override_settings(MINIMAX_TTS=minimax_settings):
+                    generator = PodcastGenerator()
+                segments = [("daniu", "一"), ("daniu", "二二"), ("daniu", "三三三"), ("yifan", "四"), ("daniu", "五")]
+                results = await _collect(generator._generate_all_segments(segments, voice_configs=generator.voice_configs))
+                return server, segments, results
+
+        server, segments, results = asyncio.run(run())
+
+        self.assertEqual([(speaker, text) for speaker, text, _config, _rate, _audio in results], segments)
+        for (_speaker, text, _config, _rate, audio) in results:
+            self.assertEqual(audio.tobytes(), server.synthesize(text, 32000))
+        # Without session reuse every unit opens its own task: the daniu run shares one
+        self.assertEqual((server.stats["task_starts"], server.stats["segments"]), (3, 5))
+
+
+@skipUnless(shutil.which(AudioSegment.converter), "ffmpeg is required for MP3 encoding")
+class BenchmarkCommandTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+    def test_reports_throughput_per_concurrency(self):
+        out = StringIO()
+        call_command(
+            "benchmark_tts",
+            segments=3,
+            chars=8,
+            concurrency="1,2",
+            latency=0,
+            audio_speed=0,
+            json=True,
+            stdout=out,
+        )
+
+        rows = json.loads(out.getvalue())
+        self.assertEqual([row["concurrency"] for row in rows], [1, 2])
+        for row in rows:
+            self.assertEqual(row["segments"], 3)
+            self.assertEqual(row["server"]["segments"], 3)
+            self.assertGreater(row["segments_per_second"], 0)
+            self.assertGreater(row["peak_rss_mb"], 0)
@@ -1,6 +1,8 @@
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
+from tempfile import TemporaryDirectory
 from unittest.mock import patch
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -12,6 +14,12 @@ from apps.users.models import User
 
 class OperationsAPITests(APITestCase):
     def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
         self.user = User.objects.create_user(
             username='ops-user',
             email='ops-user@example.com',
@@ -0,0 +1,50 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from apps.podcasts.services.rate_limit import LocalTokenBucket, MiniMaxRateLimiter
+
+
+class LocalTokenBucketTests(SimpleTestCase):
+    def test_burst_then_refill(self):
+        now = [100.0]
+        bucket = LocalTokenBucket(clock=lambda: now[0])
+
+        self.assertEqual([bucket.reserve(2.0, 3) for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(2.0, 3), 0.5)
+
+        now[0] += 0.5
+        self.assertEqual(bucket.reserve(2.0, 3), 0.0)
+
+        # Refill never exceeds the burst capacity
+        now[0] += 60
+        self.assertEqual([bucket.reserve(2.0, 3) for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertGreater(bucket.reserve(2.0, 3), 0)
+
+
+class MiniMaxRateLimiterTests(SimpleTestCase):
+    def test_from_settings_can_disable(self):
+        self.assertIsNone(MiniMaxRateLimiter.from_settings({"rate_limit_per_second": 0}))
+        limiter = MiniMaxRateLimiter.from_settings({"rate_limit_per_second": 2, "rate_limit_burst": 4})
+        self.assertEqual((limiter.rate, limiter.burst, limiter.redis_url), (2, 4, None))
+
+    def test_penalize_and_recover(self):
+        limiter = MiniMaxRateLimiter(rate=8, burst=4, recovery_step=0.25)
+        with self.assertLogs("apps.podcasts.services.rate_limit", level="WARNING"):
+            limiter.penalize()
+            limiter.penalize()
+        self.assertAlmostEqual(limiter.effective_rate, 2.0)
+        self.assertAlmostEqual(limiter.effective_burst, 1.0)
+
+        for _ in range(10):
+            limiter.reward()
+        self.assertAlmostEqual(limiter.effective_rate, 8.0)
+
+    def test_unreachable_redis_falls_back_to_local_bucket(self):
+        limiter = MiniMaxRateLimiter(rate=1000, burst=2, redis_url="redis://127.0.0.1:1/0")
+
+        with self.assertLogs("apps.podcasts.services.rate_limit", level="WARNING"):
+            asyncio.run(limiter.acquire())
+        # Redis isn't retried until the cooldown has passed
+        self.assertIsNone(limiter._redis_script())
+        asyncio.run(limiter.acquire())
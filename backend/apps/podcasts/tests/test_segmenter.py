@@ -0,0 +1,74 @@
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.podcasts.models import ScriptSession
+from apps.podcasts.services.generator import PodcastGenerator
+from apps.podcasts.services.segmenter import ScriptSegmenter, leading_role
+from apps.users.models import User
+
+
+class ScriptSegmenterTests(SimpleTestCase):
+    def test_parse_collects_turns_with_offsets(self):
+        script = "# 标题\n开场白被忽略\n【大牛】** 大家好\n欢迎收听\n\n  【一帆】 你好。\n"
+        turns = ScriptSegmenter().parse(script)
+
+        self.assertEqual([(turn.role, turn.text) for turn in turns], [("大牛", "大家好 欢迎收听"), ("一帆", "你好。")])
+        self.assertEqual(script[turns[0].start:turns[0].end], "【大牛】** 大家好\n欢迎收听")
+        self.assertEqual(script[turns[1].start:turns[1].end], "【一帆】 你好。")
+
+    def test_split_prefers_punctuation_then_whitespace(self):
+        segmenter = ScriptSegmenter(max_chars=6, punctuation_marks="。，")
+
+        self.assertEqual(segmenter.split("短句"), ["短句"])
+        self.assertEqual(segmenter.split("一二三，四五六七八。九"), ["一二三，", "四五六七八。", "九"])
+        self.assertEqual(segmenter.split("ab cd efgh ij"), ["ab cd", "efgh", "ij"])
+        self.assertEqual(segmenter.split("一二三四五六七八"), ["一二三四五六", "七八"])
+
+    def test_split_is_linear_on_long_text(self):
+        segmenter = ScriptSegmenter(max_chars=45)
+        text = "没有标点的长文本" * 12500
+
+        chunks = segmenter.split(text)
+
+        self.assertEqual("".join(chunks), text)
+        self.assertTrue(all(len(chunk) <= 45 for chunk in chunks))
+
+    def test_leading_role(self):
+        self.assertEqual(leading_role("【 大牛 】你好"), "大牛")
+        self.assertIsNone(leading_role("你好【大牛】"))
+
+    def test_generator_resolves_roles_and_splits(self):
+        with override_settings(MINIMAX_TTS={
+            "api_key": "test-key",
+            "max_segment_duration": 2,
+            "tts_chars_per_second": 3,
+            "adaptive_segmentation": False,
+        }):
+            generator = PodcastGenerator()
+
+        segments = generator._expand_segments(
+            generator._parse_markdown(
+                "【大牛】一二三。四五六。\n【路人】跳过\n【yifan】好的",
+                character_aliases=generator.character_aliases,
+                voice_configs=generator.voice_configs,
+            ),
+            voice_configs=generator.voice_configs,
+        )
+
+        self.assertEqual(segments, [("daniu", "一二三。"), ("daniu", "四五六。"), ("yifan", "好的")])
+
+
+class ScriptSegmentsAPITests(APITestCase):
+    def test_returns_editor_segments(self):
+        user = User.objects.create_user(username="editor", email="editor@example.com", password="pass-123", is_creator=True)
+        session = ScriptSession.objects.create(creator=user, title="分段", current_script="【大牛】你好\n【一帆】再见")
+        self.client.force_authenticate(user)
+
+        response = self.client.get(f"/api/podcasts/script-sessions/{session.id}/segments/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["role"], item["raw"]) for item in response.data["segments"]],
+            [("大牛", "【大牛】你好"), ("一帆", "【一帆】再见")],
+        )
@@ -0,0 +1,187 @@
+import asyncio
+import os
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from apps.podcasts.models import SpeakingRate
+from apps.podcasts.services.checkpoint import GenerationCheckpoint
+from apps.podcasts.services.generator import PodcastGenerator
+from apps.podcasts.services.minimax_client import MiniMaxError, MiniMaxVoiceConfig
+from apps.podcasts.services.speaking_rate import SpeakingRateTracker
+
+
+class SpeakingRateTrackerTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.config = MiniMaxVoiceConfig(api_key="test", voice_id="English_Fast Voice (1)")
+
+    def test_uses_default_until_enough_samples(self):
+        tracker = SpeakingRateTracker(4.5, min_samples=2)
+        tracker.observe(self.config, "a" * 30, 2.0)
+        tracker.flush()
+        self.assertEqual(tracker.rate(self.config), 4.5)
+
+        tracker.observe(self.config, "a" * 30, 2.0)
+        tracker.flush()
+        self.assertAlmostEqual(tracker.rate(self.config), 15.0)
+        self.assertEqual(tracker.max_chars(self.config, 10), 150)
+
+    def test_rates_are_per_voice_and_speed(self):
+        tracker = SpeakingRateTracker(4.5, min_samples=1)
+        faster = MiniMaxVoiceConfig(api_key="test", voice_id=self.config.voice_id, speed=1.5)
+        tracker.observe(faster, "a" * 30, 2.0)
+        tracker.flush()
+
+        self.assertEqual(tracker.rate(self.config), 4.5)
+        self.assertAlmostEqual(tracker.rate(faster), 15.0)
+
+    def test_ignores_short_observations_and_bounds_rates(self):
+        tracker = SpeakingRateTracker(4.5, min_samples=1, max_rate=20.0)
+        tracker.observe(self.config, "短", 0.3)
+        tracker.flush()
+        self.assertFalse(SpeakingRate.objects.exists())
+
+        tracker.observe(self.config, "a" * 100, 1.0)
+        tracker.flush()
+        self.assertEqual(tracker.rate(self.config), 20.0)
+
+    def test_rates_are_shared_between_trackers(self):
+        # e.g. two Celery worker processes
+        learner = SpeakingRateTracker(4.5, min_samples=1)
+        learner.observe(self.config, "a" * 30, 2.0)
+        learner.flush()
+
+        other = SpeakingRateTracker(4.5, min_samples=1)
+        self.assertAlmostEqual(other.rate(self.config), 15.0)
+        other.observe(self.config, "a" * 20, 2.0)
+        other.flush()
+        self.assertEqual(SpeakingRate.objects.get(key=learner.make_key(self.config)).samples, 2)
+
+    def test_small_drifts_round_to_the_same_rate(self):
+        tracker = SpeakingRateTracker(4.5, min_samples=1, alpha=0.2)
+        tracker.observe(self.config, "a" * 30, 2.0)
+        tracker.flush()
+        tracker.observe(self.config, "a" * 29, 2.0)
+        tracker.flush()
+
+        self.assertEqual(tracker.rate(self.config), 15.0)
+
+    def test_discard_drops_pending_observations(self):
+        tracker = SpeakingRateTracker(4.5, min_samples=1)
+        tracker.observe(self.config, "a" * 30, 2.0)
+        tracker.discard()
+        tracker.flush()
+
+        self.assertEqual(tracker.rate(self.config), 4.5)
+
+    def test_disabled_by_settings(self):
+        self.assertIsNone(SpeakingRateTracker.from_settings({"adaptive_segmentation": False}, 4.5))
+        self.assertIsNone(SpeakingRateTracker.from_settings({"adaptive_segmentation": "0"}, 4.5))
+        self.assertIsNotNone(SpeakingRateTracker.from_settings({"adaptive_segmentation": "on"}, 4.5))
+
+
+class GeneratorSpeakingRateTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+    def test_learned_rate_sizes_later_segments(self):
+        async def fake_synthesize(config, text, logger=None, **kwargs):
+            # 10 chars of audio per second, twice the configured estimate
+            seconds = len(text) / 10
+            return config.sample_rate, bytearray(np.zeros(int(config.sample_rate * seconds), dtype=np.int16).tobytes())
+
+        settings = {
+            "api_key": "test-key",
+            "max_segment_duration": 4,
+            "tts_chars_per_second": 5,
+            "speaking_rate_min_samples": 1,
+            "segment_cache_max_mb": 0,
+            "rate_limit_per_second": 0,
+        }
+        text = "一二三四五六七八九十" * 4
+        with override_settings(MINIMAX_TTS=settings):
+            generator = PodcastGenerator()
+        voice_configs = generator.voice_configs
+
+        before = generator._expand_segments([("daniu", text)], voice_configs=voice_configs)
+        self.assertEqual([len(part) for _speaker, part in before], [20, 20])
+
+        async def run():
+            with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=fake_synthesize):
+                async for _item in generator._generate_all_segments(before, voice_configs=voice_configs):
+                    pass
+
+        asyncio.run(run())
+        generator._finish_speaking_rates(succeeded=True)
+
+        after = generator._expand_segments([("daniu", text)], voice_configs=voice_configs)
+        self.assertEqual([len(part) for _speaker, part in after], [40])
+        # Other voices keep the configured estimate
+        self.assertEqual(generator._max_chars_for(voice_configs["yifan"]), 20)
+
+    def test_retry_after_partial_failure_reuses_the_first_split(self):
+        calls = []
+
+        async def fake_synthesize(config, text, logger=None, **kwargs):
+            calls.append(text)
+            if fail_after is not None and len(calls) > fail_after:
+                raise MiniMaxError("boom")
+            # Twice the configured estimate, so the learned rate would double max_chars
+            seconds = len(text) / 10
+            return config.sample_rate, bytearray(np.zeros(int(config.sample_rate * seconds), dtype=np.int16).tobytes())
+
+        settings = {
+            "api_key": "test-key",
+            "max_segment_duration": 4,
+            "tts_chars_per_second": 5,
+            "speaking_rate_min_samples": 1,
+            "segment_cache_max_mb": 0,
+            "rate_limit_per_second": 0,
+            "synthesis_concurrency": 1,
+            "enable_vocal_logo": False,
+            "silence_min_ms": 0,
+            "silence_max_ms": 0,
+        }
+        dialogue = [{"participant": "llm1", "content": "一二三四五六七八九十" * 4} for _ in range(3)]
+        participants = [{"id": "llm1", "voice_id": "voice-a"}]
+
+        with override_settings(MINIMAX_TTS=settings), TemporaryDirectory() as tmpdir:
+            generator = PodcastGenerator()
+            checkpoint = GenerationCheckpoint(os.path.join(tmpdir, "episode-1"))
+            output = os.path.join(tmpdir, "out.mp3")
+
+            fail_after = 3
+            with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=fake_synthesize):
+                with self.assertRaises(MiniMaxError):
+                    generator.generate_multi(dialogue, participants, output, checkpoint=checkpoint)
+                self.assertEqual(checkpoint.completed_indexes(), {1, 2, 3})
+
+                # Meanwhile another episode taught the tracker a faster rate for this voice
+                voice = MiniMaxVoiceConfig(api_key="test-key", model=generator.model, voice_id="voice-a")
+                generator.speaking_rates.observe(voice, "a" * 40, 4.0)
+                generator.speaking_rates.flush()
+                self.assertEqual(generator._max_chars_for(voice), 40)
+
+                generator = PodcastGenerator()
+                fail_after, calls = None, []
+                result = generator.generate_multi(dialogue, participants, output, checkpoint=checkpoint)
+
+            self.assertEqual(len(result.segments), 6)
+            self.assertEqual(checkpoint.restored, 3)
+            self.assertEqual(len(calls), 3)
+
+            # New episodes use the learned rate
+            fresh = GenerationCheckpoint(os.path.join(tmpdir, "episode-2"))
+            self.assertEqual(list(generator._segment_limits([voice], fresh).values()), [40])
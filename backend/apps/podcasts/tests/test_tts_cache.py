@@ -0,0 +1,83 @@
+import asyncio
+import os
+import time
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from apps.podcasts.services.generator import PodcastGenerator
+from apps.podcasts.services.minimax_client import MiniMaxVoiceConfig
+from apps.podcasts.services.tts_cache import TTSSegmentCache
+
+
+
+async def _collect(segments):
+    return [item async for item in segments]
+
+class TTSSegmentCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.config = MiniMaxVoiceConfig(api_key="key", voice_id="voice-a")
+
+    def test_key_ignores_whitespace_but_not_voice_settings(self):
+        key = TTSSegmentCache.make_key(self.config, "你好， 世界")
+        self.assertEqual(key, TTSSegmentCache.make_key(self.config, "  你好，\n世界 "))
+
+        faster = MiniMaxVoiceConfig(api_key="other-key", voice_id="voice-a", speed=1.2)
+        self.assertNotEqual(key, TTSSegmentCache.make_key(faster, "你好， 世界"))
+
+        # The API key doesn't change the audio, so it must not change the key
+        other_account = MiniMaxVoiceConfig(api_key="other-key", voice_id="voice-a")
+        self.assertEqual(key, TTSSegmentCache.make_key(other_account, "你好， 世界"))
+
+    def test_round_trip_and_counters(self):
+        with TemporaryDirectory() as tmpdir:
+            cache = TTSSegmentCache(tmpdir, max_bytes=1024 * 1024)
+            self.assertIsNone(cache.get(self.config, "hello"))
+
+            cache.put(self.config, "hello", b"\x01\x00\x02\x00")
+            self.assertEqual(cache.get(self.config, "hello"), b"\x01\x00\x02\x00")
+            self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_evicts_least_recently_used(self):
+        with TemporaryDirectory() as tmpdir:
+            cache = TTSSegmentCache(tmpdir, max_bytes=3500)
+            for index, text in enumerate(["a", "b", "c"]):
+                cache.put(self.config, text, b"\x00" * 1000)
+                path = cache._path(cache.make_key(self.config, text))
+                os.utime(path, (time.time() - 100 + index, time.time() - 100 + index))
+
+            # Touch "a" so "b" becomes the oldest entry
+            self.assertIsNotNone(cache.get(self.config, "a"))
+            cache.put(self.config, "d", b"\x00" * 1000)
+
+            self.assertIsNone(cache.get(self.config, "b"))
+            self.assertIsNotNone(cache.get(self.config, "a"))
+            self.assertIsNotNone(cache.get(self.config, "d"))
+
+    def test_generator_only_synthesizes_changed_segments(self):
+        with TemporaryDirectory() as tmpdir:
+            with override_settings(
+                MINIMAX_TTS={"api_key": "test-key", "segment_cache_dir": tmpdir, "segment_cache_max_mb": 10}
+            ):
+                generator = PodcastGenerator()
+
+            synthesized = []
+
+            async def fake_synthesize(config, text, logger=None, **kwargs):
+                synthesized.append(text)
+                return config.sample_rate, np.full(8, 16384, dtype=np.int16).tobytes()
+
+            with patch("apps.podcasts.services.generator.synthesize_pcm16", side_effect=fake_synthesize):
+                first = [("daniu", "第一句"), ("yifan", "第二句")]
+                asyncio.run(_collect(generator._generate_all_segments(first, voice_configs=generator.voice_configs)))
+
+                edited = [("daniu", "第一句"), ("yifan", "改过的第二句")]
+                results = asyncio.run(
+                    _collect(generator._generate_all_segments(edited, voice_configs=generator.voice_configs))
+                )
+
+            self.assertEqual(synthesized, ["第一句", "第二句", "改过的第二句"])
+            self.assertEqual(len(results), 2)
+            self.assertEqual(results[0][4].tobytes(), results[1][4].tobytes())
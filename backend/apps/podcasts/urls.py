@@ -5,6 +5,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 from . import sse_views
+from . import media_views
 
 app_name = 'podcasts'
 
@@ -15,6 +16,7 @@ router.register(r'rss-sources', views.RSSSourceViewSet, basename='rss-source')
 router.register(r'rss-lists', views.RSSListViewSet, basename='rss-list')
 router.register(r'rss-schedules', views.RSSScheduleViewSet, basename='rss-schedule')
 router.register(r'rss-runs', views.RSSRunViewSet, basename='rss-run')
+router.register(r'episode-uploads', views.EpisodeUploadViewSet, basename='episode-upload')
 
 urlpatterns = [
     # 分类和标签
@@ -51,6 +53,7 @@ urlpatterns = [
     path('episodes/<int:episode_id>/cover-options/', views.generate_cover_options, name='generate_cover_options'),
     path('episodes/<int:episode_id>/cover-apply/', views.apply_cover_option, name='apply_cover_option'),
     path('episodes/<int:episode_id>/stream/', sse_views.debate_stream, name='debate_stream'),  # SSE流
+    path('episodes/<int:episode_id>/audio/', media_views.episode_audio, name='episode_audio'),  # Range 请求
     path('episodes/<int:episode_id>/generate-audio/', views.generate_debate_audio, name='generate_debate_audio'),
     path('episodes/<int:pk>/update/', views.EpisodeUpdateView.as_view(), name='episode_update'),
     path('episodes/<int:pk>/update-script/', views.update_episode_script, name='episode_update_script'),
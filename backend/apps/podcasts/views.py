@@ -5,30 +5,35 @@ import os
 import re
 from uuid import uuid4
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.base import ContentFile
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics, status, filters, viewsets
+from rest_framework import generics, mixins, status, filters, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
 from rest_framework.response import Response
 
 from .models import (
-    Category, Tag, Show, Episode, ScriptSession, UploadedReference,
+    Category, Tag, Show, Episode, DialogueEntry, EpisodeUpload, ScriptSession, UploadedReference,
     RSSSource, RSSList, RSSSchedule, RSSRun,
 )
 from .serializers import (
     CategorySerializer, TagSerializer,
     ShowListSerializer, ShowDetailSerializer, ShowCreateSerializer,
     EpisodeListSerializer, EpisodeDetailSerializer, EpisodeCreateSerializer,
+    EpisodeUploadSerializer, EpisodeUploadCreateSerializer,
     PodcastGenerationSerializer, RSSPodcastGenerationSerializer, SourcePodcastGenerationSerializer,
     ScriptSessionSerializer, ScriptSessionCreateSerializer, ScriptChatSerializer,
     UploadedReferenceSerializer,
     RSSSourceSerializer, RSSListSerializer, RSSScheduleSerializer, RSSRunSerializer,
 )
 from .permissions import IsShowOwner
+from .services import chunked_upload
+from .services.segmenter import ROLE_TAG_PATTERN, ScriptSegmenter, leading_role
 from .services.speaker_config import normalize_speaker_config, apply_speaker_names
 from .services.rss_schedule import compute_next_run_at
 from slugify import slugify as awesome_slugify
@@ -157,6 +162,137 @@ class EpisodeCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
 
 
+class EpisodeUploadViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    分片上传单集（断点续传）
+
+    POST   episode-uploads/                 开始上传：filename、size、sha256（可选）+ 单集信息
+    PUT    episode-uploads/{id}/chunk/      请求体为分片字节，Upload-Offset 头给出偏移量，
+                                            X-Chunk-SHA256 头（可选）校验该分片
+    GET    episode-uploads/{id}/            查询 received_size，从该偏移量继续上传
+    POST   episode-uploads/{id}/complete/   全部上传后创建单集并进入音频处理
+    DELETE episode-uploads/{id}/            取消上传
+
+    超过 AUDIO_UPLOAD_EXPIRE_HOURS 没有新分片的上传由 cleanup_stale_uploads_task 清理。
+    """
+    serializer_class = EpisodeUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return EpisodeUpload.objects.filter(creator=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = EpisodeUploadCreateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        upload = EpisodeUpload(
+            creator=request.user,
+            filename=data['filename'],
+            total_size=data['size'],
+            sha256=data['sha256'],
+            episode_data=data['episode_data'],
+        )
+        upload.file_path = chunked_upload.allocate_upload_path(upload.filename, upload.id)
+        chunked_upload.create_upload_file(upload.file_path)
+        upload.save()
+
+        return Response(
+            {**EpisodeUploadSerializer(upload).data, 'chunk_max_size': settings.AUDIO_UPLOAD_CHUNK_MAX_SIZE},
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        """写入一个分片"""
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return Response({'error': '缺少或无效的 Upload-Offset'}, status=status.HTTP_400_BAD_REQUEST)
+        if length <= 0:
+            return Response({'error': '分片为空'}, status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.AUDIO_UPLOAD_CHUNK_MAX_SIZE:
+            return Response(
+                {'error': f'分片太大（最大 {settings.AUDIO_UPLOAD_CHUNK_MAX_SIZE} 字节）'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        with transaction.atomic():
+            upload = get_object_or_404(self.get_queryset().select_for_update(), pk=pk)
+            if upload.status != 'uploading':
+                return Response({'error': '上传已完成'}, status=status.HTTP_409_CONFLICT)
+            if offset != upload.received_size:
+                # 偏移量不一致（重复或跳过的分片），客户端应从 received_size 继续
+                return Response(
+                    {'error': '偏移量不匹配', 'received_size': upload.received_size},
+                    status=status.HTTP_409_CONFLICT
+                )
+            if offset + length > upload.total_size:
+                return Response({'error': '分片超出文件大小'}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                upload.received_size = chunked_upload.write_chunk(
+                    upload.file_path,
+                    offset,
+                    request.stream,
+                    length,
+                    expected_sha256=request.headers.get('X-Chunk-SHA256'),
+                )
+            except chunked_upload.ChunkError as e:
+                return Response(
+                    {'error': str(e), 'received_size': upload.received_size},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            upload.save(update_fields=['received_size', 'updated_at'])
+
+        return Response(EpisodeUploadSerializer(upload).data)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """校验完整文件，创建单集并触发音频处理"""
+        with transaction.atomic():
+            upload = get_object_or_404(self.get_queryset().select_for_update(), pk=pk)
+            if upload.status == 'completed':
+                return Response(EpisodeUploadSerializer(upload).data)
+            if upload.received_size != upload.total_size:
+                return Response(
+                    {'error': '文件尚未上传完整', 'received_size': upload.received_size},
+                    status=status.HTTP_409_CONFLICT
+                )
+            if upload.sha256 and chunked_upload.file_sha256(upload.file_path) != upload.sha256:
+                # 清空已接收的内容，客户端从偏移量 0 重新上传
+                chunked_upload.create_upload_file(upload.file_path)
+                upload.received_size = 0
+                upload.save(update_fields=['received_size', 'updated_at'])
+                return Response(
+                    {'error': '文件校验失败，请重新上传', 'received_size': upload.received_size},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            serializer = EpisodeCreateSerializer(
+                data=upload.episode_data,
+                context={'request': request, 'uploaded_audio': upload.file_path},
+            )
+            serializer.is_valid(raise_exception=True)
+            upload.episode = serializer.save()
+            upload.status = 'completed'
+            upload.save(update_fields=['episode', 'status', 'updated_at'])
+
+        return Response(EpisodeUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        # 已完成的上传文件属于单集，只删除上传记录
+        if instance.status == 'uploading':
+            chunked_upload.remove_upload_file(instance.file_path)
+        instance.delete()
+
+
 class EpisodeUpdateView(generics.UpdateAPIView):
     """更新单集"""
     serializer_class = EpisodeCreateSerializer
@@ -575,7 +711,9 @@ def increment_play_count(request, episode_id):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def retry_generation(request, episode_id):
-    """重试失败的 AI 生成任务"""
+    """重试失败的 AI 生成任务（音频合成会从检查点中已完成的片段继续）"""
+    from django.conf import settings
+    from .services.checkpoint import GenerationCheckpoint
     from .tasks import generate_podcast_task, generate_source_podcast_task, generate_rss_podcast_task
 
     episode = get_object_or_404(Episode, id=episode_id, show__creator=request.user)
@@ -665,8 +803,13 @@ def retry_generation(request, episode_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    checkpoint = GenerationCheckpoint.for_episode(episode.id, settings.MINIMAX_TTS)
     return Response(
-        {'message': '重试任务已提交', 'episode_id': episode.id},
+        {
+            'message': '重试任务已提交',
+            'episode_id': episode.id,
+            'resumable_segments': len(checkpoint.completed_indexes()) if checkpoint else 0,
+        },
         status=status.HTTP_202_ACCEPTED
     )
 
@@ -1345,7 +1488,8 @@ class ScriptSessionViewSet(viewsets.ModelViewSet):
 
         if not segment_text:
             return Response({'error': 'segment_text 不能为空'}, status=status.HTTP_400_BAD_REQUEST)
-        if not re.match(r"^【[^】]+】", segment_text):
+        role_name = leading_role(segment_text)
+        if role_name is None:
             return Response({'error': '片段需以【角色】开头'}, status=status.HTTP_400_BAD_REQUEST)
 
         relative_path = f"previews/{timezone.now().strftime('%Y/%m')}/seg-{session.id}-{uuid4().hex}.mp3"
@@ -1357,14 +1501,10 @@ class ScriptSessionViewSet(viewsets.ModelViewSet):
             # 如果指定了 voice_id，构建 voice_overrides
             voice_overrides = None
             if voice_id:
-                # 从片段中提取角色名
-                role_match = re.match(r"^【([^】]+)】", segment_text)
-                if role_match:
-                    role_name = role_match.group(1).strip()
-                    # 获取角色的 alias
-                    role_alias = generator.character_aliases.get(role_name)
-                    if role_alias:
-                        voice_overrides = {role_alias: {"voice_id": voice_id}}
+                # 获取角色的 alias
+                role_alias = generator.character_aliases.get(role_name)
+                if role_alias:
+                    voice_overrides = {role_alias: {"voice_id": voice_id}}
 
             generator.generate(
                 segment_text,
@@ -1383,6 +1523,26 @@ class ScriptSessionViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
+    @action(detail=True, methods=['get'])
+    def segments(self, request, pk=None):
+        """脚本分段（与音频生成使用同一分段器），供脚本编辑器定位段落"""
+        session = self.get_object()
+        script = session.current_script or ''
+        turns = ScriptSegmenter().parse(script)
+        return Response({
+            'segments': [
+                {
+                    'index': index,
+                    'role': turn.role,
+                    'text': turn.text,
+                    'raw': script[turn.start:turn.end],
+                    'start': turn.start,
+                    'end': turn.end,
+                }
+                for index, turn in enumerate(turns)
+            ]
+        })
+
     @action(detail=True, methods=['post'])
     def rewrite_segment(self, request, pk=None):
         """段落级局部重写"""
@@ -1397,8 +1557,8 @@ class ScriptSessionViewSet(viewsets.ModelViewSet):
         if not instruction:
             return Response({'error': 'instruction 不能为空'}, status=status.HTTP_400_BAD_REQUEST)
 
-        role_match = re.match(r"^(【[^】]+】)", segment_text)
-        role_tag = role_match.group(1) if role_match else ""
+        role_match = ROLE_TAG_PATTERN.match(segment_text)
+        role_tag = role_match.group(0) if role_match else ""
 
         try:
             client = OpenAI(
@@ -1672,6 +1832,7 @@ def debate_message(request, episode_id):
     """
     用户插话：追加一条用户消息，并继续生成一轮AI群聊回复。
     """
+    from .services.debate_events import publish_debate_event
     from .tasks import generate_debate_followup_task
 
     message = (request.data.get('message') or '').strip()
@@ -1705,7 +1866,6 @@ def debate_message(request, episode_id):
     topic = (episode.generation_meta or {}).get('topic') or episode.title
     client_id = request.data.get('client_id')  # 客户端消息ID，用于去重
 
-    dialogue = list(episode.dialogue or [])
     entry = {
         'participant': 'user',
         'content': message,
@@ -1713,12 +1873,13 @@ def debate_message(request, episode_id):
     }
     if client_id:
         entry['clientId'] = client_id
-    dialogue.append(entry)
+    # 只追加一行，完整对话由追问任务结束时物化到 episode.dialogue
+    row = DialogueEntry.append(episode.id, entry)
 
-    episode.dialogue = dialogue
     episode.status = 'processing'
     episode.generation_error = ''
-    episode.save(update_fields=['dialogue', 'status', 'generation_error', 'updated_at'])
+    episode.save(update_fields=['status', 'generation_error', 'updated_at'])
+    publish_debate_event(episode.id, 'dialogue', entry, index=row.seq)
 
     generate_debate_followup_task.delay(episode.id, topic, episode.mode)
 
@@ -1760,7 +1921,8 @@ def generate_debate_audio(request, episode_id):
         )
 
     # 验证Episode有对话内容
-    if not episode.dialogue or not episode.participants_config:
+    has_dialogue = episode.dialogue or episode.dialogue_entries.exists()
+    if not has_dialogue or not episode.participants_config:
         return Response(
             {'error': 'Episode缺少对话内容，无法生成音频'},
             status=status.HTTP_400_BAD_REQUEST
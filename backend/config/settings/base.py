@@ -101,6 +101,8 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = config('MEDIA_ROOT', default=str(BASE_DIR.parent / 'media'))
+# 单集音频权限校验后交给 nginx 发送（X-Accel-Redirect），需与 nginx 的 internal location 一致；留空由 Django 发送
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='')
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -154,17 +156,37 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'cleanup-stale-uploads': {
+        'task': 'apps.podcasts.tasks.cleanup_stale_uploads_task',
+        'schedule': 60 * 60,  # 每小时
+    },
+}
 
 # Audio settings
 AUDIO_MAX_UPLOAD_SIZE = 500 * 1024 * 1024  # 500MB
+AUDIO_UPLOAD_CHUNK_MAX_SIZE = 16 * 1024 * 1024  # 分片上传单个分片上限（nginx client_max_body_size 需不小于此值）
+AUDIO_UPLOAD_EXPIRE_HOURS = config('AUDIO_UPLOAD_EXPIRE_HOURS', default=24, cast=int)  # 超过该时长未续传的分片上传会被清理
 AUDIO_ALLOWED_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.flac', '.ogg']
 AUDIO_OUTPUT_FORMAT = 'mp3'
 AUDIO_OUTPUT_BITRATE = '192k'
 
+# Uploaded audio is normalized by ffmpeg subprocesses (two-pass loudnorm, nothing decoded in Python);
+# max_jobs bounds how many run at once on a machine, shared by all Celery workers via lock files
+AUDIO_PROCESSING = {
+    'max_jobs': config('AUDIO_PROCESSING_MAX_JOBS', default=2, cast=int),
+    'slot_dir': config('AUDIO_PROCESSING_SLOT_DIR', default=str(BASE_DIR.parent / 'audio_slots')),
+    'loudness_target': config('AUDIO_LOUDNESS_TARGET', default=-16.0, cast=float),  # LUFS
+    'true_peak': config('AUDIO_TRUE_PEAK', default=-1.5, cast=float),  # dBTP
+    'loudness_range': config('AUDIO_LOUDNESS_RANGE', default=11.0, cast=float),  # LU
+    'bitrate': AUDIO_OUTPUT_BITRATE,
+}
+
 # MiniMax TTS defaults (override via environment if needed)
 # Updated to match MoFA Flow implementation
 MINIMAX_TTS = {
     'api_key': config('MINIMAX_API_KEY', default=''),
+    'ws_url': config('MINIMAX_WS_URL', default='wss://api.minimax.io/ws/v1/t2a_v2'),
     'model': config('MINIMAX_MODEL', default='speech-2.5-hd-preview'),
     'sample_rate': config('MINIMAX_SAMPLE_RATE', default=32000, cast=int),
     'audio_bitrate': config('MINIMAX_AUDIO_BITRATE', default=128000, cast=int),
@@ -183,9 +205,54 @@ MINIMAX_TTS = {
     # Enhanced punctuation marks for sentence-aware splitting (MoFA Flow)
     'punctuation_marks': config('MINIMAX_PUNCTUATION_MARKS', default='。！？.!?，,、；;：:'),
 
+    # Learn chars/second per voice from returned audio (stored in the database) and size segments
+    # to max_segment_duration with it; tts_chars_per_second is the starting estimate
+    'adaptive_segmentation': config('MINIMAX_ADAPTIVE_SEGMENTATION', default=True, cast=bool),
+    'speaking_rate_alpha': config('MINIMAX_SPEAKING_RATE_ALPHA', default=0.2, cast=float),
+    'speaking_rate_min_samples': config('MINIMAX_SPEAKING_RATE_MIN_SAMPLES', default=3, cast=int),
+
     # Random silence between speaker changes
     'silence_min_ms': config('MINIMAX_SILENCE_MIN_MS', default=300, cast=int),
     'silence_max_ms': config('MINIMAX_SILENCE_MAX_MS', default=1200, cast=int),
+
+    # Episode assembly: 'stream' encodes segments as they arrive (bounded memory);
+    # 'buffer' lays the episode out in one NumPy buffer for crossfades and peak normalization
+    'assembly_mode': config('MINIMAX_ASSEMBLY_MODE', default='stream'),
+    'crossfade_ms': config('MINIMAX_CROSSFADE_MS', default=0, cast=int),
+    'normalize_headroom_db': config('MINIMAX_NORMALIZE_HEADROOM_DB', default=0.1, cast=float),
+
+    # Listen while it generates: mirror the audio into MEDIA_ROOT/live/<episode id>/index.m3u8 (HLS)
+    'live_playback': config('MINIMAX_LIVE_PLAYBACK', default=True, cast=bool),
+    'live_segment_seconds': config('MINIMAX_LIVE_SEGMENT_SECONDS', default=6.0, cast=float),
+
+    # Concurrent segment synthesis: number of segments kept in flight per episode.
+    # Per-voice limits can be set via voices.<alias>.max_concurrency
+    'synthesis_concurrency': config('MINIMAX_SYNTHESIS_CONCURRENCY', default=4, cast=int),
+
+    # Reuse started MiniMax tasks across segments (one task_continue per segment)
+    'session_reuse': config('MINIMAX_SESSION_REUSE', default=True, cast=bool),
+    'session_idle_timeout': config('MINIMAX_SESSION_IDLE_TIMEOUT', default=30.0, cast=float),  # seconds
+
+    # Send runs of consecutive same-voice segments as one batch of task_continue messages in a single task
+    'speaker_batching': config('MINIMAX_SPEAKER_BATCHING', default=False, cast=bool),
+    'speaker_batch_size': config('MINIMAX_SPEAKER_BATCH_SIZE', default=8, cast=int),
+
+    # Content-addressed PCM cache of synthesized segments (LRU, 0 MB disables it)
+    'segment_cache_dir': config('MINIMAX_SEGMENT_CACHE_DIR', default=str(BASE_DIR.parent / 'tts_cache')),
+    'segment_cache_max_mb': config('MINIMAX_SEGMENT_CACHE_MAX_MB', default=1024, cast=int),
+
+    # Per-episode segment checkpoints so a retried generation resumes where it failed (empty disables)
+    'checkpoint_dir': config('MINIMAX_CHECKPOINT_DIR', default=str(BASE_DIR.parent / 'generation_work')),
+
+    # Token bucket shared by all workers via Redis (per-process fallback); 0 disables it
+    'rate_limit_per_second': config('MINIMAX_RATE_LIMIT_PER_SECOND', default=5.0, cast=float),
+    'rate_limit_burst': config('MINIMAX_RATE_LIMIT_BURST', default=10, cast=int),
+    'rate_limit_redis_url': config('MINIMAX_RATE_LIMIT_REDIS_URL', default=config('REDIS_URL', default='redis://localhost:6379/0')),
+
+    # Per-segment retry with jittered exponential backoff
+    'retry_attempts': config('MINIMAX_RETRY_ATTEMPTS', default=3, cast=int),
+    'retry_base_delay': config('MINIMAX_RETRY_BASE_DELAY', default=0.5, cast=float),  # seconds
+    'retry_max_delay': config('MINIMAX_RETRY_MAX_DELAY', default=8.0, cast=float),  # seconds
 }
 
 # OpenAI-compatible API for script generation (Moonshot/Kimi)
@@ -199,6 +266,27 @@ TRENDING_API_URL = config('TRENDING_API_URL', default='http://154.21.90.242:1145
 # Tavily Search API for AI tool calling
 TAVILY_API_KEY = config('TAVILY_API_KEY', default='')
 
+# Debate SSE events (Redis pub/sub, one channel per episode); empty falls back to polling the database
+DEBATE_EVENTS_REDIS_URL = config('DEBATE_EVENTS_REDIS_URL', default=config('REDIS_URL', default='redis://localhost:6379/0'))
+
+# Cache
+# ffprobe results are shared by the web process that validates an upload and the Celery worker
+# that processes it (defaults to REDIS_URL; empty keeps a per-process in-memory cache)
+AUDIO_METADATA_CACHE_URL = config('AUDIO_METADATA_CACHE_URL', default=config('REDIS_URL', default='redis://localhost:6379/0'))
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'audio_metadata': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': AUDIO_METADATA_CACHE_URL,
+        'OPTIONS': {'socket_timeout': 0.5, 'socket_connect_timeout': 0.5},
+    } if AUDIO_METADATA_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'audio_metadata',
+    },
+}
+
 # Channels (WebSocket)
 CHANNEL_LAYERS = {
     'default': {
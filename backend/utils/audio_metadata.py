@@ -0,0 +1,202 @@
+"""
+音频元数据
+
+只读取容器头（ffprobe，未安装时解析 ffmpeg -i 的输出），不解码样本，
+多小时的上传也能在毫秒级拿到时长。结果按 路径 + 文件大小 + 修改时间
+缓存在 audio_metadata 缓存（默认为 REDIS_URL 上的共享 Redis）中，
+校验上传的 Web 进程和处理音频的 Celery worker 只需探测一次；文件被替换后
+自动失效。Redis 不可用时直接探测，稍后再重试缓存。
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+
+import redis
+from django.core.cache import caches
+from pydub import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'audio_metadata'
+CACHE_KEY_PREFIX = 'audio_metadata'
+CACHE_TIMEOUT_SECONDS = 7 * 24 * 3600
+CACHE_RETRY_AFTER = 30.0  # Redis 不可用后，暂停使用缓存的秒数
+PROBE_TIMEOUT_SECONDS = 60
+
+_DURATION_PATTERN = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_BITRATE_PATTERN = re.compile(r"Duration:.*?bitrate:\s*(\d+)\s*kb/s")
+_STREAM_PATTERN = re.compile(r"Stream #\d+:\d+[^:]*:\s*(Audio|Video):\s*([^,\s]+)(.*)")
+_SAMPLE_RATE_PATTERN = re.compile(r"(\d+)\s*Hz")
+_STREAM_BITRATE_PATTERN = re.compile(r"(\d+)\s*kb/s")
+_CHANNELS_PATTERN = re.compile(r"(\d+)\s*channels")
+_CHANNEL_LAYOUTS = {'mono': 1, 'stereo': 2, '2.1': 3, 'quad': 4, '5.0': 5, '5.1': 6, '7.1': 8}
+
+_cache_retry_at = 0.0
+
+
+class AudioMetadataError(Exception):
+    """无法读取音频元数据"""
+
+
+def _empty_metadata():
+    return {
+        'duration': 0.0,
+        'audio_streams': 0,
+        'video_streams': 0,
+        'codec': None,
+        'bitrate': None,
+        'sample_rate': None,
+        'channels': None,
+        'format': None,
+    }
+
+
+def _run(command):
+    try:
+        return subprocess.run(
+            command, capture_output=True, text=True, errors='replace', timeout=PROBE_TIMEOUT_SECONDS
+        )
+    except OSError as e:
+        raise AudioMetadataError(f"无法启动 {command[0]}: {e}")
+    except subprocess.TimeoutExpired:
+        raise AudioMetadataError(f"{os.path.basename(command[0])} 读取超时")
+
+
+def _probe_with_ffprobe(ffprobe, file_path):
+    completed = _run([
+        ffprobe, '-v', 'error',
+        '-print_format', 'json',
+        '-show_format', '-show_streams',
+        file_path,
+    ])
+    if completed.returncode != 0:
+        raise AudioMetadataError(completed.stderr.strip() or 'ffprobe 读取失败')
+
+    data = json.loads(completed.stdout or '{}')
+    streams = data.get('streams') or []
+    fmt = data.get('format') or {}
+    audio = [stream for stream in streams if stream.get('codec_type') == 'audio']
+    first_audio = audio[0] if audio else {}
+
+    duration = fmt.get('duration') or first_audio.get('duration')
+    bitrate = first_audio.get('bit_rate') or fmt.get('bit_rate')
+    metadata = _empty_metadata()
+    metadata.update({
+        'duration': float(duration) if duration not in (None, 'N/A') else 0.0,
+        'audio_streams': len(audio),
+        'video_streams': sum(1 for stream in streams if stream.get('codec_type') == 'video'),
+        'codec': first_audio.get('codec_name'),
+        'bitrate': int(bitrate) if bitrate not in (None, 'N/A') else None,
+        'sample_rate': int(first_audio['sample_rate']) if first_audio.get('sample_rate') else None,
+        'channels': first_audio.get('channels'),
+        'format': fmt.get('format_name'),
+    })
+    return metadata
+
+
+def _probe_with_ffmpeg(file_path):
+    # 没有输出文件时 ffmpeg 只读取文件头并以非零状态退出，信息在 stderr 中
+    completed = _run([AudioSegment.converter, '-hide_banner', '-i', file_path])
+    output = completed.stderr
+    if 'Input #0' not in output:
+        raise AudioMetadataError(output.strip().splitlines()[-1] if output.strip() else 'ffmpeg 读取失败')
+
+    metadata = _empty_metadata()
+    match = _DURATION_PATTERN.search(output)
+    if match:
+        hours, minutes, seconds = match.groups()
+        metadata['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    match = re.search(r"Input #0,\s*([^,]+(?:,[^,\s]+)*),\s*from", output)
+    if match:
+        metadata['format'] = match.group(1)
+
+    stream_bitrate = None
+    for kind, codec, details in _STREAM_PATTERN.findall(output):
+        if kind == 'Video':
+            metadata['video_streams'] += 1
+            continue
+        metadata['audio_streams'] += 1
+        if metadata['audio_streams'] > 1:
+            continue
+        metadata['codec'] = codec
+        rate = _SAMPLE_RATE_PATTERN.search(details)
+        metadata['sample_rate'] = int(rate.group(1)) if rate else None
+        channels = _CHANNELS_PATTERN.search(details)
+        if channels:
+            metadata['channels'] = int(channels.group(1))
+        else:
+            layout = details.split(',')[2].strip() if details.count(',') >= 2 else ''
+            metadata['channels'] = _CHANNEL_LAYOUTS.get(layout.split('(')[0])
+        bitrate = _STREAM_BITRATE_PATTERN.search(details)
+        stream_bitrate = int(bitrate.group(1)) * 1000 if bitrate else None
+
+    container_bitrate = _BITRATE_PATTERN.search(output)
+    metadata['bitrate'] = stream_bitrate or (int(container_bitrate.group(1)) * 1000 if container_bitrate else None)
+    return metadata
+
+
+def probe_audio(file_path):
+    """
+    读取音频时长与流信息（不走缓存）
+
+    返回:
+        dict: {
+            'duration': float (秒),
+            'audio_streams': int,
+            'video_streams': int,
+            'codec': str,
+            'bitrate': int (bit/s),
+            'sample_rate': int,
+            'channels': int,
+            'format': str,
+        }
+    """
+    ffprobe = shutil.which('ffprobe')
+    try:
+        if ffprobe:
+            return _probe_with_ffprobe(ffprobe, file_path)
+        return _probe_with_ffmpeg(file_path)
+    except (ValueError, KeyError) as e:
+        raise AudioMetadataError(f"无法解析音频信息: {e}")
+
+
+def _cache_key(file_path, stat):
+    identity = f"{os.path.realpath(file_path)}\x00{stat.st_size}\x00{stat.st_mtime_ns}"
+    return f"{CACHE_KEY_PREFIX}:{hashlib.sha1(identity.encode('utf-8')).hexdigest()}"
+
+
+def get_audio_metadata(file_path):
+    """
+    读取音频元数据，结果按 路径 + 大小 + 修改时间 缓存
+
+    返回值同 probe_audio；文件不存在或无法解析时抛出 AudioMetadataError
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError as e:
+        raise AudioMetadataError(f"无法访问文件: {e}")
+
+    key = _cache_key(file_path, stat)
+    metadata = _cache_call('get', key)
+    if metadata is None:
+        metadata = probe_audio(file_path)
+        _cache_call('set', key, metadata, CACHE_TIMEOUT_SECONDS)
+    return dict(metadata)
+
+
+def _cache_call(method, *args):
+    """调用 audio_metadata 缓存；Redis 不可用时返回 None，CACHE_RETRY_AFTER 秒内不再尝试"""
+    global _cache_retry_at
+    if time.monotonic() < _cache_retry_at:
+        return None
+    try:
+        return getattr(caches[CACHE_ALIAS], method)(*args)
+    except redis.RedisError as e:
+        logger.warning("音频元数据缓存不可用，直接探测文件: %s", e)
+        _cache_retry_at = time.monotonic() + CACHE_RETRY_AFTER
+        return None
@@ -1,32 +1,152 @@
 """
 音频处理工具
-使用 pydub 处理音频文件
+
+上传音频全部交给 ffmpeg 流式处理，样本数据不会进入 Python 内存：
+- 时长与流信息只读容器头并缓存（见 utils.audio_metadata）
+- 两遍 loudnorm（EBU R128）标准化响度，第二遍同时转码为 MP3
+- 同一台机器上同时运行的处理任务数有上限（跨 Celery 进程的文件锁槽位）
 """
-from pydub import AudioSegment
+import contextlib
+import json
 import os
 import subprocess
 import tempfile
+import time
+
+from django.conf import settings
+from pydub import AudioSegment
+
+from utils.audio_metadata import get_audio_metadata
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows 开发环境不限制并发
+    fcntl = None
+
+
+class AudioProcessingError(Exception):
+    """ffmpeg / ffprobe 处理失败"""
+
+
+DEFAULT_AUDIO_PROCESSING = {
+    'max_jobs': 2,                 # 每台机器同时运行的 ffmpeg 处理任务数
+    'slot_dir': os.path.join(tempfile.gettempdir(), 'mofa-audio-slots'),
+    'loudness_target': -16.0,      # 集成响度 LUFS（播客常用 -16）
+    'true_peak': -1.5,             # 真峰值上限 dBTP
+    'loudness_range': 11.0,        # 响度范围 LU
+    'bitrate': '192k',
+    'sample_rate': 44100,          # 源文件采样率未知时使用
+}
+
+
+def _options():
+    return {**DEFAULT_AUDIO_PROCESSING, **(getattr(settings, 'AUDIO_PROCESSING', None) or {})}
+
+
+def _ffmpeg():
+    return AudioSegment.converter
+
+
+def _run(command, *, timeout=None):
+    try:
+        return subprocess.run(command, capture_output=True, text=True, errors='replace', timeout=timeout)
+    except OSError as e:
+        raise AudioProcessingError(f"无法启动 {command[0]}: {e}")
+    except subprocess.TimeoutExpired:
+        raise AudioProcessingError(f"{os.path.basename(command[0])} 处理超时")
 
 
 def get_audio_duration(file_path):
     """获取音频时长（秒）"""
     try:
-        audio = AudioSegment.from_file(file_path)
-        return int(len(audio) / 1000)
+        return int(get_audio_metadata(file_path)['duration'])
     except Exception as e:
         raise Exception(f"无法读取音频文件: {str(e)}")
 
 
+@contextlib.contextmanager
+def processing_slot(max_jobs=None, slot_dir=None, poll_interval=0.5):
+    """
+    占用一个 ffmpeg 处理槽位，全部占满时等待
+
+    槽位是 slot_dir 下的文件锁，同一台机器上的所有 Celery 进程共享，
+    因此超长上传不会同时跑出过多的 ffmpeg 进程。
+    """
+    options = _options()
+    max_jobs = int(max_jobs or options['max_jobs'])
+    if fcntl is None or max_jobs <= 0:
+        yield
+        return
+
+    slot_dir = slot_dir or options['slot_dir']
+    os.makedirs(slot_dir, exist_ok=True)
+    while True:
+        for index in range(max_jobs):
+            handle = open(os.path.join(slot_dir, f'slot-{index}.lock'), 'a')
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                continue
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+            return
+        time.sleep(poll_interval)
+
+
+def _loudnorm_filter(options, measured=None):
+    params = [
+        f"I={options['loudness_target']}",
+        f"TP={options['true_peak']}",
+        f"LRA={options['loudness_range']}",
+    ]
+    if measured:
+        params += [
+            f"measured_I={measured['input_i']}",
+            f"measured_TP={measured['input_tp']}",
+            f"measured_LRA={measured['input_lra']}",
+            f"measured_thresh={measured['input_thresh']}",
+            f"offset={measured['target_offset']}",
+            'linear=true',
+        ]
+    else:
+        params.append('print_format=json')
+    return 'loudnorm=' + ':'.join(params)
+
+
+def measure_loudness(input_path, options=None):
+    """loudnorm 第一遍：测量整段音频的响度（流式解码，不落盘）"""
+    options = options or _options()
+    completed = _run([
+        _ffmpeg(), '-hide_banner', '-nostats',
+        '-i', input_path,
+        '-map', '0:a:0', '-vn',
+        '-af', _loudnorm_filter(options),
+        '-f', 'null', '-',
+    ])
+    if completed.returncode != 0:
+        raise AudioProcessingError(f"响度测量失败: {completed.stderr.strip()[-500:]}")
+
+    start = completed.stderr.rfind('{')
+    end = completed.stderr.rfind('}')
+    if start < 0 or end < start:
+        raise AudioProcessingError('响度测量失败: 未找到 loudnorm 输出')
+    return json.loads(completed.stderr[start:end + 1])
+
+
 def process_audio(input_path, output_path=None):
     """
     处理音频文件：
-    1. 转换为 MP3
-    2. 标准化音量
+    1. 转换为 MP3（视频文件只提取第一条音轨）
+    2. 两遍 loudnorm 标准化响度
     3. 统一码率（192kbps）
 
     参数:
         input_path: 输入文件路径
-        output_path: 输出文件路径（可选，默认覆盖原文件）
+        output_path: 输出文件路径（可选，默认写到 <原文件名>_processed.mp3）
 
     返回:
         dict: {
@@ -36,71 +156,53 @@ def process_audio(input_path, output_path=None):
             'error': str (如果失败)
         }
     """
-    try:
-        # 加载音频（支持多种格式，包括从视频文件中提取音频）
-        try:
-            audio = AudioSegment.from_file(input_path)
-        except Exception as e:
-            # 如果失败（通常是因为文件包含视频流或格式特殊），使用 ffmpeg 直接提取音频
-            error_msg = str(e)
-            if "4GB" in error_msg or "video" in error_msg.lower() or "Unable to process" in error_msg:
-                # 使用 ffmpeg 提取音频流到临时文件
-                with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-                    temp_path = temp_file.name
-
-                try:
-                    # ffmpeg 命令：提取音频流，不重新编码
-                    subprocess.run([
-                        'ffmpeg', '-i', input_path,
-                        '-vn',  # 不包含视频
-                        '-acodec', 'libmp3lame',  # 使用 MP3 编码
-                        '-ab', '192k',  # 比特率
-                        '-y',  # 覆盖输出文件
-                        temp_path
-                    ], check=True, capture_output=True, text=True)
-
-                    # 从临时文件加载音频
-                    audio = AudioSegment.from_mp3(temp_path)
-
-                    # 清理临时文件
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                except subprocess.CalledProcessError as ffmpeg_error:
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                    raise Exception(f"ffmpeg 提取音频失败: {ffmpeg_error.stderr}")
-            else:
-                raise
-
-        # 标准化音量（防止过大或过小）
-        audio = audio.normalize()
-
-        # 如果没有指定输出路径，使用临时文件
-        if output_path is None:
-            base_name = os.path.splitext(input_path)[0]
-            output_path = f"{base_name}_processed.mp3"
-
-        # 导出为 MP3（192kbps）
-        audio.export(
-            output_path,
-            format='mp3',
-            bitrate='192k',
-            parameters=['-q:a', '2']  # VBR quality
-        )
-
-        # 获取时长（秒）
-        duration = int(len(audio) / 1000)
-
-        # 获取文件大小
-        file_size = os.path.getsize(output_path)
+    options = _options()
+    if output_path is None:
+        base_name = os.path.splitext(input_path)[0]
+        output_path = f"{base_name}_processed.mp3"
+    partial_path = f"{output_path}.part"
 
+    try:
+        with processing_slot():
+            info = get_audio_metadata(input_path)
+            if not info['audio_streams']:
+                raise AudioProcessingError('文件中没有音频流')
+
+            measured = measure_loudness(input_path, options)
+            # 静音文件无法测得响度，直接转码
+            audio_filter = (
+                _loudnorm_filter(options, measured)
+                if measured.get('input_i') not in (None, '-inf', 'inf')
+                else 'anull'
+            )
+            # loudnorm 内部会上采样到 192kHz，输出时需显式指定采样率
+            sample_rate = min(info['sample_rate'] or options['sample_rate'], 48000)
+
+            completed = _run([
+                _ffmpeg(), '-hide_banner', '-nostats', '-loglevel', 'error',
+                '-i', input_path,
+                '-map', '0:a:0', '-vn',
+                '-af', audio_filter,
+                '-ar', str(sample_rate),
+                '-c:a', 'libmp3lame',
+                '-b:a', options['bitrate'],
+                '-f', 'mp3', '-y', partial_path,
+            ])
+            if completed.returncode != 0:
+                raise AudioProcessingError(f"ffmpeg 转码失败: {completed.stderr.strip()[-500:]}")
+
+            os.replace(partial_path, output_path)
+
+        duration = get_audio_metadata(output_path)['duration'] or info['duration']
         return {
             'success': True,
-            'duration': duration,
-            'file_size': file_size,
+            'duration': int(duration),
+            'file_size': os.path.getsize(output_path),
             'output_path': output_path
         }
     except Exception as e:
+        if os.path.exists(partial_path):
+            os.unlink(partial_path)
         return {
             'success': False,
             'error': str(e)
@@ -128,17 +230,20 @@ def validate_audio_file(file_path, max_size_mb=500):
     if file_size > max_size_bytes:
         return {'valid': False, 'error': f'文件太大（最大 {max_size_mb}MB）'}
 
-    # 尝试读取音频
+    # 只读取文件头，不解码音频；结果缓存后处理任务可直接复用
     try:
-        audio = AudioSegment.from_file(file_path)
-        duration = len(audio) / 1000
-
-        # 检查时长（至少1秒，最多12小时）
-        if duration < 1:
-            return {'valid': False, 'error': '音频太短（至少1秒）'}
-        if duration > 12 * 3600:
-            return {'valid': False, 'error': '音频太长（最多12小时）'}
-
-        return {'valid': True}
+        info = get_audio_metadata(file_path)
     except Exception as e:
         return {'valid': False, 'error': f'无效的音频文件: {str(e)}'}
+
+    if not info['audio_streams']:
+        return {'valid': False, 'error': '无效的音频文件: 没有音频流'}
+
+    # 检查时长（至少1秒，最多12小时）
+    duration = info['duration']
+    if duration < 1:
+        return {'valid': False, 'error': '音频太短（至少1秒）'}
+    if duration > 12 * 3600:
+        return {'valid': False, 'error': '音频太长（最多12小时）'}
+
+    return {'valid': True}